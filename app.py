@@ -3,12 +3,10 @@ Streamlit Web Application for AI-Based Internship Recommendation System
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 sys.path.append('.')
 
-from components.recommender import HybridRecommender
-import config
+from components.recommender import HybridRecommender, model_fingerprint
 
 # Page configuration
 st.set_page_config(
@@ -17,11 +15,17 @@ st.set_page_config(
     layout="wide"
 )
 
-# Initialize session state
-if 'recommender' not in st.session_state:
-    with st.spinner("Loading AI models..."):
-        st.session_state.recommender = HybridRecommender()
-        st.session_state.students_df = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/students_processed.csv")
+@st.cache_resource(max_entries=1, show_spinner="Loading AI models...")
+def load_recommender(model_key):
+    """
+    One recommender shared by every browser session of this process
+    Args:
+        model_key: model_fingerprint() value; a new key (new snapshot or processed data) reloads the
+            models and evicts the previous recommender
+    """
+    return HybridRecommender()
+
+recommender = load_recommender(model_fingerprint())
 
 # Title
 st.title("🎯 AI-Based Hybrid Recommendation System")
@@ -50,7 +54,7 @@ st.markdown("---")
 col1, col2 = st.columns([2, 1])
 
 with col1:
-    student_ids = st.session_state.students_df['student_id'].tolist()
+    student_ids = recommender.students_df['student_id'].tolist()
     selected_student = st.selectbox(
         "Select Student ID:",
         student_ids,
@@ -67,9 +71,7 @@ with col2:
 
 # Display student info
 if selected_student:
-    student_info = st.session_state.students_df[
-        st.session_state.students_df['student_id'] == selected_student
-    ].iloc[0]
+    student_info = recommender.get_student(selected_student)
     
     st.markdown("### 👤 Student Profile")
     
@@ -83,7 +85,7 @@ if selected_student:
         st.metric("Year", student_info['year'])
     with col4:
         st.metric("CGPA", f"{student_info['cgpa']}/10")
-    
+        
     st.markdown(f"**Skills:** {student_info['skills']}")
     st.markdown(f"**Domain Interest:** {student_info['domain_interest']}")
 
@@ -92,11 +94,11 @@ st.markdown("---")
 
 if st.button("🚀 Generate Recommendations", type="primary"):
     with st.spinner("Generating personalized recommendations..."):
-        recommendations = st.session_state.recommender.recommend(
+        recommendations = recommender.recommend(
             selected_student,
             top_n=num_recommendations
         )
-    
+        
     st.success(f"✅ Generated {len(recommendations)} recommendations!")
     
     # Display recommendations
@@ -115,7 +117,7 @@ if st.button("🚀 Generate Recommendations", type="primary"):
                 st.metric("Match Score", f"{rec['match_score']:.2%}")
                 st.metric("Company Rating", f"{rec['rating']}⭐")
                 st.metric("Stipend", f"₹{rec['stipend']:,}")
-            
+                
             # Progress bar for match score
             st.progress(rec['match_score'])
 
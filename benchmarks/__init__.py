@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Synthetic datasets and timing helpers for performance measurements
+"""
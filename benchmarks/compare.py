@@ -0,0 +1,56 @@
+"""
+Compare two benchmark result files (e.g. before/after a commit)
+
+Usage:
+    python benchmarks/compare.py benchmarks/results/base.json benchmarks/results/new.json
+"""
+
+import argparse
+import json
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def metrics(results):
+    """Flatten results into {metric name: value} (seconds for stages, ms for latencies)"""
+    flat = {}
+    
+    for name, stage in results.get('stages', {}).items():
+        flat[f"{name} (s)"] = stage['seconds']
+        
+    for name, summary in results.get('latency', {}).items():
+        for percentile in ('p50_ms', 'p95_ms', 'p99_ms'):
+            flat[f"{name} {percentile[:3]} (ms)"] = summary[percentile]
+            
+    flat['peak RSS (MB)'] = results.get('peak_rss_mb')
+    return flat
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('base', help="Baseline results JSON")
+    parser.add_argument('new', help="New results JSON")
+    args = parser.parse_args()
+    
+    base, new = load(args.base), load(args.new)
+    base_metrics, new_metrics = metrics(base), metrics(new)
+    
+    print(f"Base: {args.base} ({(base.get('commit') or 'unknown')[:10]})")
+    print(f"New:  {args.new} ({(new.get('commit') or 'unknown')[:10]})")
+    
+    if base.get('params') != new.get('params'):
+        print("⚠️ Runs used different parameters; comparison may be misleading")
+        
+    print(f"\n{'metric':<40} {'base':>12} {'new':>12} {'change':>9}")
+    print("-" * 76)
+    
+    for name, base_value in base_metrics.items():
+        new_value = new_metrics.get(name)
+        if base_value is None or new_value is None:
+            continue
+            
+        change = (new_value - base_value) / base_value * 100 if base_value else 0.0
+        print(f"{name:<40} {base_value:>12.3f} {new_value:>12.3f} {change:>+8.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic datasets for benchmarking
+Generates students, internships and feedback of any size with the same schema as data/raw,
+sampling realistic values from the raw CSVs
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import config
+
+def _ids(prefix, n):
+    """Zero-padded ids like the raw data (S001, I001, ...), widened for large n"""
+    width = max(3, len(str(n)))
+    return np.char.add(prefix, np.char.zfill(np.arange(1, n + 1).astype(str), width))
+
+def _sample(rng, values, n):
+    """n values drawn with replacement from a template column"""
+    values = np.asarray(values)
+    return values[rng.integers(0, len(values), n)]
+
+def _skill_lists(rng, templates, pool, n):
+    """Template skill lists with one extra skill appended, for a larger vocabulary"""
+    return np.char.add(np.char.add(_sample(rng, templates, n).astype(str), ','), _sample(rng, pool, n).astype(str))
+
+def generate_dataset(n_students, n_internships, n_feedback, seed=42, template_dir=None):
+    """
+    Generate a synthetic dataset with the raw CSV schema
+    Args:
+        n_students: Number of students
+        n_internships: Number of internships
+        n_feedback: Number of feedback entries (duplicate pairs are possible, as in real logs)
+        seed: Random seed
+        template_dir: Directory with the raw CSVs to sample values from (defaults to config.RAW_DATA_DIR)
+    Returns:
+        (students_df, internships_df, feedback_df)
+    """
+    rng = np.random.default_rng(seed)
+    template_dir = template_dir or config.RAW_DATA_DIR
+    
+    students_template = pd.read_csv(os.path.join(template_dir, 'students.csv'))
+    internships_template = pd.read_csv(os.path.join(template_dir, 'internships.csv'))
+    feedback_template = pd.read_csv(os.path.join(template_dir, 'feedback.csv'))
+    
+    skill_pool = sorted({
+        skill
+        for skills in pd.concat([students_template['skills'], internships_template['required_skills']])
+        for skill in skills.split(',')
+    })
+    
+    students_df = pd.DataFrame({
+        'student_id': _ids('S', n_students),
+        'name': _sample(rng, students_template['name'], n_students),
+        'branch': _sample(rng, students_template['branch'], n_students),
+        'year': _sample(rng, students_template['year'], n_students),
+        'cgpa': np.round(rng.uniform(6.0, 9.8, n_students), 1),
+        'skills': _skill_lists(rng, students_template['skills'], skill_pool, n_students),
+        'domain_interest': _sample(rng, students_template['domain_interest'], n_students),
+        'location_preference': _sample(rng, students_template['location_preference'], n_students),
+        'past_internships': _sample(rng, students_template['past_internships'].fillna('None'), n_students)
+    })
+    
+    internships_df = pd.DataFrame({
+        'internship_id': _ids('I', n_internships),
+        'company': _sample(rng, internships_template['company'], n_internships),
+        'domain': _sample(rng, internships_template['domain'], n_internships),
+        'role': _sample(rng, internships_template['role'], n_internships),
+        'required_skills': _skill_lists(rng, internships_template['required_skills'], skill_pool, n_internships),
+        'location': _sample(rng, internships_template['location'], n_internships),
+        'duration_months': _sample(rng, internships_template['duration_months'], n_internships),
+        'stipend': _sample(rng, internships_template['stipend'], n_internships),
+        'rating': np.round(rng.uniform(3.5, 5.0, n_internships), 1),
+        'total_reviews': rng.integers(10, 500, n_internships),
+        'description': _sample(rng, internships_template['description'], n_internships)
+    })
+    
+    feedback_df = pd.DataFrame({
+        'student_id': _sample(rng, students_df['student_id'], n_feedback),
+        'internship_id': _sample(rng, internships_df['internship_id'], n_feedback),
+        'rating': rng.integers(1, 6, n_feedback),
+        'feedback_text': _sample(rng, feedback_template['feedback_text'], n_feedback),
+        'completion_date': _sample(rng, feedback_template['completion_date'], n_feedback),
+        'would_recommend': _sample(rng, feedback_template['would_recommend'], n_feedback)
+    })
+    
+    return students_df, internships_df, feedback_df
+
+def write_raw_dataset(directory, students_df, internships_df, feedback_df):
+    """
+    Write a generated dataset as raw CSVs
+    Args:
+        directory: Target directory (students.csv, internships.csv, feedback.csv)
+    """
+    os.makedirs(directory, exist_ok=True)
+    students_df.to_csv(os.path.join(directory, 'students.csv'), index=False)
+    internships_df.to_csv(os.path.join(directory, 'internships.csv'), index=False)
+    feedback_df.to_csv(os.path.join(directory, 'feedback.csv'), index=False)
@@ -0,0 +1,108 @@
+"""
+Benchmark helpers: latency percentiles, peak memory and an isolated data workspace
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+import numpy as np
+import config
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Config paths redirected into a benchmark workspace
+WORKSPACE_PATHS = {
+    'STUDENTS_FILE': os.path.join('raw', 'students.csv'),
+    'INTERNSHIPS_FILE': os.path.join('raw', 'internships.csv'),
+    'FEEDBACK_FILE': os.path.join('raw', 'feedback.csv'),
+    'STUDENTS_TABLE': os.path.join('processed', 'students'),
+    'INTERNSHIPS_TABLE': os.path.join('processed', 'internships'),
+    'FEEDBACK_TABLE': os.path.join('processed', 'feedback'),
+    'USER_ITEM_MATRIX_FILE': os.path.join('processed', 'user_item_matrix.npz'),
+    'FEEDBACK_STATS_FILE': os.path.join('processed', 'feedback_pair_stats.npz'),
+    'SNAPSHOT_DIR': 'snapshot'
+}
+
+def summarize(samples):
+    """
+    Latency summary of a list of durations
+    Args:
+        samples: Durations in seconds
+    Returns:
+        Dictionary with count, mean, p50, p95, p99 and max in milliseconds
+    """
+    ms = np.asarray(samples, dtype=np.float64) * 1000
+    
+    return {
+        'count': int(len(ms)),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max())
+    }
+
+def time_calls(fn, args_list):
+    """
+    Time one call of fn per argument tuple
+    Args:
+        fn: Function to benchmark
+        args_list: Iterable of argument tuples
+    Returns:
+        List of durations in seconds
+    """
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def time_once(fn, *args, **kwargs):
+    """
+    Time a single call
+    Returns:
+        (result, seconds)
+    """
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None where unsupported)"""
+    if resource is None:
+        return None
+        
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+@contextlib.contextmanager
+def quiet():
+    """Silence progress prints of the code under test"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+@contextlib.contextmanager
+def workspace(directory):
+    """
+    Point config's data paths at a benchmark directory, so real data is never touched
+    Args:
+        directory: Workspace root (raw/, processed/ and snapshot/ live below it)
+    """
+    original = {name: getattr(config, name) for name in WORKSPACE_PATHS}
+    
+    for name, relative in WORKSPACE_PATHS.items():
+        setattr(config, name, os.path.join(directory, relative))
+        
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(config, name, value)
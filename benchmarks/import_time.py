@@ -0,0 +1,174 @@
+"""
+Cold-start report and budget check for the CLI entry points
+Each entry point's top-level code (its imports; main() is behind the __name__ guard) runs in a
+fresh interpreter with -X importtime. The report lists wall time, total import time, which heavy
+packages were loaded and the slowest top-level imports
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --check benchmarks/import_budget.json
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import json
+import os
+import subprocess
+import time
+
+# Entry points with a __main__ guard (generate_more_data.py writes data at import, app.py needs streamlit run)
+ENTRY_POINTS = [
+    'main.py',
+    'server.py',
+    'scripts/01_run_preprocessing.py',
+    'scripts/02_test_content_model.py',
+    'scripts/03_test_collaborative_model.py',
+    'scripts/04_test_hybrid_model.py',
+    'scripts/05_build_model_snapshot.py',
+    'scripts/06_ann_recall_report.py',
+    'scripts/07_stage_latency_report.py',
+    'scripts/08_build_topn_table.py',
+    'scripts/generate_smart_data.py',
+    'scripts/generate_large_data.py',
+    'benchmarks/run_benchmarks.py',
+    'benchmarks/load_test.py',
+    'benchmarks/compare.py'
+]
+
+# Packages worth reporting when an entry point loads them
+HEAVY_PACKAGES = ('sklearn', 'scipy', 'pandas', 'numpy', 'streamlit')
+
+def _import_command(entry):
+    """Python code loading an entry point: a script path (top level only) or a module name"""
+    if entry.endswith('.py'):
+        return f"import runpy; runpy.run_path({entry!r}, run_name='__cold_start__')"
+    return f"import {entry}"
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output
+    Args:
+        stderr: Interpreter stderr
+    Returns:
+        (list of (module, cumulative seconds) for top-level imports, set of all imported modules)
+    """
+    top_level, modules = [], set()
+    
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+            
+        _, cumulative, name = line[len('import time:'):].split('|')
+        module = name.strip()
+        modules.add(module)
+        
+        # Nested imports are indented by two spaces per level after the leading space
+        if not name[1:].startswith(' '):
+            top_level.append((module, int(cumulative) / 1e6))
+            
+    return top_level, modules
+
+def measure(entry, repeat=3):
+    """
+    Cold-start one entry point in fresh interpreters
+    Args:
+        entry: Script path or module name
+        repeat: Runs (the fastest wall time is reported)
+    Returns:
+        Dictionary with wall_seconds, import_seconds, heavy packages loaded and slowest imports
+    """
+    command = [sys.executable, '-X', 'importtime', '-c', _import_command(entry)]
+    wall_times = []
+    
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True)
+        wall_times.append(time.perf_counter() - start)
+        
+        if completed.returncode != 0:
+            raise RuntimeError(f"{entry} failed to import:\n{completed.stderr[-2000:]}")
+            
+    top_level, modules = parse_importtime(completed.stderr)
+    
+    return {
+        'wall_seconds': min(wall_times),
+        'import_seconds': sum(seconds for _, seconds in top_level),
+        'heavy_packages': [package for package in HEAVY_PACKAGES if package in modules],
+        'slowest_imports': sorted(top_level, key=lambda item: -item[1])[:5]
+    }
+
+def check(results, budget):
+    """
+    Compare results with a budget
+    Args:
+        results: Dictionary entry -> measure() result
+        budget: Dictionary entry -> {'max_seconds': wall time limit, 'forbid': packages that must not load}
+    Returns:
+        List of failure messages (empty when within budget)
+    """
+    failures = []
+    
+    for entry, limits in budget.items():
+        result = results.get(entry)
+        if result is None:
+            continue
+            
+        for package in limits.get('forbid', []):
+            if package in result['heavy_packages']:
+                failures.append(f"{entry} imports {package} at startup")
+                
+        max_seconds = limits.get('max_seconds')
+        if max_seconds is not None and result['wall_seconds'] > max_seconds:
+            failures.append(f"{entry} cold start {result['wall_seconds']:.2f} s exceeds {max_seconds:.2f} s")
+            
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import report for the CLI entry points")
+    parser.add_argument('entries', nargs='*', help="Script paths or module names (default: all entry points)")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per entry point (fastest is reported)")
+    parser.add_argument('--check', default=None, help="Budget JSON; exit with status 1 when over budget")
+    parser.add_argument('--output', default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+    
+    budget = None
+    if args.check:
+        with open(args.check) as f:
+            budget = json.load(f)
+            
+    entries = args.entries or (list(budget) if budget else ENTRY_POINTS)
+    
+    print("=" * 70)
+    print("COLD-START IMPORT REPORT")
+    print("=" * 70)
+    print(f"{'entry point':<40}{'wall s':>8}{'import s':>10}  heavy packages")
+    
+    results = {}
+    for entry in entries:
+        results[entry] = measure(entry, args.repeat)
+        result = results[entry]
+        print(f"{entry:<40}{result['wall_seconds']:>8.2f}{result['import_seconds']:>10.2f}  {', '.join(result['heavy_packages']) or '-'}")
+        
+    print("\nSlowest top-level imports:")
+    for entry, result in results.items():
+        slowest = ', '.join(f"{module} {seconds:.2f}s" for module, seconds in result['slowest_imports'][:3])
+        print(f"  {entry:<40}{slowest}")
+        
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            
+    if budget is not None:
+        failures = check(results, budget)
+        if failures:
+            print("\n❌ Cold-start budget exceeded:")
+            for failure in failures:
+                print(f"  - {failure}")
+            sys.exit(1)
+        print("\n✅ All entry points within their cold-start budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Load generator for the HTTP recommendation service (server.py)
+Each client thread keeps one connection open and sends requests back to back
+
+Usage:
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --concurrency 1 8 32 --duration 10
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+import numpy as np
+from benchmarks.harness import summarize
+
+def _client(host, port, paths, deadline, samples, errors):
+    """Send requests on one keep-alive connection until the deadline"""
+    connection = http.client.HTTPConnection(host, port)
+    i = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            connection.request('GET', paths[i % len(paths)])
+            response = connection.getresponse()
+            response.read()
+            if response.status == 200:
+                samples.append(time.perf_counter() - start)
+            else:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            connection.close()
+            connection = http.client.HTTPConnection(host, port)
+        i += 1
+        
+    connection.close()
+
+def run_load(url, student_ids, concurrency, duration, top_n=5, seed=42):
+    """
+    Run concurrent clients against the service for a fixed duration
+    Args:
+        url: Service base URL
+        student_ids: Student IDs to request (sampled uniformly)
+        concurrency: Number of client threads
+        duration: Seconds to run
+        top_n: Recommendations per request
+        seed: Random seed for the request mix
+    Returns:
+        Dictionary with throughput, error count and latency summary
+    """
+    url = urlparse(url)
+    rng = np.random.default_rng(seed)
+    
+    threads = []
+    samples = [[] for _ in range(concurrency)]
+    errors = []
+    deadline = time.perf_counter() + duration
+    
+    for i in range(concurrency):
+        paths = [f"/recommend?student_id={student_id}&top_n={top_n}" for student_id in rng.choice(student_ids, 1000)]
+        thread = threading.Thread(target=_client, args=(url.hostname, url.port, paths, deadline, samples[i], errors))
+        thread.start()
+        threads.append(thread)
+        
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = max(time.perf_counter() - start, duration)
+    
+    all_samples = [sample for client_samples in samples for sample in client_samples]
+    return {
+        'concurrency': concurrency,
+        'requests': len(all_samples),
+        'errors': len(errors),
+        'requests_per_second': len(all_samples) / elapsed,
+        'latency': summarize(all_samples) if all_samples else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP recommendation service")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32], help="Client threads (one run per value)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per run")
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+    
+    # Request students the service actually knows
+    from utils.data_loader import load_processed_students
+    student_ids = load_processed_students()['student_id'].to_numpy()
+    
+    print("=" * 70)
+    print(f"LOAD TEST {args.url}  ({len(student_ids)} students, {args.duration:.0f} s per run)")
+    print("=" * 70)
+    
+    results = []
+    for concurrency in args.concurrency:
+        result = run_load(args.url, student_ids, concurrency, args.duration, args.top_n, args.seed)
+        results.append(result)
+        
+        latency = result['latency'] or {'p50_ms': 0, 'p95_ms': 0, 'p99_ms': 0}
+        print(f"  concurrency {concurrency:>4}   {result['requests_per_second']:>9.1f} req/s   "
+              f"p50 {latency['p50_ms']:>8.2f} ms   p95 {latency['p95_ms']:>8.2f} ms   "
+              f"p99 {latency['p99_ms']:>8.2f} ms   errors {result['errors']}")
+              
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Benchmark suite: fit time, recommendation latency, feedback handling and peak memory at scale
+Results are written as JSON so runs can be compared across commits (see compare.py)
+
+Usage:
+    python benchmarks/run_benchmarks.py --students 20000 --internships 2000 --feedback 100000
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+import numpy as np
+import config
+from benchmarks.datasets import generate_dataset, write_raw_dataset
+from benchmarks.harness import summarize, time_calls, time_once, peak_rss_mb, quiet, workspace
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    """
+    Run every benchmark stage inside a temporary data workspace
+    Returns:
+        Dictionary of results
+    """
+    # Imported here so the modules pick up config values set from the command line
+    from utils.data_loader import load_all_data, load_processed_internships, load_user_item_matrix
+    from utils.preprocessing import (
+        preprocess_students, preprocess_internships, preprocess_feedback,
+        create_user_item_matrix, save_processed_data
+    )
+    from models.content_based import ContentBasedModel
+    from models.collaborative import CollaborativeFilteringModel
+    from components.recommender import HybridRecommender
+    from components.feedback_handler import FeedbackHandler
+    from utils.feedback_stats import FeedbackPairStats
+    
+    rng = np.random.default_rng(args.seed)
+    results = {'stages': {}, 'latency': {}}
+    stages = results['stages']
+    latency = results['latency']
+    
+    def record(name, seconds):
+        stages[name] = {'seconds': seconds, 'peak_rss_mb': peak_rss_mb()}
+        print(f"  {name:<28} {seconds:>10.3f} s   peak RSS {stages[name]['peak_rss_mb'] or 0:>8.1f} MB")
+        
+    def record_latency(name, samples):
+        latency[name] = summarize(samples)
+        print(f"  {name:<28} p50 {latency[name]['p50_ms']:>9.3f} ms   p95 {latency[name]['p95_ms']:>9.3f} ms   p99 {latency[name]['p99_ms']:>9.3f} ms")
+        
+    with tempfile.TemporaryDirectory() as directory, workspace(directory):
+        print("\n📦 Data")
+        (students, internships, feedback), seconds = time_once(
+            generate_dataset, args.students, args.internships, args.feedback, args.seed
+        )
+        record('generate_dataset', seconds)
+        
+        _, seconds = time_once(write_raw_dataset, os.path.join(directory, 'raw'), students, internships, feedback)
+        record('write_raw_csv', seconds)
+        
+        with quiet():
+            (students, internships, feedback), seconds = time_once(load_all_data)
+        record('load_raw_csv', seconds)
+        
+        def preprocess():
+            students_processed = preprocess_students(students)
+            internships_processed = preprocess_internships(internships)
+            feedback_processed = preprocess_feedback(feedback)
+            user_item_matrix = create_user_item_matrix(feedback_processed)
+            save_processed_data(students_processed, internships_processed, feedback_processed, user_item_matrix)
+            FeedbackPairStats(config.FEEDBACK_FILE, config.FEEDBACK_STATS_FILE).rebuild()
+            
+        with quiet():
+            _, seconds = time_once(preprocess)
+        record('preprocess', seconds)
+        
+        print("\n🤖 Model fit")
+        internships_processed = load_processed_internships()
+        user_item_matrix = load_user_item_matrix()
+        
+        with quiet():
+            _, seconds = time_once(ContentBasedModel().fit, internships_processed)
+        record('content_fit', seconds)
+        
+        with quiet():
+            _, seconds = time_once(CollaborativeFilteringModel(n_neighbors=config.NUM_NEIGHBORS).fit, user_item_matrix)
+        record('collaborative_fit', seconds)
+        
+        with quiet():
+            recommender, seconds = time_once(HybridRecommender, use_snapshot=False)
+        record('recommender_init', seconds)
+        
+        with quiet():
+            _, seconds = time_once(recommender.save_snapshot)
+        record('save_snapshot', seconds)
+        
+        with quiet():
+            recommender, seconds = time_once(HybridRecommender, use_snapshot=True)
+        record('recommender_init_snapshot', seconds)
+        
+        print("\n🎯 Recommendation latency")
+        student_ids = recommender.students_df['student_id'].to_numpy()
+        queries = rng.choice(student_ids, args.queries)
+        
+        # Uncached: every call computes its recommendations
+        recommender.result_cache.max_size = 0
+        samples = time_calls(recommender.recommend, [(student_id, args.top_n) for student_id in queries])
+        record_latency('recommend', samples)
+        
+        # Cached: repeated views of the same students
+        recommender.result_cache.max_size = config.RESULT_CACHE_SIZE or args.queries
+        for student_id in queries:
+            recommender.recommend(student_id, args.top_n)
+        samples = time_calls(recommender.recommend, [(student_id, args.top_n) for student_id in queries])
+        record_latency('recommend_cached', samples)
+        
+        batches = [(rng.choice(student_ids, args.batch_size), args.top_n) for _ in range(args.batches)]
+        samples = time_calls(recommender.recommend_many, batches)
+        record_latency('recommend_many', samples)
+        latency['recommend_many']['batch_size'] = args.batch_size
+        latency['recommend_many']['students_per_second'] = args.batch_size / (latency['recommend_many']['mean_ms'] / 1000)
+        
+        print("\n💬 Feedback")
+        with quiet():
+            handler = FeedbackHandler(recommender)
+            internship_ids = recommender.internships_df['internship_id'].to_numpy()
+            entries = [
+                (student_id, internship_id, int(rating), "Benchmark feedback")
+                for student_id, internship_id, rating in zip(
+                    rng.choice(student_ids, args.feedback_events),
+                    rng.choice(internship_ids, args.feedback_events),
+                    rng.integers(1, 6, args.feedback_events)
+                )
+            ]
+            samples = time_calls(handler.add_feedback, entries)
+        record_latency('add_feedback', samples)
+        
+        with quiet():
+            _, seconds = time_once(handler.update_models, recommender, incremental=True)
+        record('update_models_incremental', seconds)
+        
+        with quiet():
+            _, seconds = time_once(handler.update_models, recommender, incremental=False)
+        record('update_models_full', seconds)
+        
+        # Patching the students with new feedback has to stay cheaper than retraining from the log
+        incremental, full = stages['update_models_incremental']['seconds'], stages['update_models_full']['seconds']
+        if incremental >= full:
+            raise AssertionError(f"Incremental model update took {incremental:.3f} s, full update {full:.3f} s")
+            
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommendation system benchmarks")
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--internships', type=int, default=1000)
+    parser.add_argument('--feedback', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--queries', type=int, default=500, help="Single recommend() calls timed")
+    parser.add_argument('--top-n', type=int, default=config.TOP_N_RECOMMENDATIONS)
+    parser.add_argument('--batch-size', type=int, default=1000, help="Students per recommend_many() call")
+    parser.add_argument('--batches', type=int, default=10, help="recommend_many() calls timed")
+    parser.add_argument('--feedback-events', type=int, default=200, help="add_feedback() calls timed")
+    parser.add_argument('--engine', default=config.COLLABORATIVE_ENGINE, help="Collaborative engine used by the recommender")
+    parser.add_argument('--neighbors', type=int, default=config.NUM_NEIGHBORS, help="Top-k students for the neighborhood engine")
+    parser.add_argument('--output', default=None, help="JSON output path (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args()
+    
+    config.COLLABORATIVE_ENGINE = args.engine
+    config.NUM_NEIGHBORS = args.neighbors
+    
+    print("=" * 70)
+    print("RECOMMENDATION SYSTEM BENCHMARKS")
+    print("=" * 70)
+    print(f"Students: {args.students}  Internships: {args.internships}  Feedback: {args.feedback}  Engine: {args.engine}")
+    
+    results = run(args)
+    
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__
+        },
+        'params': vars(args),
+        **results
+    }
+    
+    output = args.output or os.path.join(
+        'benchmarks', 'results', f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+        
+    print("\n" + "=" * 70)
+    print(f"✅ Benchmark results saved to {output} (peak RSS {report['peak_rss_mb'] or 0:.1f} MB)")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
 """
 Components Package
 Main system components and handlers
+Components are imported on first use (see utils/lazy.py), so e.g. FeedbackHandler does not load the models
 """
 
-from .recommender import HybridRecommender
-from .feedback_handler import FeedbackHandler
+from utils.lazy import lazy_exports
 
-__all__ = [
-    'HybridRecommender',
-    'FeedbackHandler'
-]
+# Public name -> submodule defining it
+_EXPORTS = {
+    'HybridRecommender': 'recommender',
+    'model_fingerprint': 'recommender',
+    'ShardedScorer': 'bulk_scoring',
+    'FeedbackHandler': 'feedback_handler',
+    'MicroBatcher': 'service',
+    'RecommendationService': 'service'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,210 @@
+"""
+Sharded Bulk Scoring
+Scores the whole student base across a process pool and writes the precomputed top-N table
+Students are split into contiguous shards; every worker loads the model snapshot once (memory-mapped,
+so the pages are shared) and writes each finished shard atomically with its own manifest. A rerun
+after a crash skips the shards already on disk
+"""
+
+import json
+import os
+import shutil
+import time
+import numpy as np
+from threadpoolctl import threadpool_limits
+import config
+from components.recommender import HybridRecommender, model_fingerprint
+from utils.parallel import ordered_map
+from utils.snapshot import MANIFEST_FILE, save_array, load_array, write_json, read_json, swap_directory
+from utils.topn_table import TopNTableWriter
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+# Recommender of this worker process, loaded once by _init_worker
+_worker_recommender = None
+
+def _use_recommender(recommender):
+    """Serial runs: score with the caller's recommender instead of loading the snapshot again"""
+    global _worker_recommender
+    _worker_recommender = recommender
+
+def _init_worker(snapshot_dir, fingerprint):
+    """Worker: load the model snapshot once and check it is the one the run was planned with"""
+    global _worker_recommender
+    
+    # One BLAS thread per process; the pool already uses every core
+    threadpool_limits(1)
+    
+    config.SNAPSHOT_DIR = snapshot_dir
+    _worker_recommender = HybridRecommender(use_topn_table=False)
+    
+    if model_fingerprint(snapshot_dir) != fingerprint:
+        raise RuntimeError("Model snapshot changed while bulk scoring; rerun to start over")
+
+def _score_shard(task):
+    """Worker: score one shard of students and write it atomically"""
+    shard_dir, start, stop, top_n, chunk_size = task
+    recommender = _worker_recommender
+    began = time.perf_counter()
+    
+    student_ids = recommender.students_df['student_id'].to_numpy()[start:stop]
+    profiles = recommender.students_df['skill_profile'].to_numpy()[start:stop]
+    
+    # get_batch_recommendations scores chunk_size students per sparse matrix product
+    positions, scores = recommender.hybrid_model.get_batch_recommendations(student_ids, profiles, top_n, chunk_size)
+    
+    # Write into a temporary directory and swap it in, so a shard on disk is always complete
+    tmp_dir = f"{shard_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    save_array(tmp_dir, 'student_ids', np.asarray(student_ids, dtype=str))
+    save_array(tmp_dir, 'positions', positions.astype(np.int32))
+    save_array(tmp_dir, 'scores', scores)
+    
+    # Manifest is written last
+    write_json(tmp_dir, MANIFEST_FILE, {'start': start, 'stop': stop, 'top_n': int(positions.shape[1])})
+    swap_directory(tmp_dir, shard_dir)
+    
+    return stop - start, time.perf_counter() - began
+
+class ShardedScorer:
+    def __init__(self, recommender, directory=None, top_n=None, shard_size=None, workers=None,
+                 chunk_size=1024, snapshot_dir=None):
+        """
+        Bulk scoring run writing the precomputed top-N table
+        Args:
+            recommender: HybridRecommender with the models to score with (its snapshot is saved if stale)
+            directory: Target table directory (defaults to config.TOPN_TABLE_DIR)
+            top_n: Recommendations stored per student (defaults to config.TOPN_TABLE_SIZE)
+            shard_size: Students per shard, the unit of work and of checkpointing (defaults to config.BULK_SHARD_SIZE)
+            workers: Scoring processes (defaults to config.NUM_WORKERS, 1 scores in this process)
+            chunk_size: Students per sparse matrix product inside a shard
+            snapshot_dir: Snapshot the workers load (defaults to config.SNAPSHOT_DIR)
+        """
+        self.recommender = recommender
+        self.directory = directory or config.TOPN_TABLE_DIR
+        self.top_n = top_n or config.TOPN_TABLE_SIZE
+        self.shard_size = shard_size or config.BULK_SHARD_SIZE
+        self.workers = config.NUM_WORKERS if workers is None else workers
+        self.chunk_size = chunk_size
+        self.snapshot_dir = snapshot_dir or config.SNAPSHOT_DIR
+        
+        # Finished shards live next to the table until it has been written
+        self.checkpoint_dir = f"{self.directory}.shards"
+        
+    def _shard_dir(self, index):
+        return os.path.join(self.checkpoint_dir, f"shard_{index:05d}")
+        
+    def plan(self):
+        """
+        Split the students into shards
+        Returns:
+            List of (index, start, stop) student row ranges
+        """
+        n_students = len(self.recommender.students_df)
+        starts = range(0, n_students, self.shard_size)
+        return [(index, start, min(start + self.shard_size, n_students)) for index, start in enumerate(starts)]
+        
+    def _run_manifest(self, fingerprint):
+        """Checkpoint manifest: shards are only reused by a run with exactly these settings and models"""
+        return {
+            'format_version': CHECKPOINT_FORMAT_VERSION,
+            'n_students': len(self.recommender.students_df),
+            'shard_size': self.shard_size,
+            'top_n': self.top_n,
+            'model_fingerprint': fingerprint
+        }
+        
+    def completed_shards(self):
+        """Indices of the shards already written by this (or an interrupted) run"""
+        return {index for index, _, _ in self.plan()
+                if read_json(self._shard_dir(index), MANIFEST_FILE) is not None}
+                
+    def run(self, keep_checkpoints=False):
+        """
+        Score every shard not yet on disk, then write the top-N table from all shards
+        Args:
+            keep_checkpoints: Keep the shard files after the table is written
+        Returns:
+            Dictionary with students, shards, shards_scored, shards_skipped, seconds and students_per_second
+        """
+        began = time.perf_counter()
+        
+        # Worker processes load the snapshot, so it has to match the models of this recommender
+        if self.workers > 1:
+            self.recommender.ensure_snapshot(self.snapshot_dir)
+        fingerprint = model_fingerprint(self.snapshot_dir)
+        
+        manifest = self._run_manifest(fingerprint)
+        if read_json(self.checkpoint_dir, MANIFEST_FILE) != manifest:
+            if os.path.exists(self.checkpoint_dir):
+                print("⚠️ Checkpoints are from other models or settings, starting over")
+            shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+            write_json(self.checkpoint_dir, MANIFEST_FILE, manifest)
+            
+        shards = self.plan()
+        done = self.completed_shards()
+        pending = [(index, start, stop) for index, start, stop in shards if index not in done]
+        
+        if done:
+            print(f"🔄 Resuming: {len(done)} of {len(shards)} shards already scored")
+        print(f"🔄 Scoring {len(pending)} shards with {self.workers} worker(s)...")
+        
+        tasks = [(self._shard_dir(index), start, stop, self.top_n, self.chunk_size) for index, start, stop in pending]
+        
+        if self.workers > 1:
+            initializer, initargs = _init_worker, (self.snapshot_dir, fingerprint)
+        else:
+            initializer, initargs = _use_recommender, (self.recommender,)
+        results = ordered_map(_score_shard, tasks, self.workers, initializer=initializer, initargs=initargs)
+        
+        for (index, _, _), (n_students, seconds) in zip(pending, results):
+            print(f"  ✅ Shard {index + 1}/{len(shards)}: {n_students} students in {seconds:.1f} s")
+            
+        self.merge(fingerprint)
+        
+        if not keep_checkpoints:
+            shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+            
+        seconds = time.perf_counter() - began
+        n_students = len(self.recommender.students_df)
+        
+        return {
+            'students': n_students,
+            'shards': len(shards),
+            'shards_scored': len(pending),
+            'shards_skipped': len(shards) - len(pending),
+            'seconds': seconds,
+            'students_per_second': n_students / seconds if seconds else 0.0
+        }
+        
+    def merge(self, fingerprint):
+        """
+        Write the top-N table from the finished shards
+        Args:
+            fingerprint: model_fingerprint() the shards were scored with (stored in the table manifest)
+        """
+        student_ids = self.recommender.students_df['student_id'].to_numpy()
+        shards = self.plan()
+        writer = None
+        
+        for index, start, stop in shards:
+            shard_dir = self._shard_dir(index)
+            shard_ids = load_array(shard_dir, 'student_ids')
+            
+            if not np.array_equal(shard_ids, np.asarray(student_ids[start:stop], dtype=str)):
+                raise RuntimeError(f"Shard {index} holds other students than planned; delete {self.checkpoint_dir} and rerun")
+                
+            positions = load_array(shard_dir, 'positions')
+            if writer is None:
+                writer = TopNTableWriter(
+                    self.directory, student_ids, self.recommender.internships_df['internship_id'].to_numpy(), positions.shape[1]
+                )
+            writer.write(start, positions, load_array(shard_dir, 'scores'))
+            
+        if writer is None:
+            print("⚠️ No students to score, top-N table not written")
+            return
+            
+        writer.close({'model_fingerprint': json.loads(fingerprint), 'shards': len(shards)})
+        print(f"✅ Top-N table for {len(student_ids)} students saved to {self.directory}")
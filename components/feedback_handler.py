@@ -3,14 +3,54 @@ Feedback Handler Component
 Manages user feedback and updates the learning agent
 """
 
+import csv
+import os
+import numpy as np
 import pandas as pd
 import config
 from datetime import datetime
+from utils.feedback_stats import FeedbackPairStats
 
 class FeedbackHandler:
-    def __init__(self):
-        """Initialize feedback handler"""
-        self.feedback_df = pd.read_csv(config.FEEDBACK_FILE)
+    def __init__(self, recommender=None):
+        """
+        Initialize feedback handler
+        Args:
+            recommender: Optional HybridRecommender whose cached results are invalidated by new feedback
+        """
+        self.recommender = recommender
+        
+        # Only the header is read here; the log itself is loaded on first use of feedback_df
+        self._columns = pd.read_csv(config.FEEDBACK_FILE, nrows=0).columns.tolist()
+        self._feedback_df = None
+        
+        # Rows appended since feedback_df was last materialized
+        self._new_rows = []
+        
+        # (student_id, internship_id) pairs not yet applied to the models
+        self._pending_pairs = set()
+        
+        # Running (sum, count) of ratings per pair, caught up from the tail of the log
+        self._pair_stats = FeedbackPairStats(
+            config.FEEDBACK_FILE, config.FEEDBACK_STATS_FILE, config.FEEDBACK_STATS_CHECKPOINT_PAIRS
+        )
+        
+    @property
+    def feedback_df(self):
+        """All feedback, including rows appended since the log was loaded"""
+        if self._feedback_df is None:
+            # The log already holds the rows appended so far
+            self._feedback_df = pd.read_csv(config.FEEDBACK_FILE)
+            self._new_rows = []
+            
+        if self._new_rows:
+            self._feedback_df = pd.concat([
+                self._feedback_df,
+                pd.DataFrame(self._new_rows, columns=self._columns)
+            ], ignore_index=True)
+            self._new_rows = []
+            
+        return self._feedback_df
         
     def add_feedback(self, student_id, internship_id, rating, feedback_text, would_recommend='Yes'):
         """
@@ -31,55 +71,107 @@ class FeedbackHandler:
             'would_recommend': would_recommend
         }
         
-        # Append to dataframe
-        self.feedback_df = pd.concat([
-            self.feedback_df,
-            pd.DataFrame([new_feedback])
-        ], ignore_index=True)
+        # Append one line to the CSV log instead of rewriting the whole file
+        self._append_to_log(new_feedback)
         
-        # Save to CSV
-        self.feedback_df.to_csv(config.FEEDBACK_FILE, index=False)
+        self._new_rows.append(new_feedback)
+        self._pending_pairs.add((student_id, internship_id))
         
+        if self.recommender is not None:
+            self.recommender.invalidate_student(student_id)
+            
         print(f"✅ Feedback added for {student_id} → {internship_id}")
         
         return True
-    
+        
+    def _append_to_log(self, row):
+        """Append a single feedback row to the CSV log"""
+        # Make sure the last existing line is terminated
+        needs_newline = False
+        if os.path.getsize(config.FEEDBACK_FILE) > 0:
+            with open(config.FEEDBACK_FILE, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+                
+        with open(config.FEEDBACK_FILE, 'a', newline='') as f:
+            if needs_newline:
+                f.write('\n')
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow([row.get(column, '') for column in self._columns])
+            
     def get_student_feedback(self, student_id):
         """Get all feedback from a specific student"""
         return self.feedback_df[self.feedback_df['student_id'] == student_id]
-    
+        
     def get_internship_feedback(self, internship_id):
         """Get all feedback for a specific internship"""
         return self.feedback_df[self.feedback_df['internship_id'] == internship_id]
-    
+        
     def get_average_rating(self, internship_id):
         """Get average rating for an internship"""
         internship_feedback = self.get_internship_feedback(internship_id)
         
         if len(internship_feedback) == 0:
             return 0.0
-        
+            
         return internship_feedback['rating'].mean()
-    
-    def update_models(self, recommender):
+        
+    def update_models(self, recommender, incremental=True):
         """
         Update recommendation models with new feedback
         This implements the Learning Agent concept
         Args:
             recommender: HybridRecommender instance
+            incremental: Patch only students with new feedback (False retrains from the full log)
         """
+        if incremental:
+            return self._update_models_incremental(recommender)
+            
         print("🔄 Updating models with new feedback...")
         
         # Reload feedback data
         feedback_df = pd.read_csv(config.FEEDBACK_FILE)
         
         # Recreate user-item matrix
-        from utils.preprocessing import create_user_item_matrix, save_processed_data
+        from utils.preprocessing import create_user_item_matrix
         
         user_item_matrix = create_user_item_matrix(feedback_df)
         
         # Retrain collaborative model
         recommender.collaborative_model.fit(user_item_matrix)
+        recommender.models_updated()
+        
+        self._pending_pairs.clear()
+        
+        print("✅ Models updated successfully! System is now smarter.")
+        
+        return True
+        
+    def _update_models_incremental(self, recommender):
+        """Apply pending feedback pairs to the collaborative model without retraining"""
+        if not self._pending_pairs:
+            return True
+            
+        print(f"🔄 Applying {len(self._pending_pairs)} new feedback entries to models...")
+        
+        # Reads only the log lines appended since the statistics were last caught up
+        self._pair_stats.catch_up()
+        
+        # Stored rating for a pair is the mean of all its feedback, as in a full rebuild
+        student_ids = [pair[0] for pair in self._pending_pairs]
+        internship_ids = [pair[1] for pair in self._pending_pairs]
+        ratings = self._pair_stats.means(student_ids, internship_ids)
+        
+        # Pairs whose feedback carries no rating leave the matrix unchanged
+        rated = ~np.isnan(ratings)
+        recommender.collaborative_model.partial_update(
+            np.asarray(student_ids, dtype=object)[rated],
+            np.asarray(internship_ids, dtype=object)[rated],
+            ratings[rated]
+        )
+        recommender.models_updated()
+        
+        self._pending_pairs.clear()
         
         print("✅ Models updated successfully! System is now smarter.")
         
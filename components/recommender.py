@@ -3,52 +3,136 @@ Main Hybrid Recommender Component
 Integrates all models and provides recommendation interface
 """
 
-import pandas as pd
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+import numpy as np
 import config
 from models.content_based import ContentBasedModel
 from models.collaborative import CollaborativeFilteringModel
+from models.matrix_factorization import MatrixFactorizationModel
+from models.item_based import ItemBasedModel
 from models.hybrid import HybridModel
+from utils.id_index import IdIndex
+from utils.catalog import InternshipCatalog
+from utils.topn_table import TopNTable
+from utils.result_cache import ResultCache
+from utils.metrics import timed, timed_call
+from utils.data_loader import load_processed_students, load_processed_internships, load_user_item_matrix
+from utils.snapshot import SNAPSHOT_FORMAT_VERSION, MANIFEST_FILE, write_json, read_json, file_fingerprint, swap_directory
+
+# Collaborative model class for each config.COLLABORATIVE_ENGINE value
+COLLABORATIVE_ENGINES = {
+    'neighborhood': CollaborativeFilteringModel,
+    'matrix_factorization': MatrixFactorizationModel,
+    'item': ItemBasedModel
+}
+
+def model_fingerprint(snapshot_dir=None):
+    """
+    Fingerprint of everything a loaded recommender depends on: processed tables, rating matrix,
+    snapshot manifest and the settings that change its rankings
+    Cheap (a few stat calls); changes whenever preprocessing runs or a new snapshot is saved
+    Args:
+        snapshot_dir: Snapshot directory (defaults to config.SNAPSHOT_DIR)
+    Returns:
+        JSON string usable as a cache key
+    """
+    snapshot_dir = snapshot_dir or config.SNAPSHOT_DIR
+    
+    return json.dumps({
+        'students': file_fingerprint([os.path.join(config.STUDENTS_TABLE, 'schema.json')]),
+        'sources': file_fingerprint(HybridRecommender._snapshot_sources()),
+        'snapshot': file_fingerprint([os.path.join(snapshot_dir, MANIFEST_FILE)]),
+        'collaborative_engine': config.COLLABORATIVE_ENGINE,
+        'num_neighbors': config.NUM_NEIGHBORS,
+        'content_weight': config.CONTENT_WEIGHT,
+        'collaborative_weight': config.COLLABORATIVE_WEIGHT,
+        'candidate_pool': config.CANDIDATE_POOL,
+        'candidate_pool_size': config.CANDIDATE_POOL_SIZE,
+        'content_backend': config.CONTENT_BACKEND
+    }, sort_keys=True)
 
 class HybridRecommender:
-    def __init__(self):
-        """Initialize the hybrid recommender system"""
+    # Columns needed for scoring and display (other processed columns are never read)
+    STUDENT_COLUMNS = ['student_id', 'name', 'branch', 'year', 'cgpa', 'skills', 'domain_interest', 'skill_profile']
+    INTERNSHIP_COLUMNS = ['internship_id', 'company', 'domain', 'role', 'required_skills', 'location',
+                          'duration_months', 'stipend', 'rating', 'total_reviews', 'internship_profile']
+                          
+    def __init__(self, use_snapshot=True, use_topn_table=None):
+        """
+        Initialize the hybrid recommender system
+        Args:
+            use_snapshot: Load fitted models from config.SNAPSHOT_DIR when it is up to date instead of retraining
+            use_topn_table: Serve from the precomputed table in config.TOPN_TABLE_DIR when present
+                            (defaults to config.USE_TOPN_TABLE)
+        """
         self.content_model = None
         self.collaborative_model = None
         self.hybrid_model = None
         self.students_df = None
         self.internships_df = None
+        self.student_index = None
+        self.internship_index = None
+        self.catalog = None
+        
+        # Cached recommend() results; model_version is part of the key and bumped on model updates
+        self.model_version = 0
+        self.result_cache = ResultCache(config.RESULT_CACHE_SIZE, config.RESULT_CACHE_TTL)
+        
+        # Precomputed top-N table; students in _topn_stale are scored live until the next build
+        self.topn_table = None
+        self._topn_stale = set()
+        
+        # Table directory watched for nightly rebuilds (None when not serving from a table)
+        self._topn_dir = None
+        self._topn_manifest = None
+        self._topn_checked = 0.0
         
         # Load processed data
         self._load_data()
         
-        # Train models
-        self._train_models()
-        
+        # Load fitted models from snapshot, or train them
+        if use_snapshot and self._snapshot_is_current(config.SNAPSHOT_DIR):
+            self._load_snapshot(config.SNAPSHOT_DIR)
+        else:
+            self._train_models(load_user_item_matrix())
+            
+        if config.USE_TOPN_TABLE if use_topn_table is None else use_topn_table:
+            self.load_topn_table()
+            
     def _load_data(self):
         """Load preprocessed data"""
         print("📂 Loading processed data...")
         
-        self.students_df = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/students_processed.csv")
-        self.internships_df = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/internships_processed.csv")
-        user_item_matrix = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/user_item_matrix.csv", index_col=0)
+        self.students_df = load_processed_students(self.STUDENT_COLUMNS)
+        self.internships_df = load_processed_internships(self.INTERNSHIP_COLUMNS)
         
-        print(f"✅ Loaded {len(self.students_df)} students, {len(self.internships_df)} internships")
+        # Intern ids once so every lookup is an array index
+        self.student_index = IdIndex(self.students_df['student_id'])
+        self.internship_index = IdIndex(self.internships_df['internship_id'])
         
-        return user_item_matrix
+        # Read-only column arrays for formatting results by row position
+        self.catalog = InternshipCatalog(self.internships_df)
         
-    def _train_models(self):
-        """Train all recommendation models"""
-        print("\n🤖 Training recommendation models...")
+        print(f"✅ Loaded {len(self.students_df)} students, {len(self.internships_df)} internships")
         
-        # Load user-item matrix
-        user_item_matrix = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/user_item_matrix.csv", index_col=0)
+    def _train_models(self, user_item_matrix):
+        """
+        Train all recommendation models
+        Args:
+            user_item_matrix: Sparse UserItemMatrix for the collaborative model
+        """
+        print("\n🤖 Training recommendation models...")
         
         # Train content-based model
         self.content_model = ContentBasedModel()
         self.content_model.fit(self.internships_df)
         
         # Train collaborative filtering model
-        self.collaborative_model = CollaborativeFilteringModel()
+        self.collaborative_model = self._create_collaborative_model()
         self.collaborative_model.fit(user_item_matrix)
         
         # Create hybrid model
@@ -56,6 +140,128 @@ class HybridRecommender:
         
         print("✅ All models trained successfully!")
         
+    def _create_collaborative_model(self):
+        """Unfitted collaborative model for config.COLLABORATIVE_ENGINE"""
+        if config.COLLABORATIVE_ENGINE == 'matrix_factorization':
+            return MatrixFactorizationModel(
+                n_factors=config.MF_FACTORS,
+                regularization=config.MF_REGULARIZATION,
+                n_iter=config.MF_ITERATIONS
+            )
+            
+        if config.COLLABORATIVE_ENGINE == 'item':
+            return ItemBasedModel(n_neighbors=config.ITEM_NEIGHBORS)
+            
+        if config.COLLABORATIVE_ENGINE == 'neighborhood':
+            return CollaborativeFilteringModel(n_neighbors=config.NUM_NEIGHBORS)
+            
+        raise ValueError(f"Unknown collaborative engine '{config.COLLABORATIVE_ENGINE}'")
+        
+    @staticmethod
+    def _snapshot_sources():
+        """Processed files the fitted models depend on"""
+        return [
+            os.path.join(config.INTERNSHIPS_TABLE, 'schema.json'),
+            config.USER_ITEM_MATRIX_FILE
+        ]
+        
+    def _snapshot_is_current(self, snapshot_dir):
+        """Check that a snapshot exists and was built from the current processed data and settings"""
+        manifest = read_json(snapshot_dir, MANIFEST_FILE)
+        
+        if manifest is None:
+            return False
+            
+        if (manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION or
+                manifest.get('sources') != file_fingerprint(self._snapshot_sources()) or
+                manifest.get('num_neighbors') != config.NUM_NEIGHBORS or
+                manifest.get('item_neighbors') != config.ITEM_NEIGHBORS or
+                manifest.get('mf_factors') != config.MF_FACTORS or
+                manifest.get('mf_regularization') != config.MF_REGULARIZATION or
+                manifest.get('mf_iterations') != config.MF_ITERATIONS or
+                manifest.get('collaborative_engine', 'neighborhood') != config.COLLABORATIVE_ENGINE):
+            print("⚠️ Model snapshot is stale, retraining models...")
+            return False
+            
+        return True
+        
+    def _load_snapshot(self, snapshot_dir):
+        """Load fitted models from a snapshot (large arrays are memory-mapped)"""
+        print("\n📦 Loading model snapshot...")
+        
+        self.content_model = ContentBasedModel.load(os.path.join(snapshot_dir, 'content'), self.internships_df)
+        self.collaborative_model = COLLABORATIVE_ENGINES[config.COLLABORATIVE_ENGINE].load(os.path.join(snapshot_dir, 'collaborative'))
+        self.hybrid_model = HybridModel(self.content_model, self.collaborative_model)
+        
+        print("✅ All models loaded from snapshot!")
+        
+    def ensure_snapshot(self, snapshot_dir=None):
+        """
+        Save a snapshot of the current models unless an up-to-date one already exists
+        Args:
+            snapshot_dir: Snapshot directory (defaults to config.SNAPSHOT_DIR)
+        Returns:
+            True if a snapshot was written
+        """
+        snapshot_dir = snapshot_dir or config.SNAPSHOT_DIR
+        if self._snapshot_is_current(snapshot_dir):
+            return False
+            
+        self.save_snapshot(snapshot_dir)
+        return True
+        
+    def save_snapshot(self, snapshot_dir=None):
+        """
+        Save fitted models as a memory-mappable snapshot
+        Args:
+            snapshot_dir: Target directory (defaults to config.SNAPSHOT_DIR)
+        """
+        snapshot_dir = snapshot_dir or config.SNAPSHOT_DIR
+        
+        # Write into a temporary directory and swap it in, so readers never see a partial snapshot
+        tmp_dir = f"{snapshot_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        
+        # The IVF index is saved (and memory-mapped on load) when it serves the content shortlist
+        if config.CONTENT_BACKEND == 'ann':
+            self.content_model.build_ann_index()
+            
+        self.content_model.save(os.path.join(tmp_dir, 'content'))
+        self.collaborative_model.save(os.path.join(tmp_dir, 'collaborative'))
+        
+        # Manifest is written last
+        write_json(tmp_dir, MANIFEST_FILE, {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'sources': file_fingerprint(self._snapshot_sources()),
+            'num_neighbors': config.NUM_NEIGHBORS,
+            'item_neighbors': config.ITEM_NEIGHBORS,
+            'mf_factors': config.MF_FACTORS,
+            'mf_regularization': config.MF_REGULARIZATION,
+            'mf_iterations': config.MF_ITERATIONS,
+            'collaborative_engine': config.COLLABORATIVE_ENGINE
+        })
+        
+        swap_directory(tmp_dir, snapshot_dir)
+        
+        print(f"✅ Model snapshot saved to {snapshot_dir}")
+        
+    def get_student(self, student_id):
+        """
+        Get a student's profile row
+        Args:
+            student_id: Student ID
+        Returns:
+            pandas Series with the student's fields, or None if not found
+        """
+        row = self.student_index.get(student_id)
+        
+        if row is None:
+            return None
+            
+        return self.students_df.iloc[row]
+        
+    @timed_call('recommender.recommend')
     def recommend(self, student_id, top_n=5):
         """
         Get top N internship recommendations for a student
@@ -63,39 +269,211 @@ class HybridRecommender:
             student_id: Student ID (e.g., 'S001')
             top_n: Number of recommendations to return
         Returns:
-            List of dictionaries containing internship details
+            List of Recommendation records with internship details (indexable like dictionaries)
         """
+        cache_key = (student_id, top_n, self.model_version)
+        with timed('recommender.cache_lookup'):
+            cached = self.result_cache.get(cache_key)
+            
+        if cached is not None:
+            # Copies, so callers cannot modify the cached result
+            return [recommendation.copy() for recommendation in cached]
+            
+        # Precomputed results, when the nightly table has this student
+        if self._topn_dir is not None:
+            with timed('recommender.topn_lookup'):
+                precomputed = self._lookup_topn([student_id], top_n)
+            if precomputed:
+                return precomputed[student_id]
+                
         # Get student profile
-        student = self.students_df[self.students_df['student_id'] == student_id]
-        
-        if student.empty:
+        with timed('recommender.student_lookup'):
+            row = self.student_index.get(student_id)
+            student_profile = self.students_df['skill_profile'].iat[row] if row is not None else None
+            
+        if row is None:
             print(f"❌ Student {student_id} not found!")
             return []
-        
-        student_profile = student['skill_profile'].values[0]
-        
-        # Get hybrid recommendations
-        recommendations = self.hybrid_model.get_recommendations(
-            student_id, 
-            student_profile, 
-            self.internships_df, 
+            
+        # Get hybrid recommendations as arrays over the whole catalog
+        positions, scores = self.hybrid_model.get_batch_recommendations(
+            np.array([student_id], dtype=object),
+            np.array([student_profile], dtype=object),
             top_n
         )
         
-        # Convert to list of dictionaries
-        result = []
-        for _, row in recommendations.iterrows():
-            result.append({
-                'internship_id': row['internship_id'],
-                'company': row['company'],
-                'role': row['role'],
-                'domain': row['domain'],
-                'location': row['location'],
-                'duration_months': row['duration_months'],
-                'stipend': row['stipend'],
-                'rating': row['rating'],
-                'total_reviews': row['total_reviews'],
-                'match_score': row['hybrid_score']
-            })
-        
-        return result
+        # Convert to result records
+        with timed('recommender.format'):
+            recommendations = self._format_recommendations(positions, scores)[0]
+        self.result_cache.put(cache_key, [recommendation.copy() for recommendation in recommendations])
+        
+        return recommendations
+        
+    def invalidate_student(self, student_id):
+        """Drop cached recommendations for one student (e.g. after they give feedback)"""
+        self.result_cache.invalidate(student_id)
+        self._topn_stale.add(student_id)
+        
+    def models_updated(self):
+        """Mark the models as changed: bumps the model version and drops all cached recommendations"""
+        self.model_version += 1
+        self.result_cache.clear()
+        
+        # Precomputed results came from the old models; score live until the table is rebuilt
+        # (the current build stays recorded, so only a newer one is loaded)
+        self.topn_table = None
+        
+    def load_topn_table(self, directory=None):
+        """
+        Start serving from a precomputed top-N table
+        Args:
+            directory: Table directory (defaults to config.TOPN_TABLE_DIR)
+        Returns:
+            True if a table was loaded, False if there is none or it was built for another internship
+            catalog or other models (older processed data or snapshot)
+        """
+        directory = directory or config.TOPN_TABLE_DIR
+        
+        # Remember which build was looked at, so only a newer build is loaded again
+        self._topn_dir = directory
+        self._topn_manifest = file_fingerprint([os.path.join(directory, MANIFEST_FILE)])
+        self._topn_checked = time.monotonic()
+        
+        table = TopNTable.open(directory)
+        
+        if table is not None and not table.matches_catalog(self.internships_df['internship_id'].to_numpy()):
+            print("⚠️ Top-N table was built for a different internship catalog, scoring live")
+            table = None
+            
+        if table is not None and table.manifest.get('model_fingerprint') != json.loads(model_fingerprint()):
+            print("⚠️ Top-N table was built with other models, scoring live until it is rebuilt")
+            table = None
+            
+        self.topn_table = table
+        self._topn_stale = set()
+        
+        if table is not None:
+            print(f"✅ Serving precomputed top-{table.top_n} for {len(table)} students (built {table.manifest.get('created')})")
+        return table is not None
+        
+    def _refresh_topn_table(self):
+        """
+        Load the table again when the nightly build has replaced it
+        The manifest is checked at most every config.TOPN_TABLE_CHECK_SECONDS, so a long-running app or
+        service picks up a rebuild without a restart (and stops mapping the replaced files)
+        """
+        now = time.monotonic()
+        if self._topn_dir is None or now - self._topn_checked < config.TOPN_TABLE_CHECK_SECONDS:
+            return
+            
+        self._topn_checked = now
+        if file_fingerprint([os.path.join(self._topn_dir, MANIFEST_FILE)]) != self._topn_manifest:
+            self.load_topn_table(self._topn_dir)
+            
+    def _lookup_topn(self, student_ids, top_n):
+        """
+        Results for the students found in the precomputed table
+        Args:
+            student_ids: Student IDs
+            top_n: Number of recommendations per student
+        Returns:
+            Dictionary mapping student ID -> list of Recommendation records (only for table hits)
+        """
+        self._refresh_topn_table()
+        
+        if self.topn_table is None or top_n > self.topn_table.top_n:
+            return {}
+            
+        student_ids = np.asarray(student_ids, dtype=object)
+        rows = self.student_index.get_indexer(student_ids)
+        
+        # Students with newer feedback than the table are scored live
+        if self._topn_stale:
+            rows[np.isin(student_ids, list(self._topn_stale))] = -1
+            
+        found, positions, scores = self.topn_table.lookup(rows, student_ids, top_n)
+        if not found.any():
+            return {}
+            
+        return dict(zip(student_ids[found], self._format_recommendations(positions, scores)))
+        
+    def build_topn_table(self, directory=None, top_n=None, chunk_size=1024):
+        """
+        Score every student in this process and write the precomputed top-N table
+        (scripts/08_build_topn_table.py runs the same ShardedScorer across processes)
+        Args:
+            directory: Target directory (defaults to config.TOPN_TABLE_DIR)
+            top_n: Recommendations stored per student (defaults to config.TOPN_TABLE_SIZE)
+            chunk_size: Students scored per batch
+        Returns:
+            Number of students written
+        """
+        # Imported here: bulk_scoring imports this module
+        from components.bulk_scoring import ShardedScorer
+        
+        return ShardedScorer(self, directory, top_n, workers=1, chunk_size=chunk_size).run()['students']
+        
+    def _format_recommendations(self, positions, scores):
+        """
+        Build result records for the selected internships only
+        Args:
+            positions: Array of internship row positions, shape (n_students, top_n)
+            scores: Array of hybrid scores, same shape
+        Returns:
+            List (one per student) of lists of Recommendation records (read like dictionaries)
+        """
+        return self.catalog.records(positions, scores)
+        
+    @timed_call('recommender.recommend_many')
+    def recommend_many(self, student_ids, top_n=5, chunk_size=1024, use_cache=False):
+        """
+        Get top N internship recommendations for many students in one batch
+        Args:
+            student_ids: List of student IDs
+            top_n: Number of recommendations per student
+            chunk_size: Number of students scored per sparse matrix product
+            use_cache: Serve cached results and cache computed ones, like recommend()
+        Returns:
+            Dictionary mapping student ID -> list of Recommendation records (same format as recommend);
+            unknown students map to an empty list
+        """
+        # Precomputed results first, then cached, then scored
+        results = self._lookup_topn(student_ids, top_n)
+        if results:
+            student_ids = [student_id for student_id in student_ids if student_id not in results]
+            
+        if use_cache:
+            misses = []
+            for student_id in dict.fromkeys(student_ids):
+                cached = self.result_cache.get((student_id, top_n, self.model_version))
+                if cached is None:
+                    misses.append(student_id)
+                else:
+                    results[student_id] = [recommendation.copy() for recommendation in cached]
+            student_ids = misses
+            
+        student_ids = np.asarray(student_ids, dtype=object)
+        
+        # Vectorized lookup of all student rows
+        rows = self.student_index.get_indexer(student_ids)
+        found = rows >= 0
+        
+        results.update({student_id: [] for student_id in student_ids[~found]})
+        if not found.any():
+            return results
+            
+        found_ids = student_ids[found]
+        profiles = self.students_df['skill_profile'].to_numpy()[rows[found]]
+        
+        # Batch hybrid scoring
+        positions, scores = self.hybrid_model.get_batch_recommendations(found_ids, profiles, top_n, chunk_size)
+        
+        with timed('recommender.format'):
+            formatted = self._format_recommendations(positions, scores)
+            
+        for student_id, recommendations in zip(found_ids, formatted):
+            results[student_id] = recommendations
+            if use_cache:
+                self.result_cache.put((student_id, top_n, self.model_version), [recommendation.copy() for recommendation in recommendations])
+                
+        return results
@@ -0,0 +1,293 @@
+"""
+HTTP Recommendation Service
+Serves recommendations from one loaded HybridRecommender over HTTP (standard library only);
+concurrent single-student requests are merged into micro-batches and scored in one vectorized call
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import config
+from utils.metrics import metrics
+from components.recommender import HybridRecommender
+
+class MicroBatcher:
+    def __init__(self, recommender, max_batch_size=256, max_wait_ms=5):
+        """
+        Merge concurrent recommendation requests into batch scoring calls
+        A single worker thread owns the recommender, so request threads never score concurrently
+        Args:
+            recommender: HybridRecommender to score with
+            max_batch_size: Most requests scored in one call
+            max_wait_ms: How long the first request of a batch waits for more requests
+        """
+        self.recommender = recommender
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        
+        self._queue = queue.Queue()
+        self._worker = None
+        self._running = False
+        
+        self.n_requests = 0
+        self.n_batches = 0
+        self.largest_batch = 0
+        
+    def start(self):
+        """Start the batching worker thread"""
+        if self._running:
+            return
+            
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+        
+    def stop(self):
+        """Stop the worker after the requests already queued"""
+        if not self._running:
+            return
+            
+        self._running = False
+        self._queue.put(None)
+        self._worker.join()
+        
+    def submit(self, student_id, top_n=5):
+        """
+        Queue one request
+        Args:
+            student_id: Student ID
+            top_n: Number of recommendations
+        Returns:
+            Future resolving to the list of Recommendation records
+        """
+        future = Future()
+        self._queue.put((student_id, top_n, future))
+        return future
+        
+    def recommend(self, student_id, top_n=5, timeout=None):
+        """
+        Blocking single-student request, scored as part of a batch
+        Raises TimeoutError (and withdraws the request if it is still queued) after timeout seconds
+        """
+        future = self.submit(student_id, top_n)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+            
+    def _collect(self):
+        """
+        Wait for one request, then gather more until the batch is full or max_wait has passed
+        A request arriving at an idle service is dispatched at once; the batch only waits for
+        stragglers when other requests were already queued behind the first one (i.e. under load)
+        Returns:
+            List of (student_id, top_n, future), or None when stopping
+        """
+        first = self._queue.get()
+        if first is None:
+            return None
+            
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Take whatever is queued; linger for more only once the batch holds several requests
+                if len(batch) > 1 and remaining > 0:
+                    request = self._queue.get(timeout=remaining)
+                else:
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+                
+            if request is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(request)
+            
+        return batch
+        
+    def _run(self):
+        """Worker loop: score each collected batch with one recommend_many call per top_n"""
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+                
+            self.n_requests += len(batch)
+            self.n_batches += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+            
+            # Requests withdrawn after a timeout are dropped; the rest can no longer be cancelled
+            by_top_n = {}
+            for student_id, top_n, future in batch:
+                if future.set_running_or_notify_cancel():
+                    by_top_n.setdefault(top_n, []).append((student_id, future))
+                    
+            for top_n, requests in by_top_n.items():
+                try:
+                    results = self.recommender.recommend_many(
+                        [student_id for student_id, _ in requests], top_n, use_cache=True
+                    )
+                    
+                    # Each request gets its own copy of the result
+                    for student_id, future in requests:
+                        future.set_result([recommendation.copy() for recommendation in results[student_id]])
+                except Exception as e:
+                    # Fail the requests still waiting; the worker keeps serving later batches
+                    for _, future in requests:
+                        if not future.done():
+                            future.set_exception(e)
+                            
+    def stats(self):
+        """Batching counters"""
+        return {
+            'requests': self.n_requests,
+            'batches': self.n_batches,
+            'mean_batch_size': self.n_requests / self.n_batches if self.n_batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'queued': self._queue.qsize()
+        }
+
+class RecommendationRequestHandler(BaseHTTPRequestHandler):
+    """
+    Routes:
+        GET /recommend?student_id=S001&top_n=5  -> {"student_id", "recommendations"}
+        GET /health                             -> {"status": "ok", ...}
+        GET /stats                              -> batching, cache and top-N table counters
+        GET /metrics                            -> per-stage latency histograms (Prometheus text)
+    """
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so clients can reuse connections
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't wait for delayed ACKs
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        service = self.server.service
+        
+        if url.path == '/recommend':
+            student_id = params.get('student_id', [None])[0]
+            if not student_id:
+                return self._send_json(400, {'error': "Missing student_id"})
+                
+            try:
+                top_n = int(params.get('top_n', [config.TOP_N_RECOMMENDATIONS])[0])
+            except ValueError:
+                return self._send_json(400, {'error': "top_n must be an integer"})
+                
+            if top_n < 1 or top_n > service.max_top_n:
+                return self._send_json(400, {'error': f"top_n must be between 1 and {service.max_top_n}"})
+                
+            if student_id not in service.recommender.student_index:
+                return self._send_json(404, {'error': f"Student {student_id} not found"})
+                
+            try:
+                recommendations = service.batcher.recommend(student_id, top_n, timeout=service.request_timeout)
+            except TimeoutError:
+                return self._send_json(503, {'error': "Timed out waiting for recommendations, try again"})
+            except Exception as e:
+                return self._send_json(500, {'error': f"Scoring failed: {e}"})
+                
+            return self._send_json(200, {
+                'student_id': student_id,
+                'recommendations': [recommendation.to_dict() for recommendation in recommendations]
+            })
+            
+        if url.path == '/health':
+            return self._send_json(200, {'status': 'ok', 'model_version': service.recommender.model_version})
+            
+        if url.path == '/stats':
+            return self._send_json(200, {
+                'batching': service.batcher.stats(),
+                'cache': service.recommender.result_cache.stats(),
+                'topn_table': service.recommender.topn_table.stats() if service.recommender.topn_table is not None else None
+            })
+            
+        if url.path == '/metrics':
+            return self._send_text(200, metrics.to_prometheus())
+            
+        return self._send_json(404, {'error': f"Unknown path {url.path}"})
+        
+    def _send_json(self, status, payload):
+        self._send_body(status, json.dumps(payload).encode('utf-8'), 'application/json')
+        
+    def _send_text(self, status, text):
+        self._send_body(status, text.encode('utf-8'), 'text/plain; version=0.0.4')
+        
+    def _send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the cost of cached responses
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+class RecommendationService:
+    def __init__(self, recommender=None, host=None, port=None, max_batch_size=None, max_wait_ms=None,
+                 max_top_n=50, request_timeout=None, verbose=False):
+        """
+        HTTP service around one loaded recommender
+        Args:
+            recommender: HybridRecommender (loaded from the snapshot or trained if None)
+            host: Bind address (default config.SERVICE_HOST)
+            port: Port (default config.SERVICE_PORT, 0 picks a free port)
+            max_batch_size: Requests merged per scoring call (default config.BATCH_MAX_SIZE)
+            max_wait_ms: Batching window in milliseconds (default config.BATCH_MAX_WAIT_MS)
+            max_top_n: Largest top_n a request may ask for
+            request_timeout: Seconds a request waits for its batch before a 503 (default config.SERVICE_REQUEST_TIMEOUT)
+            verbose: Log every request
+        """
+        self.recommender = recommender or HybridRecommender()
+        self.max_top_n = max_top_n
+        self.request_timeout = config.SERVICE_REQUEST_TIMEOUT if request_timeout is None else request_timeout
+        self.verbose = verbose
+        
+        self.batcher = MicroBatcher(
+            self.recommender,
+            config.BATCH_MAX_SIZE if max_batch_size is None else max_batch_size,
+            config.BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        )
+        
+        self.server = ThreadingHTTPServer(
+            (config.SERVICE_HOST if host is None else host, config.SERVICE_PORT if port is None else port),
+            RecommendationRequestHandler
+        )
+        self.server.daemon_threads = True
+        self.server.service = self
+        
+    @property
+    def address(self):
+        """(host, port) the service listens on"""
+        return self.server.server_address[:2]
+        
+    def serve_forever(self):
+        """Serve requests until shutdown() is called (blocking)"""
+        self.batcher.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.batcher.stop()
+            
+    def start(self):
+        """Serve requests in a background thread"""
+        self.batcher.start()
+        thread = threading.Thread(target=self.server.serve_forever, name='http-server', daemon=True)
+        thread.start()
+        return thread
+        
+    def shutdown(self):
+        """Stop serving and close the socket"""
+        self.server.shutdown()
+        self.server.server_close()
+        self.batcher.stop()
@@ -11,11 +11,68 @@ STUDENTS_FILE = os.path.join(RAW_DATA_DIR, 'students.csv')
 INTERNSHIPS_FILE = os.path.join(RAW_DATA_DIR, 'internships.csv')
 FEEDBACK_FILE = os.path.join(RAW_DATA_DIR, 'feedback.csv')
 
+# Processed file paths (binary columnar tables, one directory each)
+STUDENTS_TABLE = os.path.join(PROCESSED_DATA_DIR, 'students')
+INTERNSHIPS_TABLE = os.path.join(PROCESSED_DATA_DIR, 'internships')
+FEEDBACK_TABLE = os.path.join(PROCESSED_DATA_DIR, 'feedback')
+USER_ITEM_MATRIX_FILE = os.path.join(PROCESSED_DATA_DIR, 'user_item_matrix.npz')
+
+# Running rating sums per (student, internship) pair, caught up from the tail of the feedback log
+FEEDBACK_STATS_FILE = os.path.join(PROCESSED_DATA_DIR, 'feedback_pair_stats.npz')
+FEEDBACK_STATS_CHECKPOINT_PAIRS = 10000  # Save the statistics once this many pairs changed
+
+# Fitted model snapshot (memory-mapped on load)
+SNAPSHOT_DIR = os.path.join(DATA_DIR, 'snapshot')
+
+# Precomputed top-N table (scripts/08_build_topn_table.py), memory-mapped and served instead of live scoring
+TOPN_TABLE_DIR = os.path.join(DATA_DIR, 'topn')
+TOPN_TABLE_SIZE = 20  # Recommendations stored per student; larger top_n requests are scored live
+USE_TOPN_TABLE = True  # Serve from the table when one exists for the current internship catalog
+TOPN_TABLE_CHECK_SECONDS = 30  # How often a running app or service checks for a rebuilt table
+BULK_SHARD_SIZE = 50000  # Students per shard when building the table (unit of work and of checkpointing)
+
 # Model parameters
 CONTENT_WEIGHT = 0.6  # Alpha for hybrid model
 COLLABORATIVE_WEIGHT = 0.4  # (1 - Alpha)
 TOP_N_RECOMMENDATIONS = 5
 
+# Hybrid candidate pool: 'full' scores the whole catalog,
+# 'content'/'collaborative' rank only the top CANDIDATE_POOL_SIZE internships from that model
+CANDIDATE_POOL = 'content'
+CANDIDATE_POOL_SIZE = 20
+
+# Content retrieval backend: 'inverted' (exact, inverted skill index), 'exact' (brute force)
+# or 'ann' (approximate IVF index for very large catalogs)
+CONTENT_BACKEND = 'inverted'
+ANN_CLUSTERS = None  # IVF clusters (None = sqrt of the catalog size)
+ANN_PROBES = 8  # Clusters scored per query: higher = better recall, slower queries
+
+# Processes for preprocessing and TF-IDF fitting (1 = serial, in-process)
+NUM_WORKERS = 1
+
+# Recommendation result cache (invalidated on new feedback and model updates)
+RESULT_CACHE_SIZE = 1024  # Maximum cached results (0 disables caching)
+RESULT_CACHE_TTL = 300  # Seconds a cached result stays valid (None = no expiry)
+
+# Per-stage latency histograms (utils/metrics.py); off by default, near-zero cost when off
+METRICS_ENABLED = False
+
+# HTTP recommendation service (server.py)
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8000
+BATCH_MAX_SIZE = 256  # Most single-student requests merged into one scoring call
+BATCH_MAX_WAIT_MS = 2  # How long the first request of a batch waits for others to arrive
+SERVICE_REQUEST_TIMEOUT = 10  # Seconds a request waits for its batch before the service answers 503
+
 # Collaborative filtering parameters
 MIN_RATING = 1
 MAX_RATING = 5
+NUM_NEIGHBORS = None  # Keep only the top-k most similar students (None = full similarity matrix)
+
+# Collaborative engine: 'neighborhood' (user-user cosine), 'item' (item-item cosine)
+# or 'matrix_factorization' (ALS latent factors)
+COLLABORATIVE_ENGINE = 'neighborhood'
+ITEM_NEIGHBORS = 20  # Most similar internships kept per internship by the 'item' engine
+MF_FACTORS = 16  # Latent factors per student/internship
+MF_REGULARIZATION = 0.1
+MF_ITERATIONS = 15
@@ -1,14 +1,20 @@
 """
 Models Package
 Contains all recommendation model implementations
+Models are imported on first use (see utils/lazy.py)
 """
 
-from .content_based import ContentBasedModel
-from .collaborative import CollaborativeFilteringModel
-from .hybrid import HybridModel
+from utils.lazy import lazy_exports
 
-__all__ = [
-    'ContentBasedModel',
-    'CollaborativeFilteringModel',
-    'HybridModel'
-]
+# Public name -> submodule defining it
+_EXPORTS = {
+    'ContentBasedModel': 'content_based',
+    'CollaborativeFilteringModel': 'collaborative',
+    'MatrixFactorizationModel': 'matrix_factorization',
+    'ItemBasedModel': 'item_based',
+    'HybridModel': 'hybrid'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
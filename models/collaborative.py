@@ -5,26 +5,235 @@ Alternative to scikit-surprise (Python 3.13 compatible)
 
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+from utils.user_item_matrix import UserItemMatrix, grow_rows
+from utils.metrics import timed, timed_call
+from utils.snapshot import save_array, load_array, save_csr, load_csr, write_json, read_json
 
 class CollaborativeFilteringModel:
-    def __init__(self):
+    def __init__(self, n_neighbors=None, block_size=1024):
+        """
+        Initialize collaborative filtering model
+        Args:
+            n_neighbors: Keep only the k most similar students per student (None = full similarity matrix)
+            block_size: Number of students per block when building the neighbour graph
+        """
+        self.n_neighbors = n_neighbors
+        self.block_size = block_size
         self.user_item_matrix = None
         self.user_similarity = None
+        self.neighbor_indices = None
+        self.neighbor_weights = None
+        
+        # L2 norm of every rating row, kept up to date by partial_update (computed on first use)
+        self._row_norms = None
         
     def fit(self, user_item_matrix):
         """
         Train collaborative filtering model
         Args:
-            user_item_matrix: DataFrame with students as rows, internships as columns
+            user_item_matrix: UserItemMatrix (or dense DataFrame) with students as rows, internships as columns
         """
+        if isinstance(user_item_matrix, pd.DataFrame):
+            user_item_matrix = UserItemMatrix.from_dataframe(user_item_matrix)
+            
         self.user_item_matrix = user_item_matrix
+        self._row_norms = None
         
-        # Calculate user-user similarity using cosine similarity
-        self.user_similarity = cosine_similarity(user_item_matrix)
-        
+        if self.n_neighbors is None:
+            # Calculate user-user similarity using cosine similarity (kept sparse)
+            self.user_similarity = cosine_similarity(user_item_matrix.matrix, dense_output=False).tocsr()
+            self.neighbor_indices = None
+            self.neighbor_weights = None
+        else:
+            # Keep only the top-k neighbour graph: O(U * k) memory instead of O(U^2)
+            self.user_similarity = None
+            self.neighbor_indices, self.neighbor_weights = self._build_neighbors(user_item_matrix.matrix)
+            
         print(f"✅ Collaborative model trained on {user_item_matrix.shape[0]} users and {user_item_matrix.shape[1]} items")
         
+    def _build_neighbors(self, matrix, rows=None):
+        """
+        Build the top-k neighbour graph blockwise
+        Args:
+            matrix: Sparse user-item rating matrix
+            rows: Student row positions to build neighbour lists for (None builds all)
+        Returns:
+            (indices, weights) arrays of shape (len(rows), k); each student counts as its own neighbour,
+            like the diagonal of the full similarity matrix, and missing neighbours have weight 0
+        """
+        n_users = matrix.shape[0]
+        k = min(self.n_neighbors, n_users)
+        
+        if rows is None:
+            rows = np.arange(n_users)
+            
+        indices = np.zeros((len(rows), k), dtype=np.int32)
+        weights = np.zeros((len(rows), k), dtype=np.float32)
+        
+        # Cosine similarity = dot product of L2-normalized rows
+        normalized = normalize(matrix, norm='l2', axis=1).tocsr()
+        normalized_t = normalized.T.tocsr()
+        
+        for start in range(0, len(rows), self.block_size):
+            # Sparse similarity rows for this block only
+            block = (normalized[rows[start:start + self.block_size]] @ normalized_t).tocsr()
+            
+            for row in range(block.shape[0]):
+                lo, hi = block.indptr[row], block.indptr[row + 1]
+                neighbors = block.indices[lo:hi]
+                similarities = block.data[lo:hi]
+                
+                if len(similarities) > k:
+                    top = np.argpartition(-similarities, k - 1)[:k]
+                    neighbors, similarities = neighbors[top], similarities[top]
+                    
+                indices[start + row, :len(neighbors)] = neighbors
+                weights[start + row, :len(neighbors)] = similarities
+                
+        return indices, weights
+        
+    def partial_update(self, student_ids, internship_ids, ratings):
+        """
+        Apply new or changed ratings without a full refit
+        Only the affected students' similarity rows/columns (or neighbour lists) are recomputed
+        Args:
+            student_ids: Student IDs (new students are added)
+            internship_ids: Internship IDs (new internships are added)
+            ratings: Rating values that replace the stored ones
+        """
+        if len(student_ids) == 0:
+            return
+            
+        affected = self.user_item_matrix.update(student_ids, internship_ids, ratings)
+        
+        if self.user_similarity is not None:
+            self._update_similarity(affected)
+        else:
+            self._update_neighbors(affected)
+            
+        print(f"✅ Collaborative model updated for {len(affected)} students")
+        
+    def _update_row_norms(self, affected):
+        """
+        Refresh cached row norms after the affected rating rows changed
+        Returns:
+            Row norms with zeros replaced by 1 (empty rows stay empty when divided)
+        """
+        matrix = self.user_item_matrix.matrix
+        
+        if self._row_norms is None:
+            self._row_norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        else:
+            norms = np.zeros(matrix.shape[0])
+            norms[:len(self._row_norms)] = self._row_norms
+            rows = matrix[affected]
+            norms[affected] = np.sqrt(np.asarray(rows.multiply(rows).sum(axis=1)).ravel())
+            self._row_norms = norms
+            
+        return np.where(self._row_norms > 0, self._row_norms, 1.0)
+        
+    def _similarity_rows(self, affected):
+        """
+        Cosine similarity rows of the affected students against every student
+        Only the affected rating rows are normalized; the other side is divided by the cached norms
+        Returns:
+            CSR matrix of shape (len(affected), n_users)
+        """
+        matrix = self.user_item_matrix.matrix
+        norms = self._update_row_norms(affected)
+        
+        scaled = sparse.diags(1 / norms[affected]) @ matrix[affected]
+        rows = (scaled @ matrix.T).tocsr()
+        rows.data /= norms[rows.indices]
+        
+        return rows
+        
+    def _update_similarity(self, affected):
+        """Recompute similarity rows and columns of the affected students in the full matrix"""
+        n_users = self.user_item_matrix.shape[0]
+        similarity = grow_rows(self.user_similarity, n_users)
+        indptr = similarity.indptr
+        
+        is_affected = np.zeros(n_users, dtype=bool)
+        is_affected[affected] = True
+        
+        # Old entries outside the affected rows and columns stay, in their order
+        keep = ~is_affected[similarity.indices]
+        dropped = np.searchsorted(indptr, np.flatnonzero(~keep), side='right') - 1
+        kept_counts = np.diff(indptr) - np.bincount(dropped, minlength=n_users)
+        for row in affected:
+            keep[indptr[row]:indptr[row + 1]] = False
+        kept_counts[affected] = 0
+        
+        # New entries: the affected rows, and by symmetry their transpose in the affected
+        # columns of every other row (placed after that row's kept entries)
+        new_rows = self._similarity_rows(affected).tocoo()
+        mirrored = ~is_affected[new_rows.col]
+        rows = np.concatenate([affected[new_rows.row], new_rows.col[mirrored]])
+        cols = np.concatenate([new_rows.col, affected[new_rows.row[mirrored]]])
+        values = np.concatenate([new_rows.data, new_rows.data[mirrored]])
+        
+        order = np.argsort(rows, kind='stable')
+        rows, cols, values = rows[order], cols[order], values[order]
+        
+        added_counts = np.bincount(rows, minlength=n_users)
+        new_indptr = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(kept_counts + added_counts, out=new_indptr[1:])
+        
+        added_starts = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(added_counts, out=added_starts[1:])
+        positions = new_indptr[rows] + kept_counts[rows] + np.arange(len(rows)) - added_starts[rows]
+        
+        # Kept entries fill every slot the new entries do not take
+        is_added = np.zeros(new_indptr[-1], dtype=bool)
+        is_added[positions] = True
+        is_kept = ~is_added
+        
+        new_indices = np.empty(new_indptr[-1], dtype=similarity.indices.dtype)
+        new_indices[is_kept] = similarity.indices[keep]
+        new_indices[positions] = cols
+        
+        new_data = np.empty(new_indptr[-1], dtype=np.float64)
+        new_data[is_kept] = similarity.data[keep]
+        new_data[positions] = values
+        
+        self.user_similarity = sparse.csr_matrix((new_data, new_indices, new_indptr), shape=(n_users, n_users))
+        
+    def _update_neighbors(self, affected):
+        """Rebuild neighbour lists of the affected students and of students whose lists involve them"""
+        matrix = self.user_item_matrix.matrix
+        n_users = matrix.shape[0]
+        k = min(self.n_neighbors, n_users)
+        
+        # Grow arrays for new students (and a larger k while the student count is below n_neighbors)
+        old_users, old_k = self.neighbor_indices.shape
+        indices = np.zeros((n_users, k), dtype=np.int32)
+        weights = np.zeros((n_users, k), dtype=np.float32)
+        indices[:old_users, :old_k] = self.neighbor_indices
+        weights[:old_users, :old_k] = self.neighbor_weights
+        
+        # Students that list an affected student, or are now similar to one, may change too
+        similar = self._similarity_rows(affected)
+        listed = np.flatnonzero((np.isin(indices, affected) & (weights != 0)).any(axis=1))
+        rows = np.unique(np.concatenate([affected, listed, similar.indices]))
+        
+        # Exact recomputation for those rows only
+        indices[rows], weights[rows] = self._build_neighbors(matrix, rows)
+        
+        self.neighbor_indices = indices
+        self.neighbor_weights = weights
+        
+    def _get_neighbors(self, user_idx):
+        """Get (neighbour positions, similarity weights) for a student row"""
+        if self.user_similarity is not None:
+            similar_users = self.user_similarity[user_idx]
+            return similar_users.indices, similar_users.data
+            
+        return self.neighbor_indices[user_idx], self.neighbor_weights[user_idx]
+        
     def predict(self, student_id, internship_id):
         """
         Predict rating for student-internship pair
@@ -34,30 +243,111 @@ class CollaborativeFilteringModel:
         Returns:
             Predicted rating (1-5 scale)
         """
-        if student_id not in self.user_item_matrix.index:
+        user_idx = self.user_item_matrix.user_index.get(student_id)
+        if user_idx is None:
             return 3.0  # Default neutral rating
             
-        if internship_id not in self.user_item_matrix.columns:
+        item_idx = self.user_item_matrix.item_index.get(internship_id)
+        if item_idx is None:
             return 3.0  # Default neutral rating
-        
-        # Get index of student
-        user_idx = self.user_item_matrix.index.get_loc(student_id)
-        
+            
         # Get similar users
-        similar_users = self.user_similarity[user_idx]
+        neighbors, similarities = self._get_neighbors(user_idx)
         
         # Get ratings from similar users for this internship
-        internship_ratings = self.user_item_matrix[internship_id].values
+        internship_ratings = self.user_item_matrix.matrix[neighbors, item_idx].toarray().ravel()
         
         # Weighted average of ratings from similar users
-        numerator = np.dot(similar_users, internship_ratings)
-        denominator = np.sum(np.abs(similar_users)) + 1e-9  # Avoid division by zero
+        numerator = np.dot(similarities, internship_ratings)
+        denominator = np.sum(np.abs(similarities)) + 1e-9  # Avoid division by zero
         
         predicted_rating = numerator / denominator
         
         # Clip to valid rating range
         return np.clip(predicted_rating, 1.0, 5.0)
-    
+        
+    @timed_call('collaborative.predict_many')
+    def predict_many(self, student_id, internship_ids=None):
+        """
+        Predict ratings for one student over many internships in a single pass
+        Args:
+            student_id: Student ID
+            internship_ids: Internship IDs to score (None scores every internship in the matrix)
+        Returns:
+            numpy array of predicted ratings (1-5 scale), aligned with internship_ids
+        """
+        item_index = self.user_item_matrix.item_index
+        user_idx = self.user_item_matrix.user_index.get(student_id)
+        
+        if user_idx is None:
+            all_scores = np.full(len(item_index), 3.0)  # Default neutral rating
+        else:
+            # One vector-matrix product over the neighbours' rating rows scores every internship
+            neighbors, similarities = self._get_neighbors(user_idx)
+            numerator = self.user_item_matrix.matrix[neighbors].T @ similarities
+            denominator = np.sum(np.abs(similarities)) + 1e-9  # Avoid division by zero
+            all_scores = np.clip(numerator / denominator, 1.0, 5.0)
+            
+        if internship_ids is None:
+            return all_scores
+            
+        # Gather requested internships, unknown ones get the neutral rating
+        positions = item_index.get_indexer(internship_ids)
+        predictions = np.full(len(positions), 3.0)
+        known = positions >= 0
+        predictions[known] = all_scores[positions[known]]
+        
+        return predictions
+        
+    @timed_call('collaborative.predict_batch')
+    def predict_batch(self, student_ids, internship_ids=None):
+        """
+        Predict ratings for many students at once
+        Args:
+            student_ids: Student IDs to score
+            internship_ids: Internship IDs to score (None scores every internship in the matrix)
+        Returns:
+            numpy array of shape (len(student_ids), n_internships) with predicted ratings (1-5 scale)
+        """
+        user_index = self.user_item_matrix.user_index
+        item_index = self.user_item_matrix.item_index
+        n_users, n_items = self.user_item_matrix.shape
+        
+        user_positions = user_index.get_indexer(student_ids)
+        known_users = user_positions >= 0
+        rows = user_positions[known_users]
+        
+        all_scores = np.full((len(user_positions), n_items), 3.0)  # Default neutral rating
+        
+        if len(rows) > 0:
+            # Sparse (students x users) weight matrix from similarity rows or the neighbour graph
+            with timed('collaborative.neighbors'):
+                if self.user_similarity is not None:
+                    weights = self.user_similarity[rows]
+                else:
+                    k = self.neighbor_indices.shape[1]
+                    weights = sparse.csr_matrix(
+                        (self.neighbor_weights[rows].ravel(), self.neighbor_indices[rows].ravel(), np.arange(0, len(rows) * k + 1, k)),
+                        shape=(len(rows), n_users)
+                    )
+                    
+            # One sparse matrix-matrix product scores every internship for every student
+            with timed('collaborative.product'):
+                numerator = (weights @ self.user_item_matrix.matrix).toarray()
+                denominator = np.asarray(abs(weights).sum(axis=1)).ravel() + 1e-9  # Avoid division by zero
+                all_scores[known_users] = np.clip(numerator / denominator[:, None], 1.0, 5.0)
+                
+        if internship_ids is None:
+            return all_scores
+            
+        # Gather requested internships, unknown ones get the neutral rating
+        item_positions = item_index.get_indexer(internship_ids)
+        predictions = np.full((len(user_positions), len(item_positions)), 3.0)
+        known_items = item_positions >= 0
+        predictions[:, known_items] = all_scores[:, item_positions[known_items]]
+        
+        return predictions
+        
     def get_top_recommendations(self, student_id, top_n=5):
         """
         Get top N internship recommendations for a student
@@ -67,19 +357,66 @@ class CollaborativeFilteringModel:
         Returns:
             List of (internship_id, predicted_rating) tuples
         """
-        if student_id not in self.user_item_matrix.index:
+        user_idx = self.user_item_matrix.user_index.get(student_id)
+        if user_idx is None:
             return []
+            
+        # Score every internship at once
+        predictions = self.predict_many(student_id)
         
-        # Get all internships student hasn't rated
-        student_ratings = self.user_item_matrix.loc[student_id]
-        unrated_internships = student_ratings[student_ratings == 0].index.tolist()
+        # Keep only internships the student hasn't rated
+        student_ratings = self.user_item_matrix.matrix[user_idx].toarray().ravel()
+        unrated = np.flatnonzero(student_ratings == 0)
         
-        # Predict ratings for unrated internships
-        predictions = []
-        for internship_id in unrated_internships:
-            pred_rating = self.predict(student_id, internship_id)
-            predictions.append((internship_id, pred_rating))
+        # Sort by predicted rating (stable, so ties keep internship order) and return top N
+        order = unrated[np.argsort(-predictions[unrated], kind='stable')][:top_n]
+        item_ids = self.user_item_matrix.item_ids
+        return [(item_ids[pos], predictions[pos]) for pos in order]
         
-        # Sort by predicted rating and return top N
-        predictions.sort(key=lambda x: x[1], reverse=True)
-        return predictions[:top_n]
+    def save(self, directory):
+        """
+        Save rating matrix, id maps and similarity/neighbour structures
+        Args:
+            directory: Snapshot directory for this model
+        """
+        save_csr(directory, 'ratings', self.user_item_matrix.matrix)
+        save_array(directory, 'user_ids', self.user_item_matrix.user_ids)
+        save_array(directory, 'item_ids', self.user_item_matrix.item_ids)
+        
+        if self.user_similarity is not None:
+            save_csr(directory, 'user_similarity', self.user_similarity)
+        else:
+            save_array(directory, 'neighbor_indices', self.neighbor_indices)
+            save_array(directory, 'neighbor_weights', self.neighbor_weights)
+            
+        write_json(directory, 'params.json', {
+            'n_neighbors': self.n_neighbors,
+            'block_size': self.block_size
+        })
+        
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Load a model saved with save() without recomputing similarities
+        Args:
+            directory: Snapshot directory for this model
+            mmap_mode: numpy memory-map mode for the large arrays
+        Returns:
+            Fitted CollaborativeFilteringModel
+        """
+        params = read_json(directory, 'params.json')
+        model = cls(n_neighbors=params['n_neighbors'], block_size=params['block_size'])
+        
+        model.user_item_matrix = UserItemMatrix(
+            load_csr(directory, 'ratings', mmap_mode),
+            load_array(directory, 'user_ids', mmap_mode),
+            load_array(directory, 'item_ids', mmap_mode)
+        )
+        
+        if model.n_neighbors is None:
+            model.user_similarity = load_csr(directory, 'user_similarity', mmap_mode)
+        else:
+            model.neighbor_indices = load_array(directory, 'neighbor_indices', mmap_mode)
+            model.neighbor_weights = load_array(directory, 'neighbor_weights', mmap_mode)
+            
+        return model
@@ -2,51 +2,326 @@
 Content-Based Filtering using TF-IDF and Cosine Similarity
 """
 
+import os
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+import config
+from utils.ann_index import IVFIndex
+from utils.inverted_index import InvertedIndex
+from utils.metrics import timed, timed_call
+from utils.parallel import ordered_map
+from utils.similarity import top_n_positions
+from utils.snapshot import save_array, load_array, save_csr, load_csr
+
+def _partition_terms(task):
+    """Worker: distinct terms of a partition, in first-appearance order"""
+    vectorizer, documents = task
+    analyzer = vectorizer.build_analyzer()
+    return list(dict.fromkeys(term for document in documents for term in analyzer(document)))
+
+def _partition_counts(task):
+    """Worker: term counts of a partition over a fixed vocabulary"""
+    vectorizer, vocabulary, documents = task
+    counter = CountVectorizer(analyzer=vectorizer.build_analyzer(), vocabulary=vocabulary, dtype=vectorizer.dtype)
+    return counter.transform(documents)
+
+def parallel_fit_transform(vectorizer, documents, workers, n_partitions=None):
+    """
+    TfidfVectorizer.fit_transform with tokenization and counting spread over a process pool
+    Terms are numbered by first appearance across partitions (in order) and then sorted by
+    name, exactly like CountVectorizer does, so the fitted vocabulary, IDF weights and the
+    returned matrix (including its index order) are identical to the serial fit
+    Args:
+        vectorizer: Unfitted TfidfVectorizer (fitted in place)
+        documents: Array of document strings
+        workers: Number of processes
+        n_partitions: Document partitions (default 4 per worker)
+    Returns:
+        Sparse TF-IDF matrix with one row per document
+    """
+    # Vocabulary pruning needs global term statistics; fall back to the serial fit
+    if vectorizer.max_df != 1.0 or vectorizer.min_df != 1 or vectorizer.max_features is not None:
+        return vectorizer.fit_transform(documents)
+        
+    n_partitions = n_partitions or 4 * workers
+    bounds = np.linspace(0, len(documents), n_partitions + 1).astype(np.int64)
+    partitions = [documents[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    
+    # Pass 1: vocabulary in first-appearance order
+    terms = {}
+    for partition_terms in ordered_map(_partition_terms, [(vectorizer, part) for part in partitions], workers):
+        terms.update(dict.fromkeys(partition_terms))
+        
+    if not terms:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+        
+    first_appearance = {term: idx for idx, term in enumerate(terms)}
+    
+    # Pass 2: counts per partition, stacked in document order
+    counts = sparse.vstack(
+        list(ordered_map(_partition_counts, [(vectorizer, first_appearance, part) for part in partitions], workers)),
+        format='csr'
+    )
+    
+    # Renumber features by sorted term, as CountVectorizer._sort_features does
+    vocabulary = {term: idx for idx, term in enumerate(sorted(terms))}
+    map_index = np.empty(len(vocabulary), dtype=counts.indices.dtype)
+    for term, idx in first_appearance.items():
+        map_index[idx] = vocabulary[term]
+    counts.indices = map_index.take(counts.indices, mode='clip')
+    
+    transformer = TfidfTransformer(
+        norm=vectorizer.norm, use_idf=vectorizer.use_idf,
+        smooth_idf=vectorizer.smooth_idf, sublinear_tf=vectorizer.sublinear_tf
+    ).fit(counts)
+    
+    vectorizer.vocabulary_ = vocabulary
+    vectorizer.fixed_vocabulary_ = False
+    if vectorizer.use_idf:
+        vectorizer.idf_ = transformer.idf_
+        
+    return transformer.transform(counts, copy=False)
 
 class ContentBasedModel:
     def __init__(self):
         self.vectorizer = TfidfVectorizer(stop_words='english')
         self.internship_vectors = None
         self.internships_df = None
+        self._inverted_index = None
+        self._ann_index = None
         
-    def fit(self, internships_df):
+    def fit(self, internships_df, workers=None):
         """
         Train content-based model
         Args:
             internships_df: DataFrame with internship_profile column
+            workers: Processes tokenizing profiles in parallel (None uses config.NUM_WORKERS, 1 = serial)
         """
         self.internships_df = internships_df
+        self._inverted_index = None
+        self._ann_index = None
         
-        # Create TF-IDF vectors from internship profiles
-        self.internship_vectors = self.vectorizer.fit_transform(
-            internships_df['internship_profile']
-        )
+        workers = config.NUM_WORKERS if workers is None else workers
         
+        # Create TF-IDF vectors from internship profiles
+        if workers > 1:
+            self.internship_vectors = parallel_fit_transform(
+                self.vectorizer, internships_df['internship_profile'].to_numpy(), workers
+            )
+        else:
+            self.internship_vectors = self.vectorizer.fit_transform(
+                internships_df['internship_profile']
+            )
+            
         print(f"✅ Content-based model trained on {len(internships_df)} internships")
         
-    def get_recommendations(self, student_profile, top_n=5):
+    @property
+    def inverted_index(self):
+        """Term -> internship posting lists, built on first use"""
+        if self._inverted_index is None:
+            self._inverted_index = InvertedIndex(self.internship_vectors)
+        return self._inverted_index
+        
+    @property
+    def ann_index(self):
+        """Approximate IVF index, built on first use with config.ANN_CLUSTERS / ANN_PROBES"""
+        if self._ann_index is None:
+            self.build_ann_index()
+        return self._ann_index
+        
+    def build_ann_index(self, n_clusters=None, n_probe=None):
+        """
+        Build the approximate IVF index over internship vectors
+        Args:
+            n_clusters: Number of clusters (defaults to config.ANN_CLUSTERS)
+            n_probe: Clusters scored per query (defaults to config.ANN_PROBES)
+        Returns:
+            Fitted IVFIndex
+        """
+        self._ann_index = IVFIndex(
+            n_clusters=n_clusters or config.ANN_CLUSTERS,
+            n_probe=n_probe or config.ANN_PROBES
+        ).fit(self.internship_vectors)
+        
+        return self._ann_index
+        
+    @timed_call('content.get_recommendations')
+    def get_recommendations(self, student_profile, top_n=5, backend=None):
         """
         Get top N recommendations based on student profile
         Args:
             student_profile: String containing student skills and interests
             top_n: Number of recommendations
+            backend: 'inverted' scores only internships sharing a term with the profile (exact),
+                     'exact' scores every internship, 'ann' uses the approximate IVF index
+                     (defaults to config.CONTENT_BACKEND)
         Returns:
             DataFrame with top N internships and similarity scores
         """
+        backend = backend or config.CONTENT_BACKEND
+        
         # Transform student profile to vector
         student_vector = self.vectorizer.transform([student_profile])
         
-        # Calculate cosine similarity
-        similarity_scores = cosine_similarity(student_vector, self.internship_vectors)[0]
-        
-        # Get top N indices
-        top_indices = similarity_scores.argsort()[-top_n:][::-1]
-        
+        if backend == 'inverted':
+            top_indices, top_scores = self.inverted_index.top_n(student_vector, top_n)
+        elif backend == 'ann':
+            top_indices, top_scores = self.ann_index.top_n(student_vector, top_n)
+        elif backend == 'exact':
+            # Calculate cosine similarity
+            similarity_scores = cosine_similarity(student_vector, self.internship_vectors)[0]
+            
+            # Get top N indices (ties go to the lower position, like the inverted index)
+            top_indices = np.argsort(-similarity_scores, kind='stable')[:top_n]
+            top_scores = similarity_scores[top_indices]
+        else:
+            raise ValueError(f"Unknown content backend '{backend}'")
+            
         # Return internships with scores
         recommendations = self.internships_df.iloc[top_indices].copy()
-        recommendations['content_score'] = similarity_scores[top_indices]
+        recommendations['content_score'] = top_scores
         
         return recommendations
+        
+    def transform_profiles(self, student_profiles):
+        """
+        Stack many student profiles into one TF-IDF matrix
+        Args:
+            student_profiles: Iterable of student profile strings
+        Returns:
+            Sparse matrix with one row per profile
+        """
+        with timed('content.transform'):
+            return self.vectorizer.transform(student_profiles)
+            
+    def get_similarity_scores(self, student_vectors):
+        """
+        Score TF-IDF profile vectors against every internship
+        Args:
+            student_vectors: Sparse matrix from transform_profiles
+        Returns:
+            numpy array of shape (n_profiles, n_internships) with cosine similarity scores
+        """
+        with timed('content.similarity'):
+            return cosine_similarity(student_vectors, self.internship_vectors)
+            
+    def get_content_scores(self, student_vectors, backend=None):
+        """
+        Content score of every internship for each profile, through the configured backend
+        Args:
+            student_vectors: Sparse matrix from transform_profiles
+            backend: 'exact' (dense cosine), 'inverted' (same scores, only internships sharing a term
+                     are touched) or 'ann' (probed clusters only, others score 0); defaults to config.CONTENT_BACKEND
+        Returns:
+            numpy array of shape (n_profiles, n_internships)
+        """
+        backend = backend or config.CONTENT_BACKEND
+        
+        if backend == 'exact':
+            return self.get_similarity_scores(student_vectors)
+        if backend not in ('inverted', 'ann'):
+            raise ValueError(f"Unknown content backend '{backend}'")
+            
+        with timed('content.similarity'):
+            if backend == 'inverted':
+                return self.inverted_index.score_batch(student_vectors).toarray()
+                
+            scores = np.zeros((student_vectors.shape[0], self.internship_vectors.shape[0]))
+            for row in range(student_vectors.shape[0]):
+                documents, document_scores = self.ann_index.score(student_vectors[row])
+                scores[row, documents] = document_scores
+                
+        return scores
+        
+    def shortlist(self, student_vectors, n, backend=None):
+        """
+        Top n internships by content score for each profile, through the configured backend
+        Ties go to the lower position; rows an 'ann' search leaves short are padded with the
+        lowest-position internships it did not return, at score 0 (like the inverted index)
+        Args:
+            student_vectors: Sparse matrix from transform_profiles
+            n: Internships per profile (at most the catalog size)
+            backend: 'exact', 'inverted' or 'ann' (defaults to config.CONTENT_BACKEND)
+        Returns:
+            (positions, scores) arrays of shape (n_profiles, n), best first
+        """
+        backend = backend or config.CONTENT_BACKEND
+        n_internships = self.internship_vectors.shape[0]
+        n = min(n, n_internships)
+        
+        if backend == 'exact':
+            scores = self.get_similarity_scores(student_vectors)
+            positions = top_n_positions(scores, n)
+            return positions, np.take_along_axis(scores, positions, axis=1)
+        if backend not in ('inverted', 'ann'):
+            raise ValueError(f"Unknown content backend '{backend}'")
+            
+        with timed('content.similarity'):
+            if backend == 'inverted':
+                return self.inverted_index.top_n_batch(student_vectors, n)
+                
+            positions = np.empty((student_vectors.shape[0], n), dtype=np.int64)
+            scores = np.zeros((student_vectors.shape[0], n))
+            
+            for row in range(student_vectors.shape[0]):
+                found, found_scores = self.ann_index.top_n(student_vectors[row], n)
+                
+                if len(found) < n:
+                    missing = np.setdiff1d(np.arange(n_internships), found, assume_unique=True)[:n - len(found)]
+                    found = np.concatenate([found, missing])
+                    found_scores = np.concatenate([found_scores, np.zeros(len(missing))])
+                    
+                positions[row], scores[row] = found, found_scores
+                
+        return positions, scores
+        
+    def save(self, directory):
+        """
+        Save fitted vocabulary, IDF weights and internship vectors
+        Args:
+            directory: Snapshot directory for this model
+        """
+        vocabulary = self.vectorizer.vocabulary_
+        terms = np.array(sorted(vocabulary, key=vocabulary.get), dtype=str)
+        
+        save_array(directory, 'vocabulary', terms)
+        save_array(directory, 'idf', self.vectorizer.idf_)
+        save_csr(directory, 'internship_vectors', self.internship_vectors)
+        save_array(directory, 'internship_ids', self.internships_df['internship_id'].to_numpy(dtype=str))
+        
+        # ANN index is only saved if it was built
+        if self._ann_index is not None:
+            self._ann_index.save(os.path.join(directory, 'ann'))
+            
+    @classmethod
+    def load(cls, directory, internships_df, mmap_mode='r'):
+        """
+        Load a model saved with save() without refitting
+        Args:
+            directory: Snapshot directory for this model
+            internships_df: DataFrame with the same internships (and order) the model was fitted on
+            mmap_mode: numpy memory-map mode for the large arrays
+        Returns:
+            Fitted ContentBasedModel
+        """
+        internship_ids = load_array(directory, 'internship_ids', mmap_mode)
+        if not np.array_equal(internship_ids, internships_df['internship_id'].to_numpy(dtype=str)):
+            raise ValueError("Snapshot internships do not match internships_df")
+            
+        model = cls()
+        model.internships_df = internships_df
+        
+        # Restore fitted TF-IDF state
+        terms = load_array(directory, 'vocabulary', None)
+        model.vectorizer.vocabulary_ = {term: idx for idx, term in enumerate(terms.tolist())}
+        model.vectorizer.idf_ = load_array(directory, 'idf', mmap_mode)
+        
+        model.internship_vectors = load_csr(directory, 'internship_vectors', mmap_mode)
+        
+        if os.path.isdir(os.path.join(directory, 'ann')):
+            model._ann_index = IVFIndex.load(os.path.join(directory, 'ann'), mmap_mode)
+            
+        return model
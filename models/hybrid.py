@@ -2,50 +2,197 @@
 Hybrid Recommendation System combining Content-Based and Collaborative Filtering
 """
 
+import numpy as np
 import pandas as pd
 import config
+from utils.metrics import timed, timed_call
+from utils.similarity import top_n_positions
+
+CANDIDATE_POOLS = ('full', 'content', 'collaborative')
 
 class HybridModel:
-    def __init__(self, content_model, collaborative_model):
+    def __init__(self, content_model, collaborative_model, candidate_pool=None, pool_size=None):
         """
         Initialize hybrid model
         Args:
             content_model: Trained ContentBasedModel instance
             collaborative_model: Trained CollaborativeFilteringModel instance
+            candidate_pool: 'full' scores the whole catalog, 'content'/'collaborative' only the
+                            top pool_size internships of that model (defaults to config.CANDIDATE_POOL)
+            pool_size: Shortlist size for 'content'/'collaborative' pools (defaults to config.CANDIDATE_POOL_SIZE)
         """
         self.content_model = content_model
         self.collaborative_model = collaborative_model
+        self.candidate_pool = candidate_pool or config.CANDIDATE_POOL
+        self.pool_size = pool_size or config.CANDIDATE_POOL_SIZE
+        
+        if self.candidate_pool not in CANDIDATE_POOLS:
+            raise ValueError(f"candidate_pool must be one of {CANDIDATE_POOLS}, got '{self.candidate_pool}'")
+            
+        # Collaborative item position of each content-model internship, rebuilt when the item index changes
+        self._collaborative_positions = None
+        self._collaborative_index = None
+        self._collaborative_index_size = None
+        
+    def _get_collaborative_positions(self):
+        """Align the collaborative model's internship columns with the content model's internship rows"""
+        item_index = self.collaborative_model.user_item_matrix.item_index
+        
+        if (self._collaborative_positions is None or
+                self._collaborative_index is not item_index or
+                self._collaborative_index_size != len(item_index)):
+            internship_ids = self.content_model.internships_df['internship_id'].to_numpy()
+            self._collaborative_positions = item_index.get_indexer(internship_ids)
+            self._collaborative_index = item_index
+            self._collaborative_index_size = len(item_index)
+            
+        return self._collaborative_positions
+        
+    def score_catalog(self, student_ids, student_vectors):
+        """
+        Content and collaborative scores of every internship for a chunk of students
+        Args:
+            student_ids: Array of student IDs
+            student_vectors: TF-IDF profile vectors (aligned with student_ids)
+        Returns:
+            (content_scores, collaborative_scores) arrays of shape (n_students, n_internships),
+            content scores from config.CONTENT_BACKEND, collaborative scores normalized to 0-1 scale
+        """
+        content_scores = self.content_model.get_content_scores(student_vectors)
+        collaborative_scores = self._collaborative_scores(student_ids, np.arange(content_scores.shape[1]))
+        
+        return content_scores, collaborative_scores
         
-    def get_recommendations(self, student_id, student_profile, internships_df, top_n=5):
+    def _collaborative_scores(self, student_ids, candidates):
+        """
+        Collaborative scores (0-1 scale) of candidate internships
+        Args:
+            student_ids: Array of student IDs
+            candidates: Content-model internship positions, one row per student or one row shared by all
+        Returns:
+            Array of shape (n_students, n_candidates)
+        """
+        # Every collaborative item at once, then gathered into content-model order
+        positions = self._get_collaborative_positions()
+        all_predictions = self.collaborative_model.predict_batch(student_ids)
+        
+        with timed('hybrid.align'):
+            candidate_positions = np.broadcast_to(positions[candidates], (len(student_ids), np.shape(candidates)[-1]))
+            known = candidate_positions >= 0
+            collaborative_scores = np.full(candidate_positions.shape, 3.0)  # Default neutral rating
+            collaborative_scores[known] = np.take_along_axis(all_predictions, np.where(known, candidate_positions, 0), axis=1)[known]
+            
+        return collaborative_scores / 5.0
+        
+    def score_candidates(self, student_ids, student_vectors):
+        """
+        Candidate pool of a chunk of students with its content and collaborative scores
+        The 'content' pool is shortlisted through config.CONTENT_BACKEND, so only the shortlist is
+        ever scored by the hybrid blend; the other pools need every internship's scores
+        Args:
+            student_ids: Array of student IDs
+            student_vectors: TF-IDF profile vectors (aligned with student_ids)
+        Returns:
+            (candidates, content_scores, collaborative_scores) arrays of shape (n_students, n_candidates),
+            candidates as internship row positions in the content model's internships_df
+        """
+        n_internships = len(self.content_model.internships_df)
+        
+        if self.candidate_pool == 'content':
+            candidates, content_scores = self.content_model.shortlist(student_vectors, min(self.pool_size, n_internships))
+            return candidates, content_scores, self._collaborative_scores(student_ids, candidates)
+            
+        content_scores, collaborative_scores = self.score_catalog(student_ids, student_vectors)
+        
+        if self.candidate_pool == 'full':
+            candidates = np.broadcast_to(np.arange(n_internships), content_scores.shape)
+        else:
+            # Shortlist from the collaborative model, then rank the shortlist by hybrid score
+            candidates = top_n_positions(collaborative_scores, min(self.pool_size, n_internships))
+            
+        return (
+            candidates,
+            np.take_along_axis(content_scores, candidates, axis=1),
+            np.take_along_axis(collaborative_scores, candidates, axis=1)
+        )
+        
+    @timed_call('hybrid.select_top_n')
+    def select_top_n(self, content_scores, collaborative_scores, top_n):
+        """
+        Blend candidate scores with the config weights and select the top N candidates
+        Args:
+            content_scores: Array of shape (n_students, n_candidates)
+            collaborative_scores: Array of shape (n_students, n_candidates), 0-1 scale
+            top_n: Number of recommendations per student
+        Returns:
+            (order, hybrid_scores) arrays of shape (n_students, top_n): candidate columns and their
+            hybrid scores, best first
+        """
+        hybrid_scores = (
+            config.CONTENT_WEIGHT * content_scores +
+            config.COLLABORATIVE_WEIGHT * collaborative_scores
+        )
+        
+        order = top_n_positions(hybrid_scores, min(top_n, hybrid_scores.shape[1]))
+        return order, np.take_along_axis(hybrid_scores, order, axis=1)
+        
+    def get_recommendations(self, student_id, student_profile, internships_df=None, top_n=5):
         """
         Get hybrid recommendations
         Args:
             student_id: Student ID
             student_profile: Student skill profile string
-            internships_df: DataFrame with all internships
+            internships_df: Optional DataFrame with all internships; rows always come from the catalog
+                            the content model was fitted on, so a different catalog raises ValueError
             top_n: Number of recommendations
         Returns:
             DataFrame with top N recommendations and hybrid scores
         """
-        # Get content-based recommendations
-        content_recs = self.content_model.get_recommendations(student_profile, top_n=20)
+        if internships_df is not None and not np.array_equal(
+                internships_df['internship_id'].to_numpy(), self.content_model.internships_df['internship_id'].to_numpy()):
+            raise ValueError("internships_df differs from the catalog the content model was fitted on")
+            
+        student_vector = self.content_model.transform_profiles([student_profile])
+        candidates, content_scores, collaborative_scores = self.score_candidates(np.array([student_id]), student_vector)
+        order, hybrid_scores = self.select_top_n(content_scores, collaborative_scores, top_n)
         
-        # Add collaborative scores
-        collaborative_scores = []
-        for internship_id in content_recs['internship_id']:
-            collab_score = self.collaborative_model.predict(student_id, internship_id)
-            # Normalize to 0-1 scale
-            collaborative_scores.append(collab_score / 5.0)
+        # Materialize only the final rows
+        top = order[0]
+        recommendations = self.content_model.internships_df.iloc[candidates[0, top]].copy()
+        recommendations['content_score'] = content_scores[0, top]
+        recommendations['collaborative_score'] = collaborative_scores[0, top]
+        recommendations['hybrid_score'] = hybrid_scores[0]
         
-        content_recs['collaborative_score'] = collaborative_scores
+        return recommendations
         
-        # Calculate hybrid score using weighted combination
-        content_recs['hybrid_score'] = (
-            config.CONTENT_WEIGHT * content_recs['content_score'] +
-            config.COLLABORATIVE_WEIGHT * content_recs['collaborative_score']
-        )
+    @timed_call('hybrid.get_batch_recommendations')
+    def get_batch_recommendations(self, student_ids, student_profiles, top_n=5, chunk_size=1024):
+        """
+        Get hybrid recommendations for many students at once
+        Args:
+            student_ids: Array of student IDs
+            student_profiles: Array of student skill profile strings (aligned with student_ids)
+            top_n: Number of recommendations per student
+            chunk_size: Number of students scored per sparse matrix product
+        Returns:
+            (positions, scores) arrays of shape (n_students, top_n): internship row positions in the
+            content model's internships_df and hybrid scores, best first
+        """
+        n_internships = len(self.content_model.internships_df)
+        n_candidates = n_internships if self.candidate_pool == 'full' else min(self.pool_size, n_internships)
+        n_results = min(top_n, n_candidates)
         
-        # Sort by hybrid score and return top N
-        recommendations = content_recs.sort_values('hybrid_score', ascending=False).head(top_n)
+        positions = np.empty((len(student_ids), n_results), dtype=np.int64)
+        scores = np.empty((len(student_ids), n_results))
         
-        return recommendations
+        # One TF-IDF matrix for all profiles
+        student_vectors = self.content_model.transform_profiles(student_profiles)
+        
+        for start in range(0, len(student_ids), chunk_size):
+            stop = start + chunk_size
+            
+            candidates, content_scores, collaborative_scores = self.score_candidates(student_ids[start:stop], student_vectors[start:stop])
+            order, scores[start:stop] = self.select_top_n(content_scores, collaborative_scores, top_n)
+            positions[start:stop] = np.take_along_axis(candidates, order, axis=1)
+            
+        return positions, scores
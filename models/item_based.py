@@ -0,0 +1,293 @@
+"""
+Item-Item Collaborative Filtering Model
+Precomputes a sparse top-k internship-internship cosine similarity table; a student's
+scores are a sparse product of their ratings with that table
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from utils.user_item_matrix import UserItemMatrix
+from utils.snapshot import save_array, load_array, save_csr, load_csr, write_json, read_json
+from utils.metrics import timed_call
+
+class ItemBasedModel:
+    def __init__(self, n_neighbors=20, block_size=1024):
+        """
+        Initialize item-item collaborative filtering model
+        Args:
+            n_neighbors: Most similar internships kept per internship
+            block_size: Number of internships per block when building the similarity table
+        """
+        self.n_neighbors = n_neighbors
+        self.block_size = block_size
+        self.user_item_matrix = None
+        
+        # Row j holds the top-k internships similar to internship j (transposed for scoring)
+        self.item_similarity_t = None
+        
+    def fit(self, user_item_matrix):
+        """
+        Train item-item model
+        Args:
+            user_item_matrix: UserItemMatrix (or dense DataFrame) with students as rows, internships as columns
+        """
+        if isinstance(user_item_matrix, pd.DataFrame):
+            user_item_matrix = UserItemMatrix.from_dataframe(user_item_matrix)
+            
+        self.user_item_matrix = user_item_matrix
+        self.item_similarity_t = self._build_similarity(user_item_matrix.matrix).T.tocsr()
+        
+        print(f"✅ Item-based model trained on {user_item_matrix.shape[1]} items ({user_item_matrix.shape[0]} users)")
+        
+    def _build_similarity(self, matrix):
+        """
+        Build the sparse top-k item-item cosine similarity table blockwise
+        Args:
+            matrix: Sparse user-item rating matrix
+        Returns:
+            CSR matrix of shape (n_items, n_items); an internship is not its own neighbour
+        """
+        n_items = matrix.shape[1]
+        k = self.n_neighbors
+        
+        # Cosine similarity = dot product of L2-normalized internship columns
+        normalized_t = normalize(matrix, norm='l2', axis=0).T.tocsr()
+        normalized = normalized_t.T.tocsr()
+        
+        rows, cols, values = [], [], []
+        
+        for start in range(0, n_items, self.block_size):
+            block = (normalized_t[start:start + self.block_size] @ normalized).tocsr()
+            block.setdiag(0, k=start)
+            block.eliminate_zeros()
+            
+            for row in range(block.shape[0]):
+                lo, hi = block.indptr[row], block.indptr[row + 1]
+                neighbors = block.indices[lo:hi]
+                similarities = block.data[lo:hi]
+                
+                if len(similarities) > k:
+                    top = np.argpartition(-similarities, k - 1)[:k]
+                    neighbors, similarities = neighbors[top], similarities[top]
+                    
+                rows.append(np.full(len(neighbors), start + row))
+                cols.append(neighbors)
+                values.append(similarities)
+                
+        return sparse.csr_matrix(
+            (
+                np.concatenate(values).astype(np.float32) if values else np.empty(0, dtype=np.float32),
+                (
+                    np.concatenate(rows) if rows else np.empty(0, dtype=np.int64),
+                    np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+                )
+            ),
+            shape=(n_items, n_items)
+        )
+        
+    def _score_ratings(self, ratings):
+        """
+        Score every internship from sparse rating rows
+        Args:
+            ratings: CSR matrix of shape (n_students, n_items)
+        Returns:
+            numpy array of shape (n_students, n_items) with predicted ratings (1-5 scale);
+            internships with no rated neighbour get the neutral rating
+        """
+        rated = ratings.copy()
+        rated.data = np.ones_like(rated.data)
+        
+        # Sparse products over each student's few ratings
+        numerator = (ratings @ self.item_similarity_t).toarray()
+        denominator = (rated @ abs(self.item_similarity_t)).toarray()
+        
+        predictions = np.full(numerator.shape, 3.0)  # Default neutral rating
+        scored = denominator > 0
+        predictions[scored] = np.clip(numerator[scored] / denominator[scored], 1.0, 5.0)
+        
+        return predictions
+        
+    def score_ratings(self, internship_ids, ratings):
+        """
+        Score every internship for a student who is not in the model yet, from their ratings alone
+        Args:
+            internship_ids: Internship IDs the student rated
+            ratings: Their ratings
+        Returns:
+            numpy array of predicted ratings (1-5 scale) for every internship in the matrix
+        """
+        n_items = self.user_item_matrix.shape[1]
+        positions = self.user_item_matrix.item_index.get_indexer(internship_ids)
+        known = positions >= 0
+        
+        row = sparse.csr_matrix(
+            (np.asarray(ratings, dtype=np.float64)[known], (np.zeros(known.sum(), dtype=np.int64), positions[known])),
+            shape=(1, n_items)
+        )
+        
+        return self._score_ratings(row)[0]
+        
+    def partial_update(self, student_ids, internship_ids, ratings):
+        """
+        Apply new or changed ratings without a full refit
+        Students are scored from their ratings directly, so new ratings take effect immediately;
+        the item similarity table is refreshed on the next fit
+        Args:
+            student_ids: Student IDs (new students are added)
+            internship_ids: Internship IDs (new internships are added)
+            ratings: Rating values that replace the stored ones
+        """
+        if len(student_ids) == 0:
+            return
+            
+        affected = self.user_item_matrix.update(student_ids, internship_ids, ratings)
+        
+        # New internships have no neighbours until the next fit
+        n_items = self.user_item_matrix.shape[1]
+        if n_items > self.item_similarity_t.shape[0]:
+            self.item_similarity_t = sparse.csr_matrix(
+                (self.item_similarity_t.data, self.item_similarity_t.indices,
+                 np.concatenate([self.item_similarity_t.indptr,
+                                 np.full(n_items - self.item_similarity_t.shape[0], self.item_similarity_t.indptr[-1])])),
+                shape=(n_items, n_items)
+            )
+            
+        print(f"✅ Item-based model updated for {len(affected)} students")
+        
+    def predict(self, student_id, internship_id):
+        """
+        Predict rating for student-internship pair
+        Args:
+            student_id: Student ID
+            internship_id: Internship ID
+        Returns:
+            Predicted rating (1-5 scale)
+        """
+        user_idx = self.user_item_matrix.user_index.get(student_id)
+        if user_idx is None:
+            return 3.0  # Default neutral rating
+            
+        item_idx = self.user_item_matrix.item_index.get(internship_id)
+        if item_idx is None:
+            return 3.0  # Default neutral rating
+            
+        # The student's ratings of the internship's neighbours
+        student_ratings = self.user_item_matrix.matrix[user_idx]
+        column = self.item_similarity_t[:, item_idx].toarray().ravel()
+        
+        numerator = student_ratings @ column
+        denominator = np.abs(column[student_ratings.indices]).sum()
+        
+        if denominator == 0:
+            return 3.0  # Default neutral rating
+            
+        # Clip to valid rating range
+        return np.clip(numerator[0] / denominator, 1.0, 5.0)
+        
+    def predict_many(self, student_id, internship_ids=None):
+        """
+        Predict ratings for one student over many internships in a single pass
+        Args:
+            student_id: Student ID
+            internship_ids: Internship IDs to score (None scores every internship in the matrix)
+        Returns:
+            numpy array of predicted ratings (1-5 scale), aligned with internship_ids
+        """
+        return self.predict_batch([student_id], internship_ids)[0]
+        
+    @timed_call('item_based.predict_batch')
+    def predict_batch(self, student_ids, internship_ids=None):
+        """
+        Predict ratings for many students at once
+        Args:
+            student_ids: Student IDs to score
+            internship_ids: Internship IDs to score (None scores every internship in the matrix)
+        Returns:
+            numpy array of shape (len(student_ids), n_internships) with predicted ratings (1-5 scale)
+        """
+        n_items = self.user_item_matrix.shape[1]
+        user_positions = self.user_item_matrix.user_index.get_indexer(student_ids)
+        known_users = user_positions >= 0
+        
+        all_scores = np.full((len(user_positions), n_items), 3.0)  # Default neutral rating
+        
+        if known_users.any():
+            all_scores[known_users] = self._score_ratings(self.user_item_matrix.matrix[user_positions[known_users]])
+            
+        if internship_ids is None:
+            return all_scores
+            
+        # Gather requested internships, unknown ones get the neutral rating
+        item_positions = self.user_item_matrix.item_index.get_indexer(internship_ids)
+        predictions = np.full((len(user_positions), len(item_positions)), 3.0)
+        known_items = item_positions >= 0
+        predictions[:, known_items] = all_scores[:, item_positions[known_items]]
+        
+        return predictions
+        
+    def get_top_recommendations(self, student_id, top_n=5):
+        """
+        Get top N internship recommendations for a student
+        Args:
+            student_id: Student ID
+            top_n: Number of recommendations
+        Returns:
+            List of (internship_id, predicted_rating) tuples
+        """
+        user_idx = self.user_item_matrix.user_index.get(student_id)
+        if user_idx is None:
+            return []
+            
+        # Score every internship at once
+        predictions = self.predict_many(student_id)
+        
+        # Keep only internships the student hasn't rated
+        is_unrated = np.ones(len(predictions), dtype=bool)
+        is_unrated[self.user_item_matrix.matrix[user_idx].indices] = False
+        unrated = np.flatnonzero(is_unrated)
+        
+        # Sort by predicted rating (stable, so ties keep internship order) and return top N
+        order = unrated[np.argsort(-predictions[unrated], kind='stable')][:top_n]
+        item_ids = self.user_item_matrix.item_ids
+        return [(item_ids[pos], predictions[pos]) for pos in order]
+        
+    def save(self, directory):
+        """
+        Save rating matrix, id maps and the item similarity table
+        Args:
+            directory: Snapshot directory for this model
+        """
+        save_csr(directory, 'ratings', self.user_item_matrix.matrix)
+        save_array(directory, 'user_ids', self.user_item_matrix.user_ids)
+        save_array(directory, 'item_ids', self.user_item_matrix.item_ids)
+        save_csr(directory, 'item_similarity_t', self.item_similarity_t)
+        
+        write_json(directory, 'params.json', {
+            'engine': 'item',
+            'n_neighbors': self.n_neighbors,
+            'block_size': self.block_size
+        })
+        
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Load a model saved with save() without recomputing similarities
+        Args:
+            directory: Snapshot directory for this model
+            mmap_mode: numpy memory-map mode for the large arrays
+        Returns:
+            Fitted ItemBasedModel
+        """
+        params = read_json(directory, 'params.json')
+        model = cls(n_neighbors=params['n_neighbors'], block_size=params['block_size'])
+        
+        model.user_item_matrix = UserItemMatrix(
+            load_csr(directory, 'ratings', mmap_mode),
+            load_array(directory, 'user_ids', mmap_mode),
+            load_array(directory, 'item_ids', mmap_mode)
+        )
+        model.item_similarity_t = load_csr(directory, 'item_similarity_t', mmap_mode)
+        
+        return model
@@ -0,0 +1,295 @@
+"""
+Collaborative Filtering Model using Matrix Factorization (Alternating Least Squares)
+Drop-in alternative to the user-user cosine model: ratings are approximated by
+global mean + low-rank student and internship factors
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from utils.user_item_matrix import UserItemMatrix
+from utils.snapshot import save_array, load_array, save_csr, load_csr, write_json, read_json
+from utils.metrics import timed_call
+
+class MatrixFactorizationModel:
+    def __init__(self, n_factors=16, regularization=0.1, n_iter=15, block_size=16384, random_state=42):
+        """
+        Initialize matrix factorization model
+        Args:
+            n_factors: Number of latent factors (rank)
+            regularization: L2 penalty, scaled by each student's/internship's number of ratings
+            n_iter: ALS iterations per fit
+            block_size: Ratings per batched least-squares step (bounds the temporary Gram tensor)
+            random_state: Seed for factor initialization
+        """
+        self.n_factors = n_factors
+        self.regularization = regularization
+        self.n_iter = n_iter
+        self.block_size = block_size
+        self.random_state = random_state
+        
+        self.user_item_matrix = None
+        self.global_mean = 0.0
+        self.user_factors = None
+        self.item_factors = None
+        
+    def fit(self, user_item_matrix, warm_start=True, n_iter=None):
+        """
+        Train factors with alternating least squares
+        Args:
+            user_item_matrix: UserItemMatrix (or dense DataFrame) with students as rows, internships as columns
+            warm_start: Start from the previous factors of students/internships that are still present
+            n_iter: ALS iterations (defaults to self.n_iter)
+        """
+        if isinstance(user_item_matrix, pd.DataFrame):
+            user_item_matrix = UserItemMatrix.from_dataframe(user_item_matrix)
+            
+        n_users, n_items = user_item_matrix.shape
+        ratings = user_item_matrix.matrix.tocsr()
+        ratings_t = ratings.T.tocsr()
+        
+        self.global_mean = float(ratings.data.mean()) if ratings.nnz else 3.0
+        
+        item_factors = self._initial_factors(n_items)
+        
+        if warm_start and self.item_factors is not None:
+            # Reuse factors of internships seen in the previous fit
+            previous = self.user_item_matrix.item_index.get_indexer(user_item_matrix.item_ids)
+            known = previous >= 0
+            item_factors[known] = self.item_factors[previous[known]]
+            
+        # Alternate: solve students with internships fixed, then internships with students fixed
+        for _ in range(n_iter or self.n_iter):
+            user_factors = self._solve(ratings, item_factors)
+            item_factors = self._solve(ratings_t, user_factors)
+            
+        self.user_item_matrix = user_item_matrix
+        self.user_factors = self._solve(ratings, item_factors).astype(np.float32)
+        self.item_factors = item_factors.astype(np.float32)
+        
+        print(f"✅ Matrix factorization model trained on {n_users} users and {n_items} items ({self.n_factors} factors)")
+        
+    def _initial_factors(self, n_rows):
+        """Small random factors for rows without a previous fit"""
+        rng = np.random.default_rng(self.random_state)
+        return rng.normal(scale=0.1, size=(n_rows, self.n_factors))
+        
+    def _solve(self, ratings, fixed_factors, rows=None):
+        """
+        Regularized least squares for one side of the factorization
+        Args:
+            ratings: CSR matrix whose rows are the side being solved
+            fixed_factors: Factors of the other side (one row per column of ratings)
+            rows: Row positions to solve (None solves all)
+        Returns:
+            Array of shape (len(rows), n_factors); rows without ratings get zero factors
+        """
+        if rows is None:
+            rows = np.arange(ratings.shape[0])
+            
+        fixed_factors = np.asarray(fixed_factors, dtype=np.float64)
+        factors = np.zeros((len(rows), self.n_factors))
+        identity = np.eye(self.n_factors)
+        
+        # Split rows into blocks of roughly block_size ratings each
+        counts = ratings.indptr[rows + 1] - ratings.indptr[rows]
+        block_ids = np.cumsum(counts) // self.block_size
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(block_ids)) + 1, [len(rows)]])
+        
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            block = ratings[rows[start:stop]]
+            counts = np.diff(block.indptr)
+            
+            # Row-membership matrix: multiplying by it sums each row's per-rating terms
+            membership = sparse.csr_matrix(
+                (np.ones(block.nnz), np.arange(block.nnz), block.indptr),
+                shape=(stop - start, block.nnz)
+            )
+            
+            # Per-row Gram matrices and right-hand sides over each row's rated columns
+            vectors = fixed_factors[block.indices]
+            outer = (vectors[:, :, None] * vectors[:, None, :]).reshape(block.nnz, -1)
+            gram = (membership @ outer).reshape(-1, self.n_factors, self.n_factors)
+            rhs = membership @ (vectors * (block.data - self.global_mean)[:, None])
+            
+            # Rows without ratings get an identity system and therefore zero factors
+            gram += (self.regularization * counts + (counts == 0))[:, None, None] * identity
+            factors[start:stop] = np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]
+            
+        return factors
+        
+    def partial_update(self, student_ids, internship_ids, ratings):
+        """
+        Apply new or changed ratings without a full refit
+        Factors of the affected students, then of the rated internships, are re-solved with the other side fixed
+        Args:
+            student_ids: Student IDs (new students are added)
+            internship_ids: Internship IDs (new internships are added)
+            ratings: Rating values that replace the stored ones
+        """
+        if len(student_ids) == 0:
+            return
+            
+        affected = self.user_item_matrix.update(student_ids, internship_ids, ratings)
+        n_users, n_items = self.user_item_matrix.shape
+        
+        # Writable copies (snapshot factors may be read-only memory maps), grown for new students and internships
+        self.user_factors = np.vstack([
+            self.user_factors,
+            np.zeros((n_users - len(self.user_factors), self.n_factors), dtype=np.float32)
+        ])
+        self.item_factors = np.vstack([
+            self.item_factors,
+            self._initial_factors(n_items - len(self.item_factors)).astype(np.float32)
+        ])
+        
+        matrix = self.user_item_matrix.matrix
+        items = self.user_item_matrix.item_index.get_indexer(internship_ids)
+        
+        self.user_factors[affected] = self._solve(matrix, self.item_factors, affected)
+        
+        items = np.unique(items)
+        self.item_factors[items] = self._solve(matrix.T.tocsr(), self.user_factors, items)
+        
+        print(f"✅ Matrix factorization model updated for {len(affected)} students")
+        
+    def predict(self, student_id, internship_id):
+        """
+        Predict rating for student-internship pair
+        Args:
+            student_id: Student ID
+            internship_id: Internship ID
+        Returns:
+            Predicted rating (1-5 scale)
+        """
+        user_idx = self.user_item_matrix.user_index.get(student_id)
+        if user_idx is None:
+            return 3.0  # Default neutral rating
+            
+        item_idx = self.user_item_matrix.item_index.get(internship_id)
+        if item_idx is None:
+            return 3.0  # Default neutral rating
+            
+        # O(k) dot product of the two factor vectors
+        predicted_rating = self.global_mean + float(self.user_factors[user_idx] @ self.item_factors[item_idx])
+        
+        # Clip to valid rating range
+        return min(max(predicted_rating, 1.0), 5.0)
+        
+    def predict_many(self, student_id, internship_ids=None):
+        """
+        Predict ratings for one student over many internships in a single pass
+        Args:
+            student_id: Student ID
+            internship_ids: Internship IDs to score (None scores every internship in the matrix)
+        Returns:
+            numpy array of predicted ratings (1-5 scale), aligned with internship_ids
+        """
+        return self.predict_batch([student_id], internship_ids)[0]
+        
+    @timed_call('matrix_factorization.predict_batch')
+    def predict_batch(self, student_ids, internship_ids=None):
+        """
+        Predict ratings for many students at once
+        Args:
+            student_ids: Student IDs to score
+            internship_ids: Internship IDs to score (None scores every internship in the matrix)
+        Returns:
+            numpy array of shape (len(student_ids), n_internships) with predicted ratings (1-5 scale)
+        """
+        user_positions = self.user_item_matrix.user_index.get_indexer(student_ids)
+        known_users = user_positions >= 0
+        
+        if internship_ids is None:
+            item_positions = np.arange(len(self.item_factors))
+        else:
+            item_positions = self.user_item_matrix.item_index.get_indexer(internship_ids)
+            
+        known_items = item_positions >= 0
+        
+        predictions = np.full((len(user_positions), len(item_positions)), 3.0)  # Default neutral rating
+        
+        if known_users.any() and known_items.any():
+            # One dense (students x k) @ (k x internships) product
+            scores = self.user_factors[user_positions[known_users]] @ self.item_factors[item_positions[known_items]].T
+            predictions[np.ix_(known_users, known_items)] = np.clip(self.global_mean + scores, 1.0, 5.0)
+            
+        return predictions
+        
+    def get_top_recommendations(self, student_id, top_n=5):
+        """
+        Get top N internship recommendations for a student
+        Args:
+            student_id: Student ID
+            top_n: Number of recommendations
+        Returns:
+            List of (internship_id, predicted_rating) tuples
+        """
+        user_idx = self.user_item_matrix.user_index.get(student_id)
+        if user_idx is None:
+            return []
+            
+        # Score every internship with one matrix-vector product over the item factors
+        predictions = np.clip(self.global_mean + self.item_factors @ self.user_factors[user_idx], 1.0, 5.0)
+        
+        # Keep only internships the student hasn't rated
+        is_unrated = np.ones(len(predictions), dtype=bool)
+        is_unrated[self.user_item_matrix.matrix[user_idx].indices] = False
+        unrated = np.flatnonzero(is_unrated)
+        
+        # Sort by predicted rating (stable, so ties keep internship order) and return top N
+        order = unrated[np.argsort(-predictions[unrated], kind='stable')][:top_n]
+        item_ids = self.user_item_matrix.item_ids
+        return [(item_ids[pos], float(predictions[pos])) for pos in order]
+        
+    def save(self, directory):
+        """
+        Save rating matrix, id maps and factors
+        Args:
+            directory: Snapshot directory for this model
+        """
+        save_csr(directory, 'ratings', self.user_item_matrix.matrix)
+        save_array(directory, 'user_ids', self.user_item_matrix.user_ids)
+        save_array(directory, 'item_ids', self.user_item_matrix.item_ids)
+        save_array(directory, 'user_factors', self.user_factors)
+        save_array(directory, 'item_factors', self.item_factors)
+        
+        write_json(directory, 'params.json', {
+            'engine': 'matrix_factorization',
+            'n_factors': self.n_factors,
+            'regularization': self.regularization,
+            'n_iter': self.n_iter,
+            'block_size': self.block_size,
+            'random_state': self.random_state,
+            'global_mean': self.global_mean
+        })
+        
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Load a model saved with save() without refitting
+        Args:
+            directory: Snapshot directory for this model
+            mmap_mode: numpy memory-map mode for the large arrays
+        Returns:
+            Fitted MatrixFactorizationModel
+        """
+        params = read_json(directory, 'params.json')
+        model = cls(
+            n_factors=params['n_factors'],
+            regularization=params['regularization'],
+            n_iter=params['n_iter'],
+            block_size=params['block_size'],
+            random_state=params['random_state']
+        )
+        model.global_mean = params['global_mean']
+        
+        model.user_item_matrix = UserItemMatrix(
+            load_csr(directory, 'ratings', mmap_mode),
+            load_array(directory, 'user_ids', mmap_mode),
+            load_array(directory, 'item_ids', mmap_mode)
+        )
+        model.user_factors = load_array(directory, 'user_factors', mmap_mode)
+        model.item_factors = load_array(directory, 'item_factors', mmap_mode)
+        
+        return model
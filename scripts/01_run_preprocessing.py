@@ -3,24 +3,25 @@ Script to load, explore, and preprocess all datasets
 Run this first before building models
 """
 
+import argparse
 import pandas as pd
 import sys
 sys.path.append('.')
 
+import config
 from utils.data_loader import load_all_data
+from utils.feedback_stats import FeedbackPairStats
 from utils.preprocessing import (
     preprocess_students, 
     preprocess_internships, 
     preprocess_feedback, 
     create_user_item_matrix,
-    save_processed_data
+    save_processed_data,
+    preprocess_streaming
 )
 
-def main():
-    print("=" * 70)
-    print("AI-BASED HYBRID RECOMMENDATION SYSTEM - DATA PREPROCESSING")
-    print("=" * 70)
-    
+def preprocess_in_memory():
+    """Load, explore, preprocess and save all datasets in memory"""
     # Step 1: Load Data
     print("\n📂 STEP 1: LOADING DATA")
     print("-" * 70)
@@ -62,6 +63,35 @@ def main():
     print("\n💾 STEP 4: SAVING PROCESSED DATA")
     print("-" * 70)
     save_processed_data(students_processed, internships_processed, feedback_processed, user_item_matrix)
+
+def main():
+    parser = argparse.ArgumentParser(description="Preprocess raw datasets")
+    parser.add_argument(
+        '--chunk-size', type=int, default=None,
+        help="Stream each raw file in chunks of this many rows (bounded memory, skips exploration)"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=config.NUM_WORKERS,
+        help="Processes parsing and transforming chunks in parallel (implies streaming mode when > 1)"
+    )
+    args = parser.parse_args()
+    
+    print("=" * 70)
+    print("AI-BASED HYBRID RECOMMENDATION SYSTEM - DATA PREPROCESSING")
+    print("=" * 70)
+    
+    if args.chunk_size or args.workers > 1:
+        # Streaming mode: two passes over each file, processed chunks go straight to disk
+        chunk_size = args.chunk_size or 100000
+        print(f"\n🔧 STREAMING PREPROCESSING (chunks of {chunk_size} rows, {args.workers} worker(s))")
+        print("-" * 70)
+        preprocess_streaming(chunk_size, args.workers)
+    else:
+        preprocess_in_memory()
+        
+    # Rating sums the incremental model updates catch up from, so they never rescan the log
+    n_rows = FeedbackPairStats(config.FEEDBACK_FILE, config.FEEDBACK_STATS_FILE).rebuild()
+    print(f"✅ Feedback pair statistics saved for {n_rows} feedback entries")
     
     print("\n" + "=" * 70)
     print("✅ DATA PREPROCESSING COMPLETE!")
@@ -70,6 +100,7 @@ def main():
     print("  1. Run: python scripts/02_test_content_model.py")
     print("  2. Run: python scripts/03_test_collaborative_model.py")
     print("  3. Run: python scripts/04_test_hybrid_model.py")
+    print("  4. Run: python scripts/05_build_model_snapshot.py")
     print("=" * 70)
 
 if __name__ == "__main__":
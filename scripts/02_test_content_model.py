@@ -7,6 +7,7 @@ sys.path.append('.')
 
 import pandas as pd
 from models.content_based import ContentBasedModel
+from utils.data_loader import load_processed_students, load_processed_internships
 
 def main():
     print("=" * 70)
@@ -14,8 +15,8 @@ def main():
     print("=" * 70)
     
     # Load processed data
-    internships = pd.read_csv('data/processed/internships_processed.csv')
-    students = pd.read_csv('data/processed/students_processed.csv')
+    internships = load_processed_internships()
+    students = load_processed_students(['student_id', 'skill_profile'])
     
     # Train model
     print("\n🤖 Training content-based model...")
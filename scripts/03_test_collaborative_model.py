@@ -7,6 +7,7 @@ sys.path.append('.')
 
 import pandas as pd
 from models.collaborative import CollaborativeFilteringModel
+from utils.data_loader import load_user_item_matrix
 
 def main():
     print("=" * 70)
@@ -15,7 +16,7 @@ def main():
     
     # Load user-item matrix
     print("\n📂 Loading user-item matrix...")
-    user_item_matrix = pd.read_csv('data/processed/user_item_matrix.csv', index_col=0)
+    user_item_matrix = load_user_item_matrix()
     
     # Train model
     print("\n🤖 Training collaborative filtering model...")
@@ -0,0 +1,37 @@
+"""
+Train all models once and save a memory-mappable snapshot
+Run this after preprocessing so the app, CLI and scripts start without retraining
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import config
+
+def main():
+    parser = argparse.ArgumentParser(description="Train all models and save a snapshot")
+    parser.add_argument('--workers', type=int, default=config.NUM_WORKERS, help="Processes for TF-IDF fitting")
+    args = parser.parse_args()
+    
+    config.NUM_WORKERS = args.workers
+    
+    # Imported after argument parsing, so --help does not wait for scikit-learn
+    from components.recommender import HybridRecommender
+    
+    print("=" * 70)
+    print("BUILDING MODEL SNAPSHOT")
+    print("=" * 70)
+    
+    # Always retrain from the current processed data
+    recommender = HybridRecommender(use_snapshot=False)
+    
+    print("\n💾 Saving snapshot...")
+    recommender.save_snapshot(config.SNAPSHOT_DIR)
+    
+    print("\n" + "=" * 70)
+    print("✅ Model snapshot ready!")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Recall vs latency report for the approximate (IVF) content retrieval backend
+Compares ANN results with exact brute-force search for every student profile
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import config
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN recall report")
+    parser.add_argument('--top-n', type=int, default=config.TOP_N_RECOMMENDATIONS, help="Recommendations per query")
+    parser.add_argument('--clusters', type=int, default=config.ANN_CLUSTERS, help="IVF clusters (default: sqrt of catalog size)")
+    parser.add_argument('--probes', type=int, nargs='+', default=[1, 2, 4, 8, 16], help="n_probe values to evaluate")
+    args = parser.parse_args()
+    
+    # Imported after argument parsing, so --help does not wait for scikit-learn
+    from models.content_based import ContentBasedModel
+    from utils.data_loader import load_processed_students, load_processed_internships
+    
+    print("=" * 70)
+    print("ANN RECALL REPORT")
+    print("=" * 70)
+    
+    # Load processed data
+    internships = load_processed_internships(['internship_id', 'internship_profile'])
+    students = load_processed_students(['student_id', 'skill_profile'])
+    
+    # Train model and build the index
+    print("\n🤖 Training content-based model...")
+    model = ContentBasedModel()
+    model.fit(internships)
+    
+    ann_index = model.build_ann_index(n_clusters=args.clusters)
+    print(f"✅ IVF index built with {ann_index.n_clusters} clusters")
+    
+    report = ann_index.recall_report(
+        model.transform_profiles(students['skill_profile']),
+        top_n=args.top_n,
+        n_probes=args.probes
+    )
+    
+    print(f"\n📊 Recall@{args.top_n} over {len(students)} student profiles")
+    print("-" * 70)
+    print(f"{'n_probe':>8} {'recall':>8} {'ANN ms/query':>14} {'exact ms/query':>16}")
+    
+    for row in report:
+        print(f"{row['n_probe']:>8} {row['recall']:>8.3f} {row['ann_ms_per_query']:>14.3f} {row['exact_ms_per_query']:>16.3f}")
+        
+    print("\n" + "=" * 70)
+    print("✅ ANN recall report complete!")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
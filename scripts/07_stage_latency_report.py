@@ -0,0 +1,58 @@
+"""
+Per-stage latency report for the recommend path
+Enables the stage metrics, runs single and batch recommendations and writes
+Prometheus text and JSON snapshots of the stage histograms
+
+Usage:
+    python scripts/07_stage_latency_report.py --queries 500 --output-dir benchmarks/results
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import numpy as np
+from utils.metrics import metrics
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage latency report")
+    parser.add_argument('--queries', type=int, default=500, help="Single recommend() calls")
+    parser.add_argument('--batch-size', type=int, default=256, help="Students per recommend_many() call")
+    parser.add_argument('--batches', type=int, default=5, help="recommend_many() calls")
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output-dir', default='benchmarks/results')
+    args = parser.parse_args()
+    
+    # Imported after argument parsing, so --help does not wait for scikit-learn
+    from components.recommender import HybridRecommender
+    
+    recommender = HybridRecommender()
+    recommender.result_cache.max_size = 0  # Time the computation, not cache hits
+    
+    rng = np.random.default_rng(args.seed)
+    student_ids = recommender.students_df['student_id'].to_numpy()
+    
+    metrics.reset()
+    metrics.enable()
+    
+    for student_id in rng.choice(student_ids, args.queries):
+        recommender.recommend(student_id, args.top_n)
+    for _ in range(args.batches):
+        recommender.recommend_many(rng.choice(student_ids, args.batch_size), args.top_n)
+        
+    metrics.disable()
+    
+    print("\n" + "=" * 70)
+    print("STAGE LATENCY (p50/p95/p99 are bucket upper bounds)")
+    print("=" * 70)
+    print(f"{'stage':<36}{'count':>8}{'mean ms':>10}{'p50':>8}{'p95':>8}{'p99':>8}")
+    for name, stage in metrics.to_dict().items():
+        print(f"{name:<36}{stage['count']:>8}{stage['mean_ms']:>10.3f}"
+              f"{stage['p50_ms_le']:>8.2f}{stage['p95_ms_le']:>8.2f}{stage['p99_ms_le']:>8.2f}")
+              
+    prom_path, json_path = metrics.export(args.output_dir, 'stage_latency')
+    print(f"\n✅ Saved {prom_path} and {json_path}")
+
+if __name__ == "__main__":
+    main()
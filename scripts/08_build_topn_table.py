@@ -0,0 +1,50 @@
+"""
+Nightly job: score every student and write the precomputed top-N table
+The recommender (app, CLI, HTTP service) memory-maps the table and serves from it, scoring live
+only for students added after the build
+
+Students are scored in shards across --workers processes; finished shards are checkpointed, so
+rerunning after a crash only scores the shards that are missing
+
+Usage:
+    python scripts/08_build_topn_table.py --top-n 20 --workers 8
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import config
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the precomputed top-N recommendation table")
+    parser.add_argument('--top-n', type=int, default=config.TOPN_TABLE_SIZE, help="Recommendations stored per student")
+    parser.add_argument('--workers', type=int, default=config.NUM_WORKERS, help="Scoring processes")
+    parser.add_argument('--shard-size', type=int, default=config.BULK_SHARD_SIZE, help="Students per checkpointed shard")
+    parser.add_argument('--chunk-size', type=int, default=1024, help="Students scored per batch")
+    parser.add_argument('--output-dir', default=config.TOPN_TABLE_DIR)
+    parser.add_argument('--keep-checkpoints', action='store_true', help="Keep the shard files after the table is written")
+    args = parser.parse_args()
+    
+    # Imported after argument parsing, so --help does not wait for scikit-learn
+    from components.recommender import HybridRecommender
+    from components.bulk_scoring import ShardedScorer
+    
+    print("=" * 70)
+    print("BUILDING PRECOMPUTED TOP-N TABLE")
+    print("=" * 70)
+    
+    # Score with the current models, never with a previous table
+    recommender = HybridRecommender(use_topn_table=False)
+    
+    print()
+    scorer = ShardedScorer(recommender, args.output_dir, args.top_n, args.shard_size, args.workers, args.chunk_size)
+    summary = scorer.run(args.keep_checkpoints)
+    
+    print("\n" + "=" * 70)
+    print(f"✅ Top-N table ready: {summary['students']} students in {summary['seconds']:.1f} s "
+          f"({summary['students_per_second']:.0f} students/s, {summary['shards_skipped']} shards resumed)")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
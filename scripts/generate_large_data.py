@@ -0,0 +1,232 @@
+"""
+Generate a LARGE synthetic dataset (load-test fixtures) with the same skill-domain matching
+as generate_smart_data.py, vectorized with numpy and streamed to disk in chunks
+
+Usage:
+    python scripts/generate_large_data.py --students 1000000 --internships 50000 --feedback 10000000
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+import config
+from scripts.generate_smart_data import (
+    SKILL_DOMAIN_MAP, first_names, last_names, branches, years, preferred_locations, past_internships,
+    companies, roles_map, internship_locations, durations, stipends,
+    MATCHED_RATINGS, MATCHED_RECOMMEND, MISMATCHED_RATINGS, MISMATCHED_RECOMMEND
+)
+
+DOMAINS = list(SKILL_DOMAIN_MAP.keys())
+
+def _choice(rng, values, n):
+    """n values drawn with replacement (vectorized random.choice)"""
+    values = np.asarray(values, dtype=object)
+    return values[rng.integers(0, len(values), n)]
+
+def _domain_choice(rng, options, domains):
+    """
+    Per-row random.choice(options[domain]) for an array of domain positions
+    Args:
+        rng: numpy Generator
+        options: List (one entry per domain in DOMAINS) of value lists
+        domains: Domain positions, one per row
+    Returns:
+        Object array of chosen values
+    """
+    lengths = np.array([len(values) for values in options])
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    flat = np.array([value for values in options for value in values], dtype=object)
+    
+    # Uniform position within each row's own domain list
+    within = (rng.random(len(domains)) * lengths[domains]).astype(np.int64)
+    return flat[offsets[domains] + within]
+
+def make_ids(prefix, start, stop):
+    """IDs like f"{prefix}{i:03d}" for i in [start, stop)"""
+    return np.array([f"{prefix}{i:03d}" for i in range(start, stop)], dtype=object)
+
+def _chunks(n, chunk_size):
+    """(start, stop) ranges covering [0, n)"""
+    for start in range(0, n, chunk_size):
+        yield start, min(start + chunk_size, n)
+
+def generate_students(rng, start, stop):
+    """
+    Generate a chunk of students
+    Args:
+        rng: numpy Generator
+        start, stop: Student positions of the chunk (ids S{start + 1} ... S{stop})
+    Returns:
+        (students_df, domain positions)
+    """
+    n = stop - start
+    domains = rng.integers(0, len(DOMAINS), n)
+    
+    students_df = pd.DataFrame({
+        'student_id': make_ids('S', start + 1, stop + 1),
+        'name': _choice(rng, first_names, n) + ' ' + _choice(rng, last_names, n),
+        'branch': _choice(rng, branches, n),
+        'year': _choice(rng, years, n),
+        'cgpa': np.round(rng.uniform(7.0, 9.5, n), 1),
+        'skills': _domain_choice(rng, [SKILL_DOMAIN_MAP[domain]['skills'] for domain in DOMAINS], domains),
+        'domain_interest': np.asarray(DOMAINS, dtype=object)[domains],
+        'location_preference': _choice(rng, preferred_locations[0], n) + ',' + _choice(rng, preferred_locations[1], n),
+        'past_internships': _choice(rng, past_internships, n)
+    })
+    
+    return students_df, domains
+
+def generate_internships(rng, start, stop):
+    """
+    Generate a chunk of internships
+    Args:
+        rng: numpy Generator
+        start, stop: Internship positions of the chunk (ids I{start + 1} ... I{stop})
+    Returns:
+        (internships_df, domain positions)
+    """
+    n = stop - start
+    domains = rng.integers(0, len(DOMAINS), n)
+    domain_names = np.asarray(DOMAINS, dtype=object)[domains]
+    
+    internships_df = pd.DataFrame({
+        'internship_id': make_ids('I', start + 1, stop + 1),
+        'company': _choice(rng, companies, n),
+        'domain': domain_names,
+        'role': _domain_choice(rng, [roles_map[domain] for domain in DOMAINS], domains),
+        'required_skills': _domain_choice(rng, [SKILL_DOMAIN_MAP[domain]['internship_skills'] for domain in DOMAINS], domains),
+        'location': _choice(rng, internship_locations, n),
+        'duration_months': _choice(rng, durations, n),
+        'stipend': _choice(rng, stipends, n),
+        'rating': np.round(rng.uniform(4.0, 5.0, n), 1),
+        'total_reviews': rng.integers(40, 181, n),
+        'description': np.asarray([f"Work on cutting-edge {domain} projects" for domain in DOMAINS], dtype=object)[domains]
+    })
+    
+    return internships_df, domains
+
+def generate_feedback(rng, student_domains, internship_domains, n_feedback, chunk_size, internship_ids=None):
+    """
+    Generate feedback in chunks, with domain-matched ratings and no duplicate pairs
+    Feedback is sampled as uniform (student, internship) draws like generate_smart_data.py; the
+    draws are grouped into contiguous student ranges (multinomial counts per range), so a pair can
+    only repeat within its own chunk and duplicates are dropped with a per-chunk hash of pair keys
+    Args:
+        rng: numpy Generator
+        student_domains: Domain position of every student
+        internship_domains: Domain position of every internship
+        n_feedback: Number of (student, internship) draws; duplicate pairs are dropped
+        chunk_size: Expected number of feedback rows per chunk
+        internship_ids: Precomputed internship id array (built if None)
+    Yields:
+        feedback_df chunks
+    """
+    n_students = len(student_domains)
+    n_internships = len(internship_domains)
+    if internship_ids is None:
+        internship_ids = make_ids('I', 1, n_internships + 1)
+        
+    # Contiguous student ranges, each expected to receive about chunk_size draws
+    n_chunks = max(1, -(-n_feedback // chunk_size))
+    bounds = np.linspace(0, n_students, min(n_chunks, n_students) + 1).astype(np.int64)
+    counts = rng.multinomial(n_feedback, np.diff(bounds) / n_students)
+    today = np.datetime64('today', 'D')
+    
+    for (start, stop), count in zip(zip(bounds[:-1], bounds[1:]), counts):
+        if count == 0:
+            continue
+            
+        students = rng.integers(start, stop, count)
+        internships = rng.integers(0, n_internships, count)
+        
+        # Keep the first draw of each pair (hash-based on int64 pair keys)
+        keep = ~pd.Series(students * n_internships + internships).duplicated().to_numpy()
+        students, internships = students[keep], internships[keep]
+        n = len(students)
+        
+        # If domains match, give higher ratings
+        matched = student_domains[students] == internship_domains[internships]
+        rating = np.where(matched, _choice(rng, MATCHED_RATINGS, n), _choice(rng, MISMATCHED_RATINGS, n)).astype(np.int64)
+        would_recommend = np.where(matched, _choice(rng, MATCHED_RECOMMEND, n), _choice(rng, MISMATCHED_RECOMMEND, n))
+        completion_date = np.datetime_as_string(today - rng.integers(0, 181, n).astype('timedelta64[D]'), unit='D')
+        
+        yield pd.DataFrame({
+            'student_id': make_ids('S', start + 1, stop + 1)[students - start],
+            'internship_id': internship_ids[internships],
+            'rating': rating,
+            'feedback_text': np.where(rating >= 4, "Great internship experience!", "Good learning opportunity"),
+            'completion_date': completion_date,
+            'would_recommend': would_recommend
+        })
+
+def _write_chunk(df, path, first):
+    """Write the header with the first chunk, append the rest"""
+    df.to_csv(path, mode='w' if first else 'a', header=first, index=False)
+
+def generate_dataset(output_dir, n_students, n_internships, n_feedback, chunk_size=1_000_000, seed=42):
+    """
+    Generate students.csv, internships.csv and feedback.csv chunk by chunk
+    Memory stays bounded by chunk_size, plus one small domain array per student and internship
+    Args:
+        output_dir: Target directory
+        n_students: Number of students
+        n_internships: Number of internships
+        n_feedback: Number of feedback draws (duplicate pairs are dropped)
+        chunk_size: Rows generated and written per chunk
+        seed: Random seed (same seed and sizes give the same files, apart from completion dates relative to today)
+    Returns:
+        Dictionary with row counts per file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    
+    student_domains = np.empty(n_students, dtype=np.int8)
+    for start, stop in _chunks(n_students, chunk_size):
+        students_df, student_domains[start:stop] = generate_students(rng, start, stop)
+        _write_chunk(students_df, os.path.join(output_dir, 'students.csv'), start == 0)
+        
+    internship_domains = np.empty(n_internships, dtype=np.int8)
+    for start, stop in _chunks(n_internships, chunk_size):
+        internships_df, internship_domains[start:stop] = generate_internships(rng, start, stop)
+        _write_chunk(internships_df, os.path.join(output_dir, 'internships.csv'), start == 0)
+        
+    n_written = 0
+    for feedback_df in generate_feedback(rng, student_domains, internship_domains, n_feedback, chunk_size):
+        _write_chunk(feedback_df, os.path.join(output_dir, 'feedback.csv'), n_written == 0)
+        n_written += len(feedback_df)
+        print(f"  📦 {n_written:,} feedback rows written")
+        
+    return {'students': n_students, 'internships': n_internships, 'feedback': n_written}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a large synthetic dataset")
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--internships', type=int, default=10000)
+    parser.add_argument('--feedback', type=int, default=1000000, help="Feedback draws (duplicate pairs are dropped)")
+    parser.add_argument('--chunk-size', type=int, default=1000000, help="Rows generated and written per chunk")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output-dir', default=config.RAW_DATA_DIR)
+    args = parser.parse_args()
+    
+    print(f"Generating {args.students:,} students, {args.internships:,} internships and {args.feedback:,} feedback draws...")
+    start = time.perf_counter()
+    counts = generate_dataset(
+        args.output_dir, args.students, args.internships, args.feedback, args.chunk_size, args.seed
+    )
+    
+    print("\n" + "="*70)
+    print(f"✅ LARGE DATASET GENERATION COMPLETE in {time.perf_counter() - start:.1f} s")
+    print("="*70)
+    print(f"Students: {counts['students']:,}")
+    print(f"Internships: {counts['internships']:,}")
+    print(f"Feedback: {counts['feedback']:,}")
+    print(f"Saved to: {args.output_dir}")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
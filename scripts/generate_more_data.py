@@ -169,6 +169,7 @@ feedback_texts = [
 recommendations = ["Yes", "Yes", "Yes", "Yes", "Maybe", "No"]
 
 feedback_data = []
+seen_pairs = set()
 
 # Generate realistic feedback (not all students rate all internships)
 for _ in range(NUM_FEEDBACK):
@@ -184,7 +185,8 @@ for _ in range(NUM_FEEDBACK):
     would_recommend = random.choice(recommendations)
     
     # Avoid duplicate student-internship pairs
-    if not any(f['student_id'] == student_id and f['internship_id'] == internship_id for f in feedback_data):
+    if (student_id, internship_id) not in seen_pairs:
+        seen_pairs.add((student_id, internship_id))
         feedback_data.append({
             'student_id': student_id,
             'internship_id': internship_id,
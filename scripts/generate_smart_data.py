@@ -7,9 +7,6 @@ import numpy as np
 import random
 from datetime import datetime, timedelta
 
-random.seed(42)
-np.random.seed(42)
-
 NUM_STUDENTS = 100
 NUM_INTERNSHIPS = 75
 NUM_FEEDBACK = 350
@@ -68,38 +65,15 @@ SKILL_DOMAIN_MAP = {
     }
 }
 
-# ========== Generate Students ==========
-print("Generating students with smart skill matching...")
+# ========== Shared value pools ==========
 
 first_names = ["Aarav", "Vivaan", "Aditya", "Arjun", "Sai", "Diya", "Ananya", "Saanvi", "Rohan", "Riya",
                "Kabir", "Ishaan", "Meera", "Tara", "Laksh", "Prisha", "Karthik", "Navya", "Dev", "Sara"]
 last_names = ["Sharma", "Patel", "Kumar", "Singh", "Reddy", "Nair", "Iyer", "Gupta", "Joshi", "Desai"]
-
-students_data = []
-domain_distribution = list(SKILL_DOMAIN_MAP.keys())
-
-for i in range(1, NUM_STUDENTS + 1):
-    # Assign domain and matching skills
-    domain = random.choice(domain_distribution)
-    skills = random.choice(SKILL_DOMAIN_MAP[domain]['skills'])
-    
-    students_data.append({
-        'student_id': f"S{i:03d}",
-        'name': f"{random.choice(first_names)} {random.choice(last_names)}",
-        'branch': random.choice(["IT", "CSE", "ECE"]),
-        'year': random.choice([3, 4]),
-        'cgpa': round(random.uniform(7.0, 9.5), 1),
-        'skills': skills,
-        'domain_interest': domain,
-        'location_preference': f"{random.choice(['Bangalore', 'Hyderabad', 'Mumbai'])},{random.choice(['Pune', 'Chennai', 'Delhi'])}",
-        'past_internships': random.choice(["Google", "Microsoft", "Amazon", "TCS", "None"])
-    })
-
-students_df = pd.DataFrame(students_data)
-print(f"✅ Generated {len(students_df)} students")
-
-# ========== Generate Internships ==========
-print("Generating internships with matching skill requirements...")
+branches = ["IT", "CSE", "ECE"]
+years = [3, 4]
+preferred_locations = (['Bangalore', 'Hyderabad', 'Mumbai'], ['Pune', 'Chennai', 'Delhi'])
+past_internships = ["Google", "Microsoft", "Amazon", "TCS", "None"]
 
 companies = ["Google", "Microsoft", "Amazon", "Flipkart", "IBM", "NVIDIA", "Adobe", "Salesforce",
              "PhonePe", "Zomato", "Razorpay", "Freshworks", "Myntra", "Swiggy", "Ola", "Paytm"]
@@ -112,75 +86,121 @@ roles_map = {
     'Full Stack Development': ["Full Stack Developer Intern", "Software Engineer Intern", "Web Developer Intern"],
     'Mobile Development': ["Mobile Developer Intern", "Flutter Developer Intern", "Android Developer Intern"]
 }
-
-internships_data = []
-
-for i in range(1, NUM_INTERNSHIPS + 1):
-    domain = random.choice(domain_distribution)
-    required_skills = random.choice(SKILL_DOMAIN_MAP[domain]['internship_skills'])
+internship_locations = ['Bangalore', 'Hyderabad', 'Mumbai', 'Pune', 'Chennai']
+durations = [3, 4, 5, 6]
+stipends = [25000, 30000, 35000, 40000, 45000, 50000, 55000, 60000]
+
+# Rating and recommendation choices, by whether student and internship domains match
+MATCHED_RATINGS = [4, 4, 5, 5, 5]
+MATCHED_RECOMMEND = ['Yes', 'Yes', 'Yes', 'Maybe']
+MISMATCHED_RATINGS = [2, 3, 3, 4]
+MISMATCHED_RECOMMEND = ['Maybe', 'Maybe', 'No', 'Yes']
+
+def main():
+    random.seed(42)
+    np.random.seed(42)
     
-    internships_data.append({
-        'internship_id': f"I{i:03d}",
-        'company': random.choice(companies),
-        'domain': domain,
-        'role': random.choice(roles_map[domain]),
-        'required_skills': required_skills,
-        'location': random.choice(['Bangalore', 'Hyderabad', 'Mumbai', 'Pune', 'Chennai']),
-        'duration_months': random.choice([3, 4, 5, 6]),
-        'stipend': random.choice([25000, 30000, 35000, 40000, 45000, 50000, 55000, 60000]),
-        'rating': round(random.uniform(4.0, 5.0), 1),
-        'total_reviews': random.randint(40, 180),
-        'description': f"Work on cutting-edge {domain} projects"
-    })
-
-internships_df = pd.DataFrame(internships_data)
-print(f"✅ Generated {len(internships_df)} internships")
-
-# ========== Generate SMART Feedback ==========
-print("Generating smart feedback with domain-matched ratings...")
-
-feedback_data = []
-
-for _ in range(NUM_FEEDBACK):
-    student_id = f"S{random.randint(1, NUM_STUDENTS):03d}"
-    internship_id = f"I{random.randint(1, NUM_INTERNSHIPS):03d}"
+    # ========== Generate Students ==========
+    print("Generating students with smart skill matching...")
     
-    # Get student and internship domains
-    student_domain = students_df[students_df['student_id'] == student_id]['domain_interest'].values[0]
-    internship_domain = internships_df[internships_df['internship_id'] == internship_id]['domain'].values[0]
+    students_data = []
+    domain_distribution = list(SKILL_DOMAIN_MAP.keys())
     
-    # If domains match, give higher ratings (smart feedback!)
-    if student_domain == internship_domain:
-        rating = random.choice([4, 4, 5, 5, 5])  # High ratings for matched domains
-        would_recommend = random.choice(['Yes', 'Yes', 'Yes', 'Maybe'])
-    else:
-        rating = random.choice([2, 3, 3, 4])  # Lower ratings for mismatched domains
-        would_recommend = random.choice(['Maybe', 'Maybe', 'No', 'Yes'])
+    for i in range(1, NUM_STUDENTS + 1):
+        # Assign domain and matching skills
+        domain = random.choice(domain_distribution)
+        skills = random.choice(SKILL_DOMAIN_MAP[domain]['skills'])
+        
+        students_data.append({
+            'student_id': f"S{i:03d}",
+            'name': f"{random.choice(first_names)} {random.choice(last_names)}",
+            'branch': random.choice(branches),
+            'year': random.choice(years),
+            'cgpa': round(random.uniform(7.0, 9.5), 1),
+            'skills': skills,
+            'domain_interest': domain,
+            'location_preference': f"{random.choice(preferred_locations[0])},{random.choice(preferred_locations[1])}",
+            'past_internships': random.choice(past_internships)
+        })
+        
+    students_df = pd.DataFrame(students_data)
+    print(f"✅ Generated {len(students_df)} students")
+    
+    # ========== Generate Internships ==========
+    print("Generating internships with matching skill requirements...")
+    
+    internships_data = []
     
-    # Avoid duplicates
-    if not any(f['student_id'] == student_id and f['internship_id'] == internship_id for f in feedback_data):
-        feedback_data.append({
-            'student_id': student_id,
-            'internship_id': internship_id,
-            'rating': rating,
-            'feedback_text': "Great internship experience!" if rating >= 4 else "Good learning opportunity",
-            'completion_date': (datetime.now() - timedelta(days=random.randint(0, 180))).strftime('%Y-%m-%d'),
-            'would_recommend': would_recommend
+    for i in range(1, NUM_INTERNSHIPS + 1):
+        domain = random.choice(domain_distribution)
+        required_skills = random.choice(SKILL_DOMAIN_MAP[domain]['internship_skills'])
+        
+        internships_data.append({
+            'internship_id': f"I{i:03d}",
+            'company': random.choice(companies),
+            'domain': domain,
+            'role': random.choice(roles_map[domain]),
+            'required_skills': required_skills,
+            'location': random.choice(internship_locations),
+            'duration_months': random.choice(durations),
+            'stipend': random.choice(stipends),
+            'rating': round(random.uniform(4.0, 5.0), 1),
+            'total_reviews': random.randint(40, 180),
+            'description': f"Work on cutting-edge {domain} projects"
         })
-
-feedback_df = pd.DataFrame(feedback_data)
-print(f"✅ Generated {len(feedback_df)} smart feedback entries")
-
-# ========== Save ==========
-students_df.to_csv('data/raw/students.csv', index=False)
-internships_df.to_csv('data/raw/internships.csv', index=False)
-feedback_df.to_csv('data/raw/feedback.csv', index=False)
-
-print("\n" + "="*70)
-print("✅ SMART DATASET GENERATION COMPLETE!")
-print("="*70)
-print(f"Students: {len(students_df)} (with domain-matched skills)")
-print(f"Internships: {len(internships_df)} (with matching requirements)")
-print(f"Feedback: {len(feedback_df)} (with intelligent rating patterns)")
-print("\nNow your AI will show MUCH BETTER match scores!")
-print("="*70)
+        
+    internships_df = pd.DataFrame(internships_data)
+    print(f"✅ Generated {len(internships_df)} internships")
+    
+    # ========== Generate SMART Feedback ==========
+    print("Generating smart feedback with domain-matched ratings...")
+    
+    # Domain lookups and seen pairs are hashed, so each feedback row is O(1)
+    student_domains = dict(zip(students_df['student_id'], students_df['domain_interest']))
+    internship_domains = dict(zip(internships_df['internship_id'], internships_df['domain']))
+    seen_pairs = set()
+    feedback_data = []
+    
+    for _ in range(NUM_FEEDBACK):
+        student_id = f"S{random.randint(1, NUM_STUDENTS):03d}"
+        internship_id = f"I{random.randint(1, NUM_INTERNSHIPS):03d}"
+        
+        # If domains match, give higher ratings (smart feedback!)
+        if student_domains[student_id] == internship_domains[internship_id]:
+            rating = random.choice(MATCHED_RATINGS)  # High ratings for matched domains
+            would_recommend = random.choice(MATCHED_RECOMMEND)
+        else:
+            rating = random.choice(MISMATCHED_RATINGS)  # Lower ratings for mismatched domains
+            would_recommend = random.choice(MISMATCHED_RECOMMEND)
+            
+        # Avoid duplicates
+        if (student_id, internship_id) not in seen_pairs:
+            seen_pairs.add((student_id, internship_id))
+            feedback_data.append({
+                'student_id': student_id,
+                'internship_id': internship_id,
+                'rating': rating,
+                'feedback_text': "Great internship experience!" if rating >= 4 else "Good learning opportunity",
+                'completion_date': (datetime.now() - timedelta(days=random.randint(0, 180))).strftime('%Y-%m-%d'),
+                'would_recommend': would_recommend
+            })
+            
+    feedback_df = pd.DataFrame(feedback_data)
+    print(f"✅ Generated {len(feedback_df)} smart feedback entries")
+    
+    # ========== Save ==========
+    students_df.to_csv('data/raw/students.csv', index=False)
+    internships_df.to_csv('data/raw/internships.csv', index=False)
+    feedback_df.to_csv('data/raw/feedback.csv', index=False)
+    
+    print("\n" + "="*70)
+    print("✅ SMART DATASET GENERATION COMPLETE!")
+    print("="*70)
+    print(f"Students: {len(students_df)} (with domain-matched skills)")
+    print(f"Internships: {len(internships_df)} (with matching requirements)")
+    print(f"Feedback: {len(feedback_df)} (with intelligent rating patterns)")
+    print("\nNow your AI will show MUCH BETTER match scores!")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+HTTP recommendation service
+Loads the recommender once and serves GET /recommend?student_id=S001&top_n=5 as JSON
+
+Usage:
+    python server.py --port 8000
+"""
+
+import sys
+sys.path.append('.')
+
+import argparse
+import config
+from utils.metrics import metrics
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recommendations over HTTP")
+    parser.add_argument('--host', default=config.SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVICE_PORT)
+    parser.add_argument('--batch-size', type=int, default=config.BATCH_MAX_SIZE, help="Most requests scored per batch")
+    parser.add_argument('--batch-wait-ms', type=float, default=config.BATCH_MAX_WAIT_MS, help="Batching window in milliseconds")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    parser.add_argument('--metrics', action='store_true', help="Record per-stage latency histograms (GET /metrics)")
+    args = parser.parse_args()
+    
+    if args.metrics:
+        metrics.enable()
+        
+    # Imported after argument parsing, so --help does not wait for scikit-learn
+    from components.service import RecommendationService
+    
+    print("🔄 Loading recommender...")
+    service = RecommendationService(
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.batch_size,
+        max_wait_ms=args.batch_wait_ms,
+        verbose=args.verbose
+    )
+    
+    host, port = service.address
+    print(f"✅ Serving recommendations on http://{host}:{port}/recommend?student_id=S001")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠️ Shutting down")
+        service.server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,57 @@ Unit tests for all models and components
 from .test_models import (
     test_content_based_model,
     test_collaborative_model,
+    test_collaborative_neighbors,
+    test_collaborative_partial_update,
+    test_feedback_pair_stats,
+    test_user_item_matrix,
+    test_column_store,
     test_hybrid_model,
+    test_hybrid_batch_recommendations,
+    test_model_snapshot,
+    test_matrix_factorization,
+    test_item_based_model,
+    test_inverted_index,
+    test_ann_index,
+    test_result_cache,
+    test_large_data_generator,
+    test_streaming_preprocessing,
+    test_streaming_dtype_changes,
+    test_parallel_tfidf,
+    test_recommendation_service,
+    test_stage_metrics,
+    test_lazy_imports,
+    test_internship_catalog,
+    test_topn_table,
+    test_sharded_scoring,
     run_all_tests
 )
 
 __all__ = [
     'test_content_based_model',
     'test_collaborative_model',
+    'test_collaborative_neighbors',
+    'test_collaborative_partial_update',
+    'test_feedback_pair_stats',
+    'test_user_item_matrix',
+    'test_column_store',
     'test_hybrid_model',
+    'test_hybrid_batch_recommendations',
+    'test_model_snapshot',
+    'test_matrix_factorization',
+    'test_item_based_model',
+    'test_inverted_index',
+    'test_ann_index',
+    'test_result_cache',
+    'test_large_data_generator',
+    'test_streaming_preprocessing',
+    'test_streaming_dtype_changes',
+    'test_parallel_tfidf',
+    'test_recommendation_service',
+    'test_stage_metrics',
+    'test_lazy_imports',
+    'test_internship_catalog',
+    'test_topn_table',
+    'test_sharded_scoring',
     'run_all_tests'
 ]
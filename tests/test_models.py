@@ -5,10 +5,36 @@ Unit tests for recommendation models
 import sys
 sys.path.append('.')
 
+import http.client
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import numpy as np
 import pandas as pd
 from models.content_based import ContentBasedModel
 from models.collaborative import CollaborativeFilteringModel
+from models.matrix_factorization import MatrixFactorizationModel
+from models.item_based import ItemBasedModel
 from models.hybrid import HybridModel
+from components.recommender import HybridRecommender, model_fingerprint
+from components.service import MicroBatcher, RecommendationService
+from components.bulk_scoring import ShardedScorer
+from utils.user_item_matrix import UserItemMatrix
+from utils.feedback_stats import FeedbackPairStats
+from utils.result_cache import ResultCache
+from utils.catalog import InternshipCatalog, RECORD_FIELDS
+from utils.topn_table import TopNTable
+from utils.metrics import MetricsRegistry, metrics
+from utils.snapshot import write_json, MANIFEST_FILE, SNAPSHOT_FORMAT_VERSION
+from utils.column_store import save_table, load_table
+from utils.data_loader import load_processed_students, load_processed_internships, load_processed_feedback, load_all_data
+from utils.preprocessing import preprocess_students, preprocess_internships, preprocess_feedback, preprocess_streaming
+from benchmarks import import_time
+from scripts.generate_large_data import generate_dataset, SKILL_DOMAIN_MAP, MATCHED_RATINGS, MISMATCHED_RATINGS
 import config
 
 def test_content_based_model():
@@ -16,7 +42,7 @@ def test_content_based_model():
     print("\n🧪 Testing Content-Based Model...")
     
     # Load data
-    internships = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/internships_processed.csv")
+    internships = load_processed_internships()
     
     # Initialize and train
     model = ContentBasedModel()
@@ -38,7 +64,7 @@ def test_collaborative_model():
     print("\n🧪 Testing Collaborative Filtering Model...")
     
     # Load data
-    user_item_matrix = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/user_item_matrix.csv", index_col=0)
+    user_item_matrix = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
     
     # Initialize and train
     model = CollaborativeFilteringModel()
@@ -54,16 +80,212 @@ def test_collaborative_model():
     
     assert len(recommendations) <= 5, "Should return at most 5 recommendations"
     
+    # Test batch prediction matches per-pair prediction
+    internship_ids = ['I002', 'I014', 'I016', 'UNKNOWN']
+    batch = model.predict_many('S001', internship_ids)
+    
+    assert len(batch) == len(internship_ids), "Should return one prediction per internship"
+    for internship_id, pred in zip(internship_ids, batch):
+        assert abs(pred - model.predict('S001', internship_id)) < 1e-9, "Batch prediction should match predict()"
+    assert len(model.predict_many('S001')) == user_item_matrix.shape[1], "All-items mode should score every internship"
+    
     print("✅ Collaborative filtering model test passed!")
     return True
 
+def test_collaborative_neighbors():
+    """Test top-k neighbour mode of collaborative filtering model"""
+    print("\n🧪 Testing Collaborative Top-K Neighbours...")
+    
+    user_item_matrix = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
+    n_users = user_item_matrix.shape[0]
+    
+    full_model = CollaborativeFilteringModel()
+    full_model.fit(user_item_matrix)
+    
+    # Small blocks exercise the blockwise build
+    knn_model = CollaborativeFilteringModel(n_neighbors=10, block_size=16)
+    knn_model.fit(user_item_matrix)
+    
+    assert knn_model.user_similarity is None, "Neighbour mode should not keep the full similarity matrix"
+    assert knn_model.neighbor_indices.shape == (n_users, 10), "Should keep k neighbours per student"
+    assert 1.0 <= knn_model.predict('S001', 'I002') <= 5.0, "Prediction should be in valid rating range"
+    
+    # With k >= number of students, predictions should match the full matrix
+    all_model = CollaborativeFilteringModel(n_neighbors=n_users, block_size=16)
+    all_model.fit(user_item_matrix)
+    
+    for student_id in ['S001', 'S002', 'S010']:
+        diff = abs(all_model.predict_many(student_id) - full_model.predict_many(student_id)).max()
+        assert diff < 1e-5, "k >= users should reproduce full-matrix predictions"
+        
+    print("✅ Collaborative top-k neighbours test passed!")
+    return True
+
+def test_collaborative_partial_update():
+    """Test incremental collaborative updates match a full refit"""
+    print("\n🧪 Testing Collaborative Incremental Updates...")
+    
+    feedback = load_processed_feedback(['student_id', 'internship_id', 'rating'])
+    
+    # New ratings: existing pair, new student and new internship
+    new_feedback = pd.DataFrame({
+        'student_id': ['S001', 'S999', 'S002'],
+        'internship_id': ['I002', 'I001', 'I999'],
+        'rating': [4, 5, 3]
+    })
+    all_feedback = pd.concat([feedback, new_feedback], ignore_index=True)
+    
+    for n_neighbors in [None, 5]:
+        model = CollaborativeFilteringModel(n_neighbors=n_neighbors)
+        model.fit(UserItemMatrix.from_feedback(feedback))
+        
+        # Two rounds, so the second one patches an already patched model
+        for batch in [new_feedback[:2], new_feedback[2:]]:
+            model.partial_update(
+                batch['student_id'].tolist(),
+                batch['internship_id'].tolist(),
+                batch['rating'].tolist()
+            )
+            
+        refit = CollaborativeFilteringModel(n_neighbors=n_neighbors)
+        refit.fit(UserItemMatrix.from_feedback(all_feedback))
+        
+        student_ids = refit.user_item_matrix.user_ids
+        internship_ids = refit.user_item_matrix.item_ids
+        diff = abs(model.predict_batch(student_ids, internship_ids) - refit.predict_batch(student_ids, internship_ids)).max()
+        
+        assert model.user_item_matrix.shape == refit.user_item_matrix.shape, "New students/internships should be added"
+        assert diff < 1e-9, "Incremental update should match a full refit"
+        
+    print("✅ Collaborative incremental update test passed!")
+    return True
+
+def test_feedback_pair_stats():
+    """Test running pair statistics catch up from the tail of the feedback log"""
+    print("\n🧪 Testing Feedback Pair Statistics...")
+    
+    header = "student_id,internship_id,rating,feedback_text,completion_date,would_recommend\n"
+    lines = [
+        'S001,I001,4,"Good, hands-on",2024-01-01,Yes\n',
+        'S001,I001,2,Too short,2024-01-02,No\n',
+        'S002,I001,,No rating,2024-01-03,Maybe\n',
+        'S002,I002,5,Great,2024-01-04,Yes\n'
+    ]
+    
+    def expected(log_lines):
+        rows = pd.read_csv(io.StringIO(header + ''.join(log_lines)))
+        return rows.groupby(['student_id', 'internship_id'])['rating'].mean()
+        
+    def check(stats, log_lines):
+        means = expected(log_lines)
+        student_ids, internship_ids = zip(*means.index)
+        assert np.allclose(stats.means(student_ids, internship_ids), means.to_numpy(), equal_nan=True), \
+            "Pair means should match a groupby over the log"
+            
+    tmp = tempfile.mkdtemp()
+    try:
+        log_path = os.path.join(tmp, 'feedback.csv')
+        checkpoint_path = os.path.join(tmp, 'feedback_pair_stats.npz')
+        with open(log_path, 'w') as f:
+            f.write(header + ''.join(lines))
+            
+        stats = FeedbackPairStats(log_path, checkpoint_path)
+        assert stats.rebuild() == 4, "Rebuild should read the whole log"
+        assert os.path.exists(checkpoint_path), "Rebuild should save a checkpoint"
+        check(stats, lines)
+        assert np.isnan(stats.means(['S002', 'S404'], ['I001', 'I001'])).all(), "Unrated pairs should have no mean"
+        
+        # A new process only reads the lines appended after the checkpoint, not a line still being written
+        appended = ['S001,I001,3,Again,2024-02-01,Yes\n', 'S003,I002,1,New student,2024-02-02,No\n']
+        with open(log_path, 'a') as f:
+            f.write(''.join(appended) + 'S004,I001,5,Half')
+            
+        stats = FeedbackPairStats(log_path, checkpoint_path)
+        assert stats.catch_up() == 2, "Only the appended complete lines should be read"
+        check(stats, lines + appended)
+        
+        with open(log_path, 'a') as f:
+            f.write(' written,2024-02-03,Yes\n')
+        assert stats.catch_up() == 1, "The finished line should be read on the next catch up"
+        check(stats, lines + appended + ['S004,I001,5,Half written,2024-02-03,Yes\n'])
+        
+        # A log rewritten instead of appended to no longer matches the checkpoint
+        rewritten = ['S009,I009,2,Rewritten log with other rows,2024-03-01,No\n'] * 3
+        with open(log_path, 'w') as f:
+            f.write(header + ''.join(rewritten))
+            
+        stats = FeedbackPairStats(log_path, checkpoint_path)
+        assert stats.catch_up() == 3, "A rewritten log should be read from the start"
+        check(stats, rewritten)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+        
+    print("✅ Feedback pair statistics test passed!")
+    return True
+
+def test_user_item_matrix():
+    """Test sparse user-item matrix construction and round trip"""
+    print("\n🧪 Testing Sparse User-Item Matrix...")
+    
+    # Build from feedback rows
+    feedback = load_processed_feedback()
+    matrix = UserItemMatrix.from_feedback(feedback)
+    
+    # Should match the dense pivot table it replaces
+    pivot = feedback.pivot_table(index='student_id', columns='internship_id', values='rating', fill_value=0)
+    assert matrix.shape == pivot.shape, "Shape should match pivot table"
+    assert (matrix.to_dataframe().values == pivot.values).all(), "Ratings should match pivot table"
+    assert matrix.nnz == (pivot.values != 0).sum(), "Only rated pairs should be stored"
+    
+    # Ids map to row/column positions
+    assert matrix.user_index['S001'] == pivot.index.get_loc('S001'), "Student id should map to its row"
+    
+    # Saved file should load back identically
+    saved = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
+    assert (saved.matrix != matrix.matrix).nnz == 0, "Saved matrix should match rebuilt matrix"
+    assert list(saved.item_ids) == list(matrix.item_ids), "Saved item ids should match"
+    
+    print("✅ Sparse user-item matrix test passed!")
+    return True
+
+def test_column_store():
+    """Test binary columnar table round trip and column projection"""
+    print("\n🧪 Testing Columnar Table Store...")
+    
+    df = pd.DataFrame({
+        'internship_id': ['I001', 'I002', 'I003'],
+        'company': ['Google', None, 'Google'],
+        'stipend': [25000, 30000, 45000],
+        'rating': [4.5, 3.9, 4.1]
+    })
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        table_dir = os.path.join(tmp_dir, 'internships')
+        save_table(df, table_dir)
+        
+        # Full round trip keeps values and numeric dtypes
+        loaded = load_table(table_dir)
+        assert list(loaded.columns) == list(df.columns), "Columns should be preserved"
+        assert loaded['stipend'].dtype == df['stipend'].dtype, "Numeric dtypes should be preserved"
+        assert (loaded['rating'].to_numpy() == df['rating'].to_numpy()).all(), "Numeric values should match"
+        assert loaded['company'].iloc[0] == 'Google' and pd.isna(loaded['company'].iloc[1]), "Strings and missing values should round trip"
+        
+        # Projection only returns the requested columns
+        projected = load_table(table_dir, ['internship_id', 'rating'])
+        assert list(projected.columns) == ['internship_id', 'rating'], "Should load only requested columns"
+        
+        del loaded, projected
+        
+    print("✅ Columnar table store test passed!")
+    return True
+
 def test_hybrid_model():
     """Test hybrid recommendation model"""
     print("\n🧪 Testing Hybrid Model...")
     
     # Load data
-    internships = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/internships_processed.csv")
-    user_item_matrix = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/user_item_matrix.csv", index_col=0)
+    internships = load_processed_internships()
+    user_item_matrix = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
     
     # Initialize models
     content_model = ContentBasedModel()
@@ -78,12 +300,895 @@ def test_hybrid_model():
     test_profile = "Python Machine Learning SQL"
     recommendations = hybrid_model.get_recommendations('S001', test_profile, internships, top_n=5)
     
+    # A catalog other than the fitted one is rejected rather than silently ignored
+    try:
+        hybrid_model.get_recommendations('S001', test_profile, internships.iloc[::-1], top_n=5)
+        assert False, "A different internship catalog should raise ValueError"
+    except ValueError:
+        pass
+        
     assert len(recommendations) == 5, "Should return 5 recommendations"
     assert 'hybrid_score' in recommendations.columns, "Should have hybrid_score column"
     
     print("✅ Hybrid model test passed!")
     return True
 
+def test_hybrid_batch_recommendations():
+    """Test batch hybrid recommendations match single-student recommendations"""
+    print("\n🧪 Testing Hybrid Batch Recommendations...")
+    
+    # Load data
+    internships = load_processed_internships()
+    students = load_processed_students()
+    user_item_matrix = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
+    
+    # Initialize models
+    content_model = ContentBasedModel()
+    content_model.fit(internships)
+    
+    collab_model = CollaborativeFilteringModel()
+    collab_model.fit(user_item_matrix)
+    
+    hybrid_model = HybridModel(content_model, collab_model)
+    
+    # Small chunks exercise the chunked product
+    student_ids = students['student_id'].to_numpy()[:12]
+    profiles = students['skill_profile'].to_numpy()[:12]
+    positions, scores = hybrid_model.get_batch_recommendations(student_ids, profiles, top_n=5, chunk_size=5)
+    
+    assert positions.shape == (12, 5), "Should return 5 recommendations per student"
+    
+    for i, (student_id, profile) in enumerate(zip(student_ids, profiles)):
+        single = hybrid_model.get_recommendations(student_id, profile, internships, top_n=5)
+        assert list(internships['internship_id'].iloc[positions[i]]) == list(single['internship_id']), "Batch should match single recommendations"
+        assert abs(scores[i] - single['hybrid_score'].to_numpy()).max() < 1e-9, "Batch scores should match single scores"
+        
+    # Full-catalog pool ranks every internship by hybrid score
+    full_model = HybridModel(content_model, collab_model, candidate_pool='full')
+    full_positions, full_scores = full_model.get_batch_recommendations(student_ids, profiles, top_n=5)
+    
+    content_scores, collaborative_scores = full_model.score_catalog(student_ids, content_model.transform_profiles(profiles))
+    all_scores = config.CONTENT_WEIGHT * content_scores + config.COLLABORATIVE_WEIGHT * collaborative_scores
+    
+    assert (full_scores == -np.sort(-all_scores, axis=1)[:, :5]).all(), "Full pool should return the best hybrid scores"
+    assert (full_scores >= scores - 1e-12).all(), "Full pool should never score below the content pool"
+    
+    # The content pool is shortlisted through the configured backend; only 'exact' scores the whole catalog
+    backend = config.CONTENT_BACKEND
+    try:
+        config.CONTENT_BACKEND = 'exact'
+        exact_positions, exact_scores = hybrid_model.get_batch_recommendations(student_ids, profiles, top_n=5)
+        
+        def brute_force(student_vectors):
+            raise AssertionError("Brute-force content scoring should only serve the 'exact' backend")
+        content_model.get_similarity_scores = brute_force
+        
+        config.CONTENT_BACKEND = 'inverted'
+        inverted_positions, inverted_scores = hybrid_model.get_batch_recommendations(student_ids, profiles, top_n=5)
+        assert (inverted_positions == exact_positions).all(), "Inverted backend should rank like brute force"
+        assert abs(inverted_scores - exact_scores).max() < 1e-12, "Inverted backend should score like brute force"
+        
+        # Probing every cluster makes the IVF shortlist exact
+        config.CONTENT_BACKEND = 'ann'
+        content_model.build_ann_index(n_clusters=6, n_probe=6)
+        ann_positions, ann_scores = hybrid_model.get_batch_recommendations(student_ids, profiles, top_n=5)
+        assert abs(ann_scores - exact_scores).max() < 1e-9, "Full-probe IVF backend should score like brute force"
+    finally:
+        config.CONTENT_BACKEND = backend
+        del content_model.get_similarity_scores
+        
+    print("✅ Hybrid batch recommendations test passed!")
+    return True
+
+def test_model_snapshot():
+    """Test saving and memory-mapped loading of fitted models"""
+    print("\n🧪 Testing Model Snapshots...")
+    
+    # Load data
+    internships = load_processed_internships()
+    user_item_matrix = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
+    
+    content_model = ContentBasedModel()
+    content_model.fit(internships)
+    
+    collab_model = CollaborativeFilteringModel(n_neighbors=10)
+    collab_model.fit(user_item_matrix)
+    
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        content_model.save(os.path.join(snapshot_dir, 'content'))
+        collab_model.save(os.path.join(snapshot_dir, 'collaborative'))
+        
+        loaded_content = ContentBasedModel.load(os.path.join(snapshot_dir, 'content'), internships)
+        loaded_collab = CollaborativeFilteringModel.load(os.path.join(snapshot_dir, 'collaborative'))
+        
+        # Loaded models should score exactly like the fitted ones
+        test_profile = "Python Machine Learning Data Science SQL"
+        original = content_model.get_recommendations(test_profile, top_n=5)
+        restored = loaded_content.get_recommendations(test_profile, top_n=5)
+        
+        assert list(original['internship_id']) == list(restored['internship_id']), "Content recommendations should match"
+        assert (original['content_score'].to_numpy() == restored['content_score'].to_numpy()).all(), "Content scores should match"
+        assert (collab_model.predict_many('S001') == loaded_collab.predict_many('S001')).all(), "Collaborative predictions should match"
+        assert loaded_collab.n_neighbors == 10, "Neighbour settings should be restored"
+        
+        del loaded_content, loaded_collab
+        
+        # A new snapshot manifest changes the fingerprint shared app instances are keyed by
+        before = model_fingerprint(snapshot_dir)
+        write_json(snapshot_dir, MANIFEST_FILE, {'format_version': SNAPSHOT_FORMAT_VERSION})
+        assert model_fingerprint(snapshot_dir) != before, "New snapshot should change the fingerprint"
+        assert model_fingerprint(snapshot_dir) == model_fingerprint(snapshot_dir), "Fingerprint should be stable"
+        
+        # So do the settings that change rankings without a new snapshot
+        for name, value in (('NUM_NEIGHBORS', 7), ('CONTENT_WEIGHT', 0.9), ('COLLABORATIVE_WEIGHT', 0.1),
+                            ('CANDIDATE_POOL', 'full'), ('CANDIDATE_POOL_SIZE', 3), ('CONTENT_BACKEND', 'exact')):
+            before = model_fingerprint(snapshot_dir)
+            original = getattr(config, name)
+            setattr(config, name, value)
+            try:
+                assert model_fingerprint(snapshot_dir) != before, f"{name} should change the fingerprint"
+            finally:
+                setattr(config, name, original)
+                
+    print("✅ Model snapshot test passed!")
+    return True
+
+def test_matrix_factorization():
+    """Test ALS matrix factorization collaborative engine"""
+    print("\n🧪 Testing Matrix Factorization Model...")
+    
+    user_item_matrix = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
+    
+    model = MatrixFactorizationModel(n_factors=8, n_iter=10)
+    model.fit(user_item_matrix)
+    
+    assert model.user_factors.dtype == np.float32, "Factors should be float32"
+    assert model.item_factors.shape == (user_item_matrix.shape[1], 8), "Should have one factor row per internship"
+    
+    # Observed ratings should be fitted reasonably well
+    ratings = user_item_matrix.matrix.tocoo()
+    fitted = model.predict_batch(user_item_matrix.user_ids)[ratings.row, ratings.col]
+    rmse = np.sqrt(np.mean((fitted - ratings.data) ** 2))
+    assert rmse < 1.0, "Training error should be low"
+    
+    # Single, per-student and batch predictions agree
+    student_id = user_item_matrix.user_ids[0]
+    internship_id = user_item_matrix.item_ids[0]
+    assert abs(model.predict(student_id, internship_id) - model.predict_many(student_id)[0]) < 1e-6, "predict_many should match predict"
+    assert model.predict('UNKNOWN', internship_id) == 3.0, "Unknown students should get the neutral rating"
+    
+    recommendations = model.get_top_recommendations(student_id, top_n=5)
+    rated = set(user_item_matrix.item_ids[user_item_matrix.matrix[0].indices])
+    assert len(recommendations) == 5, "Should return 5 recommendations"
+    assert not rated & {internship_id for internship_id, _ in recommendations}, "Should skip rated internships"
+    
+    # Warm-start refit starts from the previous factors
+    warm = MatrixFactorizationModel(n_factors=8, n_iter=10)
+    warm.fit(user_item_matrix)
+    warm.fit(user_item_matrix, n_iter=1)
+    warm_fitted = warm.predict_batch(user_item_matrix.user_ids)[ratings.row, ratings.col]
+    assert np.sqrt(np.mean((warm_fitted - ratings.data) ** 2)) < rmse + 0.05, "Warm refit should keep the fit"
+    
+    # New feedback for a new student
+    model.partial_update(['S_NEW'], [internship_id], [5])
+    assert model.user_factors.shape[0] == user_item_matrix.shape[0], "New student should get factors"
+    assert model.predict('S_NEW', internship_id) > 3.0, "New student's rating should be reflected"
+    
+    # Usable inside the hybrid model
+    internships = load_processed_internships()
+    content_model = ContentBasedModel()
+    content_model.fit(internships)
+    
+    hybrid_model = HybridModel(content_model, model)
+    recommendations = hybrid_model.get_recommendations(student_id, "Python Machine Learning", internships, top_n=5)
+    assert len(recommendations) == 5, "Hybrid model should accept the factorization engine"
+    
+    # Snapshot round trip
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        model.save(snapshot_dir)
+        loaded = MatrixFactorizationModel.load(snapshot_dir)
+        
+        assert (loaded.predict_batch(user_item_matrix.user_ids) == model.predict_batch(user_item_matrix.user_ids)).all(), "Loaded model should predict identically"
+        
+    print("✅ Matrix factorization test passed!")
+    return True
+
+def test_item_based_model():
+    """Test item-item collaborative engine"""
+    print("\n🧪 Testing Item-Based Model...")
+    
+    user_item_matrix = UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
+    n_items = user_item_matrix.shape[1]
+    
+    model = ItemBasedModel(n_neighbors=10)
+    model.fit(user_item_matrix)
+    
+    similarity = model.item_similarity_t
+    assert similarity.shape == (n_items, n_items), "Similarity table should be internships x internships"
+    assert (np.diff(similarity.T.tocsr().indptr) <= 10).all(), "Each internship should keep at most k neighbours"
+    assert (similarity.diagonal() == 0).all(), "Internships should not be their own neighbours"
+    
+    # With k >= internships the table equals the full item-item cosine matrix
+    full_model = ItemBasedModel(n_neighbors=n_items)
+    full_model.fit(user_item_matrix)
+    
+    normalized = user_item_matrix.matrix.toarray()
+    normalized = normalized / (np.linalg.norm(normalized, axis=0) + 1e-12)
+    expected = normalized.T @ normalized
+    np.fill_diagonal(expected, 0)
+    assert np.abs(full_model.item_similarity_t.toarray() - expected).max() < 1e-6, "Should match full cosine similarity"
+    
+    # Single, per-student and rating-vector predictions agree
+    student_id = user_item_matrix.user_ids[3]
+    predictions = model.predict_many(student_id)
+    for internship_id in user_item_matrix.item_ids[:10]:
+        position = user_item_matrix.item_index[internship_id]
+        assert abs(model.predict(student_id, internship_id) - predictions[position]) < 1e-6, "predict_many should match predict"
+        
+    ratings = user_item_matrix.matrix[3]
+    scored = model.score_ratings(user_item_matrix.item_ids[ratings.indices], ratings.data)
+    assert np.allclose(scored, predictions), "Scoring from ratings should match the stored student"
+    
+    # A new student gets scores after a single rating, without a refit
+    model.partial_update(['S_NEW'], [user_item_matrix.item_ids[0]], [5])
+    assert len(model.get_top_recommendations('S_NEW', top_n=3)) == 3, "New student should get recommendations"
+    
+    # Snapshot round trip
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        model.save(snapshot_dir)
+        loaded = ItemBasedModel.load(snapshot_dir)
+        
+        assert (loaded.predict_many(student_id) == model.predict_many(student_id)).all(), "Loaded model should predict identically"
+        
+    print("✅ Item-based model test passed!")
+    return True
+
+def test_inverted_index():
+    """Test inverted index retrieval matches brute-force cosine similarity exactly"""
+    print("\n🧪 Testing Inverted Skill Index...")
+    
+    internships = load_processed_internships()
+    students = load_processed_students()
+    
+    model = ContentBasedModel()
+    model.fit(internships)
+    
+    # Same internships, order and scores as the brute-force backend, ties and padding included
+    for profile in list(students['skill_profile']) + ["zzz"]:
+        for top_n in (1, 5, 10):
+            expected = model.get_recommendations(profile, top_n=top_n, backend='exact')
+            actual = model.get_recommendations(profile, top_n=top_n, backend='inverted')
+            
+            assert actual['internship_id'].tolist() == expected['internship_id'].tolist(), \
+                "Index should return the brute-force top internships"
+            assert (actual['content_score'].to_numpy() == expected['content_score'].to_numpy()).all(), \
+                "Index scores should equal brute-force scores"
+                
+    # Profiles with no known skill still get top_n (zero score) results
+    positions, scores = model.inverted_index.top_n(model.transform_profiles(["zzz"]), top_n=5)
+    assert len(positions) == 5 and (scores == 0).all(), "Unmatched profile should be padded with zero scores"
+    
+    print("✅ Inverted index test passed!")
+    return True
+
+def test_ann_index():
+    """Test approximate IVF retrieval backend"""
+    print("\n🧪 Testing ANN Index...")
+    
+    internships = load_processed_internships()
+    students = load_processed_students()
+    
+    model = ContentBasedModel()
+    model.fit(internships)
+    ann_index = model.build_ann_index(n_clusters=6, n_probe=2)
+    
+    profile = students['skill_profile'].iloc[0]
+    recommendations = model.get_recommendations(profile, top_n=5, backend='ann')
+    
+    assert len(recommendations) == 5, "Should return 5 recommendations"
+    assert recommendations['content_score'].is_monotonic_decreasing, "Should be sorted best first"
+    
+    # Probing every cluster is exact search
+    report = ann_index.recall_report(model.transform_profiles(students['skill_profile']), top_n=5, n_probes=(1, 6))
+    assert report[0]['recall'] <= report[1]['recall'], "More probes should not lower recall"
+    assert report[1]['recall'] == 1.0, "Probing all clusters should have perfect recall"
+    
+    exact = model.get_recommendations(profile, top_n=5, backend='exact')
+    full = ann_index.top_n(model.transform_profiles([profile]), top_n=5, n_probe=6)[1]
+    assert abs(full - exact['content_score'].to_numpy()).max() < 1e-9, "Full probe scores should match exact scores"
+    
+    # Index survives a snapshot round trip
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        model.save(snapshot_dir)
+        loaded = ContentBasedModel.load(snapshot_dir, internships)
+        restored = loaded.get_recommendations(profile, top_n=5, backend='ann')
+        
+        assert list(restored['internship_id']) == list(recommendations['internship_id']), "Loaded index should match"
+        assert not loaded.ann_index.document_vectors.data.flags.writeable, "Index vectors should be read-only memory maps, not a copy"
+        
+    print("✅ ANN index test passed!")
+    return True
+
+def test_result_cache():
+    """Test LRU/TTL result cache and recommender invalidation"""
+    print("\n🧪 Testing Result Cache...")
+    
+    cache = ResultCache(max_size=2)
+    cache.put(('S001', 5, 0), ['a'])
+    cache.put(('S002', 5, 0), ['b'])
+    
+    assert cache.get(('S001', 5, 0)) == ['a'], "Should hit cached result"
+    
+    # S002 is now least recently used and gets evicted
+    cache.put(('S003', 5, 0), ['c'])
+    assert cache.get(('S002', 5, 0)) is None, "Least recently used entry should be evicted"
+    assert len(cache) == 2, "Cache should stay bounded"
+    
+    assert cache.invalidate('S001') == 1, "Should drop the student's entries"
+    assert cache.get(('S001', 5, 0)) is None, "Invalidated entry should miss"
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2, "Should count hits and misses"
+    
+    # Expired entries miss
+    expiring = ResultCache(ttl_seconds=0)
+    expiring.put(('S001', 5, 0), ['a'])
+    assert expiring.get(('S001', 5, 0)) is None, "Expired entry should miss"
+    
+    # Concurrent readers and writers (shared recommender across sessions)
+    shared = ResultCache(max_size=50)
+    def hammer(offset):
+        for i in range(2000):
+            key = (f"S{(i + offset) % 80:03d}", 5, 0)
+            shared.put(key, [i])
+            shared.get(key)
+            if i % 100 == 0:
+                shared.invalidate(key[0])
+    threads = [threading.Thread(target=hammer, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(shared) <= 50 and len(shared) == sum(len(keys) for keys in shared._keys_by_student.values()), "Cache should stay consistent under threads"
+    
+    # Recommender serves repeated requests from the cache
+    recommender = HybridRecommender()
+    first = recommender.recommend('S001', top_n=5)
+    hits = recommender.result_cache.hits
+    
+    second = recommender.recommend('S001', top_n=5)
+    assert recommender.result_cache.hits == hits + 1, "Repeated request should hit the cache"
+    assert first == second, "Cached result should match computed result"
+    
+    second[0]['match_score'] = -1
+    assert recommender.recommend('S001', top_n=5) == first, "Callers should not modify cached results"
+    
+    recommender.invalidate_student('S001')
+    assert ('S001', 5, recommender.model_version) not in recommender.result_cache._entries, "Student entries should be dropped"
+    
+    recommender.recommend('S001', top_n=5)
+    recommender.models_updated()
+    assert len(recommender.result_cache) == 0, "Model update should drop all cached results"
+    assert recommender.recommend('S001', top_n=5) == first, "Recomputed result should match"
+    
+    print("✅ Result cache test passed!")
+    return True
+
+def test_large_data_generator():
+    """Test vectorized, chunked synthetic data generator"""
+    print("\n🧪 Testing Large Data Generator...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        counts = generate_dataset(os.path.join(tmp_dir, 'a'), 500, 40, 5000, chunk_size=1000, seed=7)
+        generate_dataset(os.path.join(tmp_dir, 'b'), 500, 40, 5000, chunk_size=1000, seed=7)
+        
+        for name in ('students.csv', 'internships.csv', 'feedback.csv'):
+            with open(os.path.join(tmp_dir, 'a', name)) as a, open(os.path.join(tmp_dir, 'b', name)) as b:
+                assert a.read() == b.read(), "Same seed should give the same files"
+                
+        students = pd.read_csv(os.path.join(tmp_dir, 'a', 'students.csv'))
+        internships = pd.read_csv(os.path.join(tmp_dir, 'a', 'internships.csv'))
+        feedback = pd.read_csv(os.path.join(tmp_dir, 'a', 'feedback.csv'))
+        
+    assert len(students) == 500 and students['student_id'].is_unique, "Should write every student once across chunks"
+    assert len(internships) == 40 and internships['internship_id'].iloc[0] == 'I001', "Should write every internship"
+    assert len(feedback) == counts['feedback'] and 4000 < len(feedback) <= 5000, "Should drop only duplicate pairs"
+    assert not feedback.duplicated(['student_id', 'internship_id']).any(), "Feedback pairs should be unique"
+    
+    # Skills come from the student's domain, ratings follow the domain match
+    assert all(
+        skills in SKILL_DOMAIN_MAP[domain]['skills']
+        for skills, domain in zip(students['skills'], students['domain_interest'])
+    ), "Skills should match the student's domain"
+    
+    merged = feedback.merge(students, on='student_id').merge(internships, on='internship_id', suffixes=('', '_internship'))
+    matched = merged['domain_interest'] == merged['domain']
+    assert merged.loc[matched, 'rating'].isin(MATCHED_RATINGS).all(), "Matched domains should rate high"
+    assert merged.loc[~matched, 'rating'].isin(MISMATCHED_RATINGS).all(), "Mismatched domains should rate lower"
+    
+    print("✅ Large data generator test passed!")
+    return True
+
+def test_streaming_preprocessing():
+    """Test chunked (serial and parallel) preprocessing matches the in-memory pipeline"""
+    print("\n🧪 Testing Streaming Preprocessing...")
+    
+    students, internships, feedback = load_all_data()
+    paths = ('STUDENTS_TABLE', 'INTERNSHIPS_TABLE', 'FEEDBACK_TABLE', 'USER_ITEM_MATRIX_FILE')
+    original = {name: getattr(config, name) for name in paths}
+    
+    # Chunks go through the same transforms, min-max statistics come from a first pass
+    expected_feedback = preprocess_feedback(feedback)
+    expected = {
+        'students_table': preprocess_students(students),
+        'internships_table': preprocess_internships(internships),
+        'feedback_table': expected_feedback
+    }
+    expected_matrix = UserItemMatrix.from_feedback(expected_feedback)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, df in expected.items():
+            save_table(df, os.path.join(tmp_dir, 'expected', name))
+            
+        for workers in (1, 2):
+            streamed = os.path.join(tmp_dir, f"streamed_{workers}")
+            for name in paths:
+                setattr(config, name, os.path.join(streamed, name.lower()))
+            try:
+                counts = preprocess_streaming(chunk_size=37, workers=workers)
+            finally:
+                for name, value in original.items():
+                    setattr(config, name, value)
+                    
+            assert counts['feedback'] == len(expected_feedback), "Should count processed feedback rows"
+            
+            for name in expected:
+                for file_name in os.listdir(os.path.join(tmp_dir, 'expected', name)):
+                    with open(os.path.join(tmp_dir, 'expected', name, file_name), 'rb') as a, open(os.path.join(streamed, name, file_name), 'rb') as b:
+                        assert a.read() == b.read(), f"{workers} worker(s): {name}/{file_name} should match the in-memory output"
+                        
+            streamed_matrix = UserItemMatrix.load(os.path.join(streamed, 'user_item_matrix_file.npz'))
+            assert (streamed_matrix.matrix != expected_matrix.matrix).nnz == 0, "Streamed user-item matrix should match"
+            assert list(streamed_matrix.user_ids) == list(expected_matrix.user_ids), "Student order should match"
+            
+    # Duplicate pairs across chunks are averaged like from_feedback
+    duplicated = pd.concat([feedback, feedback.head(50).assign(rating=1)])
+    chunked = UserItemMatrix.from_feedback_chunks(duplicated.iloc[i:i + 40] for i in range(0, len(duplicated), 40))
+    assert abs(chunked.matrix - UserItemMatrix.from_feedback(duplicated).matrix).max() == 0, "Chunked build should average duplicates"
+    
+    print("✅ Streaming preprocessing test passed!")
+    return True
+
+def test_streaming_dtype_changes():
+    """Test streaming preprocessing when a column's dtype only widens in a later chunk"""
+    print("\n🧪 Testing Streaming Preprocessing With Widening Columns...")
+    
+    students, internships, feedback = load_all_data()
+    
+    # A blank rating after the first chunk turns the int column into floats; an all-missing
+    # first chunk of past_internships is parsed as float before the text shows up
+    feedback = feedback.astype({'rating': object})
+    feedback.loc[150, 'rating'] = None
+    students = students.astype({'past_internships': object})
+    students.loc[:49, 'past_internships'] = None
+    
+    paths = (
+        'STUDENTS_FILE', 'INTERNSHIPS_FILE', 'FEEDBACK_FILE',
+        'STUDENTS_TABLE', 'INTERNSHIPS_TABLE', 'FEEDBACK_TABLE', 'USER_ITEM_MATRIX_FILE'
+    )
+    original = {name: getattr(config, name) for name in paths}
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw = {'STUDENTS_FILE': students, 'INTERNSHIPS_FILE': internships, 'FEEDBACK_FILE': feedback}
+        for name, df in raw.items():
+            df.to_csv(os.path.join(tmp_dir, f"{name.lower()}.csv"), index=False)
+            
+        # In-memory reference from the same raw files
+        students_raw, internships_raw, feedback_raw = (
+            pd.read_csv(os.path.join(tmp_dir, f"{name.lower()}.csv")) for name in raw
+        )
+        assert students_raw['past_internships'].dtype != np.float64 and feedback_raw['rating'].dtype == np.float64
+        expected = {
+            'students_table': preprocess_students(students_raw),
+            'internships_table': preprocess_internships(internships_raw),
+            'feedback_table': preprocess_feedback(feedback_raw)
+        }
+        for name, df in expected.items():
+            save_table(df, os.path.join(tmp_dir, 'expected', name))
+            
+        # Partitioned runs write through the same table writer; with one-row chunks
+        # every column whose first value is missing starts out as float
+        for chunk_size, workers in ((50, 1), (50, 2), (1, 1)):
+            streamed = os.path.join(tmp_dir, f"streamed_{chunk_size}_{workers}")
+            for name in paths:
+                value = os.path.join(tmp_dir, f"{name.lower()}.csv") if name in raw else os.path.join(streamed, name.lower())
+                setattr(config, name, value)
+            try:
+                preprocess_streaming(chunk_size=chunk_size, workers=workers)
+            finally:
+                for name, value in original.items():
+                    setattr(config, name, value)
+                    
+            for name in expected:
+                for file_name in os.listdir(os.path.join(tmp_dir, 'expected', name)):
+                    with open(os.path.join(tmp_dir, 'expected', name, file_name), 'rb') as a, open(os.path.join(streamed, name, file_name), 'rb') as b:
+                        assert a.read() == b.read(), f"Chunks of {chunk_size}, {workers} worker(s): {name}/{file_name} should match the in-memory output"
+                        
+    print("✅ Streaming preprocessing with widening columns test passed!")
+    return True
+
+def test_parallel_tfidf():
+    """Test parallel TF-IDF fit is identical to the serial fit"""
+    print("\n🧪 Testing Parallel TF-IDF...")
+    
+    internships = load_processed_internships()
+    
+    serial = ContentBasedModel()
+    serial.fit(internships, workers=1)
+    parallel = ContentBasedModel()
+    parallel.fit(internships, workers=2)
+    
+    assert parallel.vectorizer.vocabulary_ == serial.vectorizer.vocabulary_, "Vocabulary should match"
+    assert np.array_equal(parallel.vectorizer.idf_, serial.vectorizer.idf_), "IDF weights should match"
+    for name in ('data', 'indices', 'indptr'):
+        assert np.array_equal(getattr(parallel.internship_vectors, name), getattr(serial.internship_vectors, name)), f"TF-IDF {name} should match"
+        
+    profile = "Python Machine Learning Data Science SQL"
+    expected = serial.get_recommendations(profile, top_n=5)['internship_id'].tolist()
+    assert parallel.get_recommendations(profile, top_n=5)['internship_id'].tolist() == expected, "Recommendations should match"
+    
+    print("✅ Parallel TF-IDF test passed!")
+    return True
+
+def test_recommendation_service():
+    """Test micro-batched recommendations and the HTTP service"""
+    print("\n🧪 Testing Recommendation Service...")
+    
+    recommender = HybridRecommender()
+    student_ids = recommender.students_df['student_id'].tolist()[:20]
+    expected = {student_id: recommender.recommend(student_id, top_n=5) for student_id in student_ids}
+    recommender.models_updated()
+    
+    # Queued requests are scored together
+    batcher = MicroBatcher(recommender, max_batch_size=64, max_wait_ms=200)
+    futures = [batcher.submit(student_id, 5) for student_id in student_ids + student_ids[:5]]
+    batcher.start()
+    results = [future.result(timeout=10) for future in futures]
+    
+    assert batcher.stats()['batches'] == 1, "Queued requests should be merged into one batch"
+    
+    # A lone request at an idle service does not wait out the batching window
+    start = time.perf_counter()
+    batcher.recommend(student_ids[0], 5, timeout=10)
+    assert time.perf_counter() - start < 0.2, "Lone request should be dispatched immediately"
+    batcher.stop()
+    for student_id, result in zip(student_ids + student_ids[:5], results):
+        assert result == expected[student_id], "Batched result should match recommend()"
+        
+    results[0][0]['match_score'] = -1
+    assert results[20] == expected[student_ids[0]], "Each request should get its own result"
+    
+    # A failure while handing out results fails the batch but not the worker
+    class MissingResults:
+        def recommend_many(self, student_ids, top_n=5, use_cache=False):
+            return {}
+            
+    failing = MicroBatcher(MissingResults(), max_wait_ms=1)
+    failing.start()
+    for _ in range(2):
+        try:
+            failing.recommend(student_ids[0], 5, timeout=5)
+            assert False, "Missing results should fail the request"
+        except KeyError:
+            pass
+    failing.stop()
+    
+    # HTTP round trip on a free port
+    service = RecommendationService(recommender, port=0)
+    service.start()
+    host, port = service.address
+    try:
+        connection = http.client.HTTPConnection(host, port)
+        connection.request('GET', f"/recommend?student_id={student_ids[0]}&top_n=5")
+        response = connection.getresponse()
+        assert response.status == 200, "Known student should return 200"
+        assert json.loads(response.read())['recommendations'] == expected[student_ids[0]], "HTTP result should match recommend()"
+        
+        # Same keep-alive connection
+        connection.request('GET', "/recommend?student_id=UNKNOWN")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 404, "Unknown student should return 404"
+        
+        connection.request('GET', f"/recommend?student_id={student_ids[0]}&top_n=abc")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 400, "Invalid top_n should return 400"
+        
+        connection.request('GET', "/stats")
+        assert json.loads(connection.getresponse().read())['batching']['requests'] >= 1, "Stats should count requests"
+        
+        # Requests nobody scores time out with 503 instead of blocking forever
+        service.batcher.stop()
+        service.request_timeout = 0.05
+        connection.request('GET', f"/recommend?student_id={student_ids[1]}&top_n=5")
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 503, "Timed out request should return 503"
+        connection.close()
+    finally:
+        service.shutdown()
+        
+    print("✅ Recommendation service test passed!")
+    return True
+
+def test_stage_metrics():
+    """Test stage latency histograms and their exporters"""
+    print("\n🧪 Testing Stage Metrics...")
+    
+    registry = MetricsRegistry(enabled=True, buckets=(0.001, 0.01))
+    for seconds in (0.0005, 0.002, 0.003, 5.0):
+        registry.observe('stage', seconds)
+        
+    histogram = registry.histogram('stage')
+    assert histogram.counts == [1, 2, 1] and histogram.count == 4, "Durations should land in their buckets"
+    assert histogram.quantile(0.5) == 0.01 and histogram.quantile(1.0) == float('inf'), "Quantiles should be bucket bounds"
+    
+    text = registry.to_prometheus()
+    assert 'recommender_stage_seconds_bucket{stage="stage",le="0.01"} 3' in text, "Buckets should be cumulative"
+    assert 'recommender_stage_seconds_count{stage="stage"} 4' in text, "Should export the count"
+    
+    with tempfile.TemporaryDirectory() as directory:
+        prom_path, json_path = registry.export(directory)
+        with open(json_path) as f:
+            assert json.load(f)['stage']['count'] == 4, "JSON dump should hold the summary"
+        assert os.path.exists(prom_path), "Should write the Prometheus snapshot"
+        
+    # Disabled registries hand out the shared no-op timer and record nothing
+    registry.disable()
+    with registry.timer('other'):
+        pass
+    assert 'other' not in registry.histograms, "Disabled registry should not record"
+    
+    # Instrumented recommend path records every stage while enabled
+    recommender = HybridRecommender()
+    recommender.result_cache.max_size = 0
+    metrics.reset()
+    metrics.enable()
+    try:
+        recommender.recommend('S001', top_n=5)
+    finally:
+        metrics.disable()
+        
+    for stage in ('recommender.recommend', 'recommender.format', 'hybrid.select_top_n',
+                  'content.transform', 'content.similarity'):
+        assert metrics.histograms[stage].count == 1, f"Stage {stage} should be timed once"
+        
+    recommender.recommend('S001', top_n=5)
+    assert metrics.histograms['recommender.recommend'].count == 1, "Disabled metrics should not record"
+    metrics.reset()
+    
+    print("✅ Stage metrics test passed!")
+    return True
+
+def test_lazy_imports():
+    """Test packages and light entry points do not load heavy dependencies at import"""
+    print("\n🧪 Testing Lazy Imports...")
+    
+    with open(os.path.join('benchmarks', 'import_budget.json')) as f:
+        budget = json.load(f)
+        
+    # Only the deterministic part of the budget; wall-time limits are checked by benchmarks/import_time.py
+    entries = ['utils', 'models', 'components', 'utils.data_loader', 'server.py', 'scripts/01_run_preprocessing.py']
+    results = {entry: import_time.measure(entry, repeat=1) for entry in entries}
+    failures = import_time.check(results, {entry: {'forbid': budget[entry]['forbid']} for entry in entries})
+    assert not failures, f"Heavy imports at startup: {failures}"
+    
+    # Lazy package attributes still resolve to the real objects
+    import utils, components
+    from utils.id_index import IdIndex
+    assert utils.IdIndex is IdIndex, "Lazy export should resolve to the submodule's object"
+    assert components.HybridRecommender is HybridRecommender, "Lazy export should resolve to the submodule's object"
+    assert 'load_students_data' in dir(utils), "Lazy exports should be listed by dir()"
+    
+    print("✅ Lazy imports test passed!")
+    return True
+
+def test_internship_catalog():
+    """Test array-backed internship catalog and Recommendation records"""
+    print("\n🧪 Testing Internship Catalog...")
+    
+    internships = load_processed_internships()
+    catalog = InternshipCatalog(internships)
+    assert len(catalog) == len(internships), "Catalog should hold every internship"
+    
+    # Records match the DataFrame rows
+    positions = np.array([[3, 0, 7], [1, 1, 2]])
+    scores = np.array([[0.9, 0.5, 0.1], [0.8, 0.7, 0.6]])
+    records = catalog.records(positions, scores)
+    
+    for i in range(2):
+        for j in range(3):
+            row = internships.iloc[positions[i, j]]
+            expected = {field: row[field] for field in RECORD_FIELDS[:-1]}
+            expected['match_score'] = scores[i, j]
+            assert records[i][j] == expected, "Record should match the DataFrame row"
+            assert dict(records[i][j]) == expected, "Record should convert to a dictionary"
+            
+    # Dictionary-like access, copies and JSON conversion
+    record = records[0][0]
+    assert record['company'] == internships['company'].iloc[3], "Should index by field name"
+    assert list(record) == list(RECORD_FIELDS), "Should iterate fields in result order"
+    assert not hasattr(record, '__dict__'), "Records should not carry a per-instance dict"
+    copy = record.copy()
+    copy['match_score'] = -1
+    assert record['match_score'] == 0.9, "Copies should be independent"
+    assert json.loads(json.dumps(record.to_dict()))['internship_id'] == record['internship_id'], "Should serialize via to_dict"
+    try:
+        record['copy']
+        assert False, "Unknown fields should raise KeyError"
+    except KeyError:
+        pass
+        
+    # Catalog arrays are read-only; missing text decodes to None
+    try:
+        catalog._columns['rating'][0][0] = 0
+        assert False, "Catalog arrays should be read-only"
+    except ValueError:
+        pass
+        
+    sparse_catalog = InternshipCatalog(pd.DataFrame({'company': ['A', None, 'B'], 'rating': [4.0, 4.5, 5.0]}), ['company', 'rating'])
+    assert sparse_catalog.take('company', np.array([1, 2])).tolist() == [None, 'B'], "Missing values should decode to None"
+    assert sparse_catalog.row(2) == {'company': 'B', 'rating': 5.0}, "Row should hold Python values"
+    
+    print("✅ Internship catalog test passed!")
+    return True
+
+def test_topn_table():
+    """Test the precomputed top-N table and its fallback to live scoring"""
+    print("\n🧪 Testing Top-N Table...")
+    
+    recommender = HybridRecommender(use_topn_table=False)
+    student_ids = recommender.students_df['student_id'].tolist()
+    live = recommender.recommend_many(student_ids, 5)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        table_dir = os.path.join(tmp, 'topn')
+        assert recommender.build_topn_table(table_dir, top_n=10, chunk_size=7) == len(student_ids), "Should write every student"
+        assert not os.path.exists(f"{table_dir}.tmp"), "Temporary directory should be swapped into place"
+        
+        table = TopNTable(table_dir)
+        assert len(table) == len(student_ids) and table.top_n == 10, "Table should hold top-10 for every student"
+        assert table.manifest['model_fingerprint'] == json.loads(model_fingerprint()), "Manifest should record the models"
+        
+        # Served results equal live results, without scoring
+        assert recommender.load_topn_table(table_dir), "Table should load"
+        served = recommender.recommend_many(student_ids, 5)
+        for student_id in student_ids:
+            assert served[student_id] == live[student_id], "Table results should equal live results"
+            assert [r['internship_id'] for r in served[student_id]] == [r['internship_id'] for r in live[student_id]], "Order should be preserved"
+        assert recommender.topn_table.hits == len(student_ids), "Every student should be served from the table"
+        
+        recommender.result_cache.clear()
+        assert recommender.recommend(student_ids[0], 3) == live[student_ids[0]][:3], "recommend() should serve from the table"
+        
+        # More results than stored, unknown and stale students are scored live
+        misses = recommender.topn_table.misses
+        assert recommender._lookup_topn(student_ids[:2], 11) == {}, "top_n above the table width should score live"
+        assert recommender.recommend_many(['UNKNOWN'], 5) == {'UNKNOWN': []}, "Unknown students should fall back"
+        assert recommender.topn_table.misses == misses + 1, "Unknown students should count as misses"
+        
+        recommender.invalidate_student(student_ids[1])
+        assert student_ids[1] not in recommender._lookup_topn(student_ids[:2], 5), "Invalidated students should score live"
+        assert student_ids[0] in recommender._lookup_topn(student_ids[:2], 5), "Other students should still be served"
+        
+        # A student whose row now holds someone else (added after the build) is not served
+        rows = np.array([0, 1, len(student_ids)])
+        found, _, _ = table.lookup(rows, [student_ids[0], 'S_NEW', 'S_NEWER'], 5)
+        assert found.tolist() == [True, False, False], "Rows should be checked against the stored student IDs"
+        
+        # A rebuilt table is picked up without a restart
+        check_seconds = config.TOPN_TABLE_CHECK_SECONDS
+        config.TOPN_TABLE_CHECK_SECONDS = 0
+        try:
+            old_table = recommender.topn_table
+            recommender.build_topn_table(table_dir, top_n=10)
+            assert recommender.recommend_many(student_ids[:3], 5) == {s: live[s] for s in student_ids[:3]}, "Rebuilt table should serve"
+            assert recommender.topn_table is not old_table, "Rebuilt table should be loaded"
+            
+            # Model updates drop the table until the next build
+            recommender.models_updated()
+            assert recommender.topn_table is None, "Model updates should drop the table"
+            recommender.recommend_many(student_ids[:3], 5)
+            assert recommender.topn_table is None, "The dropped build should not be loaded again"
+            
+            recommender.build_topn_table(table_dir, top_n=10)
+            recommender.recommend_many(student_ids[:3], 5)
+            assert recommender.topn_table is not None, "The next build should be loaded"
+        finally:
+            config.TOPN_TABLE_CHECK_SECONDS = check_seconds
+            
+        # A table built before the models changed is rejected
+        snapshot_dir = config.SNAPSHOT_DIR
+        config.SNAPSHOT_DIR = os.path.join(tmp, 'snapshot')
+        try:
+            recommender.save_snapshot()
+            recommender.build_topn_table(table_dir, top_n=10)
+            assert recommender.load_topn_table(table_dir), "Table of the current models should load"
+            
+            # Matrix factorization settings make the snapshot stale like the neighborhood ones
+            assert recommender._snapshot_is_current(config.SNAPSHOT_DIR), "Fresh snapshot should be current"
+            for name in ('MF_FACTORS', 'MF_REGULARIZATION', 'MF_ITERATIONS'):
+                value = getattr(config, name)
+                setattr(config, name, value * 2)
+                try:
+                    assert not recommender._snapshot_is_current(config.SNAPSHOT_DIR), f"{name} change should make the snapshot stale"
+                finally:
+                    setattr(config, name, value)
+                    
+            recommender.save_snapshot()
+            assert not recommender.load_topn_table(table_dir), "Table of an older snapshot should be rejected"
+            assert recommender.topn_table is None, "Stale table should not be served"
+        finally:
+            config.SNAPSHOT_DIR = snapshot_dir
+            
+        # A table for another internship catalog is rejected
+        recommender.internships_df = recommender.internships_df.iloc[::-1]
+        assert not recommender.load_topn_table(table_dir), "Catalog mismatch should be rejected"
+        
+        assert TopNTable.open(os.path.join(tmp, 'missing')) is None, "Missing table should open as None"
+        
+    print("✅ Top-N table test passed!")
+    return True
+
+def test_sharded_scoring():
+    """Test multi-process sharded bulk scoring and resuming from shard checkpoints"""
+    print("\n🧪 Testing Sharded Bulk Scoring...")
+    
+    recommender = HybridRecommender(use_topn_table=False)
+    n_students = len(recommender.students_df)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        serial_dir = os.path.join(tmp, 'serial')
+        table_dir = os.path.join(tmp, 'topn')
+        snapshot_dir = os.path.join(tmp, 'snapshot')
+        recommender.build_topn_table(serial_dir, top_n=10)
+        serial = TopNTable(serial_dir)
+        
+        def assert_same_table(message):
+            table = TopNTable(table_dir)
+            assert np.array_equal(table.student_ids, serial.student_ids), message
+            assert np.array_equal(table.positions, serial.positions), message
+            assert np.array_equal(table.scores, serial.scores), message
+            
+        # Workers load the snapshot (written first, since the temporary one does not exist yet)
+        scorer = ShardedScorer(recommender, table_dir, top_n=10, shard_size=30, workers=2, chunk_size=7, snapshot_dir=snapshot_dir)
+        assert [stop - start for _, start, stop in scorer.plan()] == [30, 30, 30, n_students - 90], "Students should be split into shards"
+        
+        summary = scorer.run(keep_checkpoints=True)
+        assert summary['shards_scored'] == 4 and summary['shards_skipped'] == 0, "Every shard should be scored"
+        assert os.path.exists(os.path.join(snapshot_dir, MANIFEST_FILE)), "Snapshot should be saved for the workers"
+        assert_same_table("Sharded table should equal the serial build")
+        
+        # An interrupted run resumes with the missing shards only
+        shutil.rmtree(scorer._shard_dir(2))
+        shutil.rmtree(table_dir)
+        assert scorer.completed_shards() == {0, 1, 3}, "Completed shards should be found on disk"
+        
+        summary = ShardedScorer(recommender, table_dir, top_n=10, shard_size=30, workers=1, snapshot_dir=snapshot_dir).run()
+        assert summary['shards_scored'] == 1 and summary['shards_skipped'] == 3, "Only the missing shard should be scored"
+        assert_same_table("Resumed table should equal the serial build")
+        assert not os.path.exists(scorer.checkpoint_dir), "Checkpoints should be removed after the table is written"
+        
+        # Checkpoints of other settings are not reused
+        scorer.run(keep_checkpoints=True)
+        summary = ShardedScorer(recommender, table_dir, top_n=10, shard_size=50, workers=1, snapshot_dir=snapshot_dir).run()
+        assert summary['shards_scored'] == 2 and summary['shards_skipped'] == 0, "Other shard settings should start over"
+        assert_same_table("Rebuilt table should equal the serial build")
+        
+        del serial
+        
+    print("✅ Sharded scoring test passed!")
+    return True
+
 def run_all_tests():
     """Run all unit tests"""
     print("=" * 70)
@@ -93,7 +1198,29 @@ def run_all_tests():
     try:
         test_content_based_model()
         test_collaborative_model()
+        test_collaborative_neighbors()
+        test_collaborative_partial_update()
+        test_feedback_pair_stats()
+        test_user_item_matrix()
+        test_column_store()
         test_hybrid_model()
+        test_hybrid_batch_recommendations()
+        test_model_snapshot()
+        test_matrix_factorization()
+        test_item_based_model()
+        test_inverted_index()
+        test_ann_index()
+        test_result_cache()
+        test_large_data_generator()
+        test_streaming_preprocessing()
+        test_streaming_dtype_changes()
+        test_parallel_tfidf()
+        test_recommendation_service()
+        test_stage_metrics()
+        test_lazy_imports()
+        test_internship_catalog()
+        test_topn_table()
+        test_sharded_scoring()
         
         print("\n" + "=" * 70)
         print("✅ ALL TESTS PASSED!")
@@ -1,35 +1,48 @@
 """
 Utils Package
 Helper functions for data processing and utilities
+Names are imported from their submodules on first use (see lazy.py), so importing one helper
+does not load scikit-learn, scipy or pandas for the others
 """
 
-from .data_loader import load_students_data, load_internships_data, load_feedback_data, load_all_data
-from .preprocessing import (
-    preprocess_students,
-    preprocess_internships,
-    preprocess_feedback,
-    create_user_item_matrix,
-    save_processed_data
-)
-from .similarity import (
-    calculate_cosine_similarity,
-    get_top_n_similar_items,
-    calculate_weighted_score,
-    normalize_scores
-)
+from .lazy import lazy_exports
 
-__all__ = [
-    'load_students_data',
-    'load_internships_data',
-    'load_feedback_data',
-    'load_all_data',
-    'preprocess_students',
-    'preprocess_internships',
-    'preprocess_feedback',
-    'create_user_item_matrix',
-    'save_processed_data',
-    'calculate_cosine_similarity',
-    'get_top_n_similar_items',
-    'calculate_weighted_score',
-    'normalize_scores'
-]
+# Public name -> submodule defining it
+_EXPORTS = {
+    'load_students_data': 'data_loader',
+    'load_internships_data': 'data_loader',
+    'load_feedback_data': 'data_loader',
+    'load_all_data': 'data_loader',
+    'load_processed_students': 'data_loader',
+    'load_processed_internships': 'data_loader',
+    'load_processed_feedback': 'data_loader',
+    'load_user_item_matrix': 'data_loader',
+    'preprocess_students': 'preprocessing',
+    'preprocess_internships': 'preprocessing',
+    'preprocess_feedback': 'preprocessing',
+    'create_user_item_matrix': 'preprocessing',
+    'save_processed_data': 'preprocessing',
+    'preprocess_streaming': 'preprocessing',
+    'IdIndex': 'id_index',
+    'InternshipCatalog': 'catalog',
+    'Recommendation': 'catalog',
+    'UserItemMatrix': 'user_item_matrix',
+    'ResultCache': 'result_cache',
+    'TopNTable': 'topn_table',
+    'TopNTableWriter': 'topn_table',
+    'MetricsRegistry': 'metrics',
+    'Histogram': 'metrics',
+    'timed': 'metrics',
+    'timed_call': 'metrics',
+    'InvertedIndex': 'inverted_index',
+    'IVFIndex': 'ann_index',
+    'calculate_cosine_similarity': 'similarity',
+    'get_top_n_similar_items': 'similarity',
+    'calculate_weighted_score': 'similarity',
+    'normalize_scores': 'similarity',
+    'top_n_positions': 'similarity'
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,225 @@
+"""
+Approximate nearest-neighbour index over TF-IDF vectors
+IVF-style: documents are clustered with spherical k-means, and a query only scores the
+documents in its n_probe closest clusters
+"""
+
+import time
+import numpy as np
+from scipy import sparse
+from .snapshot import save_array, load_array, save_csr, load_csr
+
+def _l2_normalize(vectors):
+    """
+    Scale rows to unit L2 norm (all-zero rows stay zero)
+    Args:
+        vectors: Sparse matrix or dense 2-D array
+    Returns:
+        Normalized sparse CSR matrix or dense array (same kind as the input)
+    """
+    if sparse.issparse(vectors):
+        vectors = sparse.csr_matrix(vectors, dtype=np.float64)
+        norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    else:
+        vectors = np.asarray(vectors, dtype=np.float64)
+        norms = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+        
+    norms[norms == 0] = 1.0
+    
+    if sparse.issparse(vectors):
+        return sparse.csr_matrix(sparse.diags(1 / norms) @ vectors)
+    return vectors / norms[:, None]
+
+class IVFIndex:
+    def __init__(self, n_clusters=None, n_probe=8, n_iter=10, sample_size=50000, random_state=42):
+        """
+        Initialize IVF index
+        Args:
+            n_clusters: Number of clusters (None = sqrt of the number of documents)
+            n_probe: Clusters scored per query; higher means better recall and slower queries
+            n_iter: k-means iterations
+            sample_size: Documents sampled to train the centroids
+            random_state: Seed for sampling and centroid initialization
+        """
+        self.n_clusters = n_clusters
+        self.n_probe = n_probe
+        self.n_iter = n_iter
+        self.sample_size = sample_size
+        self.random_state = random_state
+        
+        self.centroids = None
+        self.document_vectors = None
+        self.cluster_offsets = None
+        self.cluster_documents = None
+        
+    def fit(self, document_vectors, chunk_size=65536):
+        """
+        Cluster documents and build the inverted lists
+        Args:
+            document_vectors: Sparse matrix of shape (n_documents, n_terms)
+            chunk_size: Documents assigned to clusters per matrix product
+        """
+        vectors = sparse.csr_matrix(_l2_normalize(document_vectors))
+        n_documents = vectors.shape[0]
+        n_clusters = self.n_clusters or int(np.ceil(np.sqrt(n_documents)))
+        n_clusters = max(1, min(n_clusters, n_documents))
+        
+        rng = np.random.default_rng(self.random_state)
+        
+        # Train centroids on a sample
+        sample_rows = rng.choice(n_documents, min(self.sample_size, n_documents), replace=False)
+        sample = vectors[np.sort(sample_rows)]
+        
+        centroids = sample[rng.choice(sample.shape[0], n_clusters, replace=False)].toarray()
+        
+        for _ in range(self.n_iter):
+            labels = np.asarray((sample @ centroids.T).argmax(axis=1)).ravel()
+            
+            # Sum of member vectors per cluster, re-normalized (spherical k-means)
+            membership = sparse.csr_matrix(
+                (np.ones(len(labels)), (labels, np.arange(len(labels)))),
+                shape=(n_clusters, sample.shape[0])
+            )
+            sums = np.asarray((membership @ sample).todense())
+            
+            # Empty clusters keep their previous centroid
+            non_empty = np.asarray(membership.sum(axis=1)).ravel() > 0
+            centroids[non_empty] = _l2_normalize(sums[non_empty])
+            
+        # Assign every document to its closest centroid
+        labels = np.empty(n_documents, dtype=np.int64)
+        for start in range(0, n_documents, chunk_size):
+            labels[start:start + chunk_size] = np.asarray(
+                (vectors[start:start + chunk_size] @ centroids.T).argmax(axis=1)
+            ).ravel()
+            
+        # Cluster c's documents are cluster_documents[cluster_offsets[c]:cluster_offsets[c + 1]]
+        self.cluster_documents = np.argsort(labels, kind='stable')
+        self.cluster_offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_clusters))])
+        
+        self.centroids = centroids
+        self.document_vectors = vectors
+        self.n_clusters = n_clusters
+        
+        return self
+        
+    def score(self, query_vector, n_probe=None):
+        """
+        Cosine similarity of one query against the documents in its closest clusters
+        Args:
+            query_vector: Sparse matrix with one row (same vocabulary as the documents)
+            n_probe: Clusters to score (defaults to self.n_probe)
+        Returns:
+            (documents, scores): sorted positions of the probed documents and their exact scores
+        """
+        n_probe = min(n_probe or self.n_probe, self.n_clusters)
+        query = sparse.csr_matrix(_l2_normalize(query_vector))
+        
+        # Closest clusters to the query (only the centroid columns of the query's terms are read)
+        centroid_scores = self.centroids[:, query.indices] @ query.data
+        if n_probe < self.n_clusters:
+            probed = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        else:
+            probed = np.arange(self.n_clusters)
+            
+        # Exact cosine scores for the documents in those clusters only
+        candidates = np.sort(np.concatenate([
+            self.cluster_documents[self.cluster_offsets[c]:self.cluster_offsets[c + 1]] for c in probed
+        ]))
+        scores = np.asarray((self.document_vectors[candidates] @ query.T).todense()).ravel()
+        
+        return candidates, scores
+        
+    def top_n(self, query_vector, top_n=5, n_probe=None):
+        """
+        Approximate top N documents for one query
+        Args:
+            query_vector: Sparse matrix with one row (same vocabulary as the documents)
+            top_n: Number of documents to return
+            n_probe: Clusters to score (defaults to self.n_probe)
+        Returns:
+            (positions, scores) numpy arrays, best first; fewer than top_n if the probed clusters are small
+        """
+        candidates, scores = self.score(query_vector, n_probe)
+        
+        # Ties are broken by lower document position
+        n = min(top_n, len(candidates))
+        if n < len(candidates):
+            selected = np.sort(np.argpartition(-scores, n - 1)[:n])
+        else:
+            selected = np.arange(len(candidates))
+        selected = selected[np.argsort(-scores[selected], kind='stable')]
+        
+        return candidates[selected], scores[selected]
+        
+    def recall_report(self, query_vectors, top_n=5, n_probes=(1, 2, 4, 8, 16)):
+        """
+        Compare approximate results against exact brute-force search
+        Args:
+            query_vectors: Sparse matrix with one query per row
+            top_n: Number of documents per query
+            n_probes: n_probe values to evaluate
+        Returns:
+            List of dictionaries with n_probe, recall (fraction of the exact top N found)
+            and mean milliseconds per query for the index and for exact search
+        """
+        queries = _l2_normalize(query_vectors)
+        n_queries = queries.shape[0]
+        
+        # Exact top N by brute force
+        start = time.perf_counter()
+        exact = []
+        for i in range(n_queries):
+            scores = np.asarray((self.document_vectors @ queries[i].T).todense()).ravel()
+            exact.append(set(np.argsort(-scores, kind='stable')[:top_n].tolist()))
+        exact_ms = (time.perf_counter() - start) * 1000 / max(n_queries, 1)
+        
+        report = []
+        for n_probe in n_probes:
+            start = time.perf_counter()
+            found = 0
+            for i in range(n_queries):
+                positions, _ = self.top_n(queries[i], top_n, n_probe)
+                found += len(exact[i].intersection(positions.tolist()))
+            ann_ms = (time.perf_counter() - start) * 1000 / max(n_queries, 1)
+            
+            report.append({
+                'n_probe': min(n_probe, self.n_clusters),
+                'recall': found / max(sum(len(e) for e in exact), 1),
+                'ann_ms_per_query': ann_ms,
+                'exact_ms_per_query': exact_ms
+            })
+            
+        return report
+        
+    def save(self, directory):
+        """
+        Save centroids, inverted lists and the normalized document vectors
+        Args:
+            directory: Snapshot directory for this index
+        """
+        save_array(directory, 'centroids', self.centroids)
+        save_array(directory, 'cluster_offsets', self.cluster_offsets)
+        save_array(directory, 'cluster_documents', self.cluster_documents)
+        save_array(directory, 'n_probe', np.array([self.n_probe]))
+        save_csr(directory, 'document_vectors', self.document_vectors)
+        
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Load an index saved with save()
+        Args:
+            directory: Snapshot directory for this index
+            mmap_mode: numpy memory-map mode for the large arrays (document vectors included)
+        Returns:
+            Fitted IVFIndex
+        """
+        centroids = load_array(directory, 'centroids', mmap_mode)
+        
+        index = cls(n_clusters=centroids.shape[0], n_probe=int(load_array(directory, 'n_probe', None)[0]))
+        index.centroids = centroids
+        index.cluster_offsets = load_array(directory, 'cluster_offsets', mmap_mode)
+        index.cluster_documents = load_array(directory, 'cluster_documents', mmap_mode)
+        index.document_vectors = load_csr(directory, 'document_vectors', mmap_mode)
+        
+        return index
@@ -0,0 +1,145 @@
+"""
+Immutable array-backed internship catalog for the serving hot path
+Each field is a read-only numpy array addressed by row position: numeric columns keep their
+dtype, text columns are dictionary-encoded (int32 codes into an array of distinct values)
+"""
+
+from collections.abc import Mapping
+from operator import attrgetter
+import numpy as np
+import pandas as pd
+
+# Fields of a recommendation, in the order results have always been returned
+RECORD_FIELDS = ('internship_id', 'company', 'role', 'domain', 'location',
+                 'duration_months', 'stipend', 'rating', 'total_reviews', 'match_score')
+
+_RECORD_FIELD_SET = frozenset(RECORD_FIELDS)
+_record_values = attrgetter(*RECORD_FIELDS)
+
+class Recommendation(Mapping):
+    """
+    One recommended internship
+    A __slots__ record (no per-instance dict) that reads like the dictionaries recommend() used to
+    return: rec['company'], dict(rec), rec == {...} and rec['match_score'] = x all work
+    """
+    __slots__ = RECORD_FIELDS
+    
+    def __init__(self, internship_id, company, role, domain, location,
+                 duration_months, stipend, rating, total_reviews, match_score):
+        self.internship_id = internship_id
+        self.company = company
+        self.role = role
+        self.domain = domain
+        self.location = location
+        self.duration_months = duration_months
+        self.stipend = stipend
+        self.rating = rating
+        self.total_reviews = total_reviews
+        self.match_score = match_score
+        
+    def __getitem__(self, field):
+        if field not in _RECORD_FIELD_SET:
+            raise KeyError(field)
+        return getattr(self, field)
+        
+    def __setitem__(self, field, value):
+        if field not in _RECORD_FIELD_SET:
+            raise KeyError(field)
+        setattr(self, field, value)
+        
+    def __iter__(self):
+        return iter(RECORD_FIELDS)
+        
+    def __len__(self):
+        return len(RECORD_FIELDS)
+        
+    def __eq__(self, other):
+        if isinstance(other, Recommendation):
+            return _record_values(self) == _record_values(other)
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+        
+    __hash__ = None  # Mutable, like the dictionaries it replaces
+    
+    def copy(self):
+        """Independent copy (cached results are handed out as copies)"""
+        return Recommendation(*_record_values(self))
+        
+    def to_dict(self):
+        """Plain dictionary (e.g. for JSON)"""
+        return dict(zip(RECORD_FIELDS, _record_values(self)))
+        
+    def __repr__(self):
+        return f"Recommendation({self.to_dict()!r})"
+
+class InternshipCatalog:
+    def __init__(self, internships_df, fields=RECORD_FIELDS[:-1]):
+        """
+        Build the catalog once from the processed internships
+        Args:
+            internships_df: DataFrame with one row per internship
+            fields: Columns to keep (default: the fields of a Recommendation)
+        """
+        self.fields = tuple(fields)
+        self.n_rows = len(internships_df)
+        
+        # field -> (values or codes, categories or None)
+        self._columns = {}
+        
+        for field in self.fields:
+            series = internships_df[field]
+            
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                values = np.array(series.to_numpy())
+                categories = None
+            else:
+                codes, uniques = pd.factorize(series)
+                values = codes.astype(np.int32)
+                
+                # Missing values get code -1, which picks the trailing None
+                categories = np.array(uniques.tolist() + [None], dtype=object)
+                categories.flags.writeable = False
+                
+            values.flags.writeable = False
+            self._columns[field] = (values, categories)
+            
+    def __len__(self):
+        return self.n_rows
+        
+    def take(self, field, positions):
+        """
+        Values of one field at the given row positions
+        Args:
+            field: Field name
+            positions: Integer array of row positions (any shape)
+        Returns:
+            numpy array of the same shape as positions
+        """
+        values, categories = self._columns[field]
+        
+        if categories is None:
+            return values[positions]
+        return categories[values[positions]]
+        
+    def row(self, position):
+        """One catalog row as a dictionary of Python values"""
+        return {field: self.take(field, [position]).tolist()[0] for field in self.fields}
+        
+    def records(self, positions, scores):
+        """
+        Recommendation records for selected rows (the catalog must hold every Recommendation field)
+        Args:
+            positions: Array of row positions, shape (n_students, top_n)
+            scores: Array of match scores, same shape
+        Returns:
+            List (one per student) of lists of Recommendation
+        """
+        n_students, top_n = positions.shape
+        flat_positions = positions.ravel()
+        
+        # One gather per field, then one constructor call per record
+        columns = [self.take(field, flat_positions).tolist() for field in RECORD_FIELDS[:-1]]
+        records = list(map(Recommendation, *columns, scores.ravel().tolist()))
+        
+        return [records[i * top_n:(i + 1) * top_n] for i in range(n_students)]
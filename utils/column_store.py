@@ -0,0 +1,242 @@
+"""
+Binary columnar table store
+Each column is a typed .npy file: numeric columns are memory-mapped on load,
+string columns are dictionary-encoded as integer codes + categories
+"""
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from .snapshot import save_array, load_array, write_json, read_json, swap_directory
+
+SCHEMA_FILE = 'schema.json'
+
+def _is_numeric(series):
+    """Numeric and bool columns are stored as raw arrays, everything else dictionary-encoded"""
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+
+class TableWriter:
+    def __init__(self, directory):
+        """
+        Write a table chunk by chunk, in the same format as save_table
+        Numeric chunks are appended to raw files and string columns are dictionary-encoded against
+        categories in first-appearance order, so memory is bounded by the chunk size plus the
+        distinct strings seen. A column whose dtype widens in a later chunk (ints that gain a
+        missing value, an all-missing numeric chunk followed by text) is upcast in place, so the
+        table ends up with the dtype pandas infers for the whole file
+        Args:
+            directory: Target table directory (replaced atomically on close)
+        """
+        self.directory = directory
+        self.tmp_dir = f"{directory}.tmp"
+        self.columns = None
+        self.n_rows = 0
+        
+        # Per string column: category -> code map and categories in code order
+        self._categories = {}
+        self._dtypes = {}
+        self._files = {}
+        
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        os.makedirs(self.tmp_dir)
+        
+    def _open(self, df):
+        """Take the columns and their initial dtypes from the first chunk"""
+        self.columns = []
+        for name in df.columns:
+            series = df[name]
+            
+            if _is_numeric(series):
+                self.columns.append({'name': name, 'kind': 'numeric', 'dtype': str(series.dtype)})
+                self._dtypes[name] = series.to_numpy().dtype
+                self._files[name] = open(os.path.join(self.tmp_dir, f"{name}.part"), 'wb')
+            else:
+                self.columns.append({'name': name, 'kind': 'string'})
+                self._categories[name] = ({}, [])
+                self._files[name] = open(os.path.join(self.tmp_dir, f"{name}.codes.part"), 'wb')
+                
+    def _rewrite_part(self, name, convert):
+        """
+        Replace the rows written so far of a numeric column, block by block
+        Args:
+            name: Column name
+            convert: Function from a block of stored values to the block written instead
+        """
+        part_path = os.path.join(self.tmp_dir, f"{name}.part")
+        dtype = self._dtypes[name]
+        self._files[name].close()
+        
+        block = max(1, (64 << 20) // dtype.itemsize)
+        with open(part_path, 'rb') as source, open(f"{part_path}.new", 'wb') as target:
+            for start in range(0, self.n_rows, block):
+                convert(np.fromfile(source, dtype=dtype, count=min(block, self.n_rows - start))).tofile(target)
+                
+        os.remove(part_path)
+        return f"{part_path}.new"
+        
+    def _widen(self, column, dtype):
+        """Upcast the rows written so far of a numeric column to a wider numeric dtype"""
+        name = column['name']
+        new_path = self._rewrite_part(name, lambda values: values.astype(dtype))
+        os.replace(new_path, os.path.join(self.tmp_dir, f"{name}.part"))
+        
+        self._dtypes[name] = np.dtype(dtype)
+        column['dtype'] = str(np.dtype(dtype))
+        self._files[name] = open(os.path.join(self.tmp_dir, f"{name}.part"), 'ab')
+        
+    def _to_string(self, column):
+        """Turn a numeric column into a string column once a chunk holds text (missing values stay missing)"""
+        name = column['name']
+        self._categories[name] = ({}, [])
+        
+        def encode(values):
+            series = pd.Series(values)
+            return self._encode(name, series.astype(str).where(series.notna()))
+            
+        new_path = self._rewrite_part(name, encode)
+        os.replace(new_path, os.path.join(self.tmp_dir, f"{name}.codes.part"))
+        
+        del self._dtypes[name]
+        column.pop('dtype')
+        column['kind'] = 'string'
+        self._files[name] = open(os.path.join(self.tmp_dir, f"{name}.codes.part"), 'ab')
+        
+    def _encode(self, name, series):
+        """Dictionary-encode a chunk, mapping its categories to table-wide codes (missing values are -1)"""
+        codes, categories = pd.factorize(series, use_na_sentinel=True)
+        lookup, table_categories = self._categories[name]
+        
+        categories = categories.tolist()
+        chunk_codes = np.fromiter((lookup.get(category, -1) for category in categories), dtype=np.int32, count=len(categories))
+        
+        # Unseen categories get the next codes, in first-appearance order like pd.factorize
+        new = np.flatnonzero(chunk_codes < 0)
+        if len(new):
+            chunk_codes[new] = np.arange(len(table_categories), len(table_categories) + len(new))
+            new_categories = [categories[position] for position in new]
+            lookup.update(zip(new_categories, range(len(table_categories), len(table_categories) + len(new))))
+            table_categories.extend(new_categories)
+            
+        table_codes = np.full(len(codes), -1, dtype=np.int32)
+        table_codes[codes >= 0] = chunk_codes[codes[codes >= 0]]
+        return table_codes
+        
+    def append(self, df):
+        """
+        Append a chunk (same columns as the first chunk)
+        Args:
+            df: DataFrame chunk
+        """
+        if self.columns is None:
+            self._open(df)
+            
+        for column in self.columns:
+            name = column['name']
+            series = df[name]
+            
+            if column['kind'] == 'numeric':
+                if not _is_numeric(series):
+                    self._to_string(column)
+                else:
+                    values = series.to_numpy()
+                    dtype = np.result_type(self._dtypes[name], values.dtype)
+                    if dtype != self._dtypes[name]:
+                        self._widen(column, dtype)
+                        
+                    np.ascontiguousarray(values, dtype=dtype).tofile(self._files[name])
+                    continue
+                    
+            self._encode(name, series).tofile(self._files[name])
+            
+        self.n_rows += len(df)
+        
+    def _finish_array(self, name, dtype):
+        """Turn an appended raw file into <name>.npy (copied in blocks)"""
+        part_path = os.path.join(self.tmp_dir, f"{name}.part")
+        dtype = np.dtype(dtype)
+        
+        array = np.lib.format.open_memmap(
+            os.path.join(self.tmp_dir, f"{name}.npy"), mode='w+', dtype=dtype, shape=(self.n_rows,)
+        )
+        block = max(1, (64 << 20) // dtype.itemsize)
+        with open(part_path, 'rb') as f:
+            for start in range(0, self.n_rows, block):
+                array[start:start + block] = np.fromfile(f, dtype=dtype, count=min(block, self.n_rows - start))
+                
+        array.flush()
+        del array
+        os.remove(part_path)
+        
+    def close(self):
+        """Finish all column files, write the schema and swap the table into place"""
+        if self.columns is None:
+            raise ValueError(f"No rows or columns were written to {self.directory}")
+            
+        for f in self._files.values():
+            f.close()
+            
+        for column in self.columns:
+            name = column['name']
+            if column['kind'] == 'numeric':
+                self._finish_array(name, self._dtypes[name])
+            else:
+                self._finish_array(f"{name}.codes", np.int32)
+                save_array(self.tmp_dir, f"{name}.categories", np.asarray(self._categories[name][1], dtype=str))
+                
+        # Schema is written last
+        write_json(self.tmp_dir, SCHEMA_FILE, {'n_rows': self.n_rows, 'columns': self.columns})
+        
+        swap_directory(self.tmp_dir, self.directory)
+
+def save_table(df, directory):
+    """
+    Save a DataFrame as one binary file per column
+    Args:
+        df: DataFrame to save
+        directory: Target table directory (replaced atomically)
+    """
+    writer = TableWriter(directory)
+    writer.append(df)
+    writer.close()
+
+def read_schema(directory):
+    """Read the schema of a saved table, or None if it does not exist"""
+    return read_json(directory, SCHEMA_FILE)
+
+def load_table(directory, columns=None, mmap_mode='c'):
+    """
+    Load a table saved with save_table
+    Args:
+        directory: Table directory
+        columns: Column names to load (None loads all); other column files are never read
+        mmap_mode: numpy memory-map mode for numeric columns ('c' maps pages copy-on-write)
+    Returns:
+        DataFrame with the requested columns
+    """
+    schema = read_schema(directory)
+    if schema is None:
+        raise FileNotFoundError(f"No table found in {directory}")
+        
+    available = {column['name']: column for column in schema['columns']}
+    
+    if columns is None:
+        columns = list(available)
+        
+    missing = [name for name in columns if name not in available]
+    if missing:
+        raise KeyError(f"Columns not found in {directory}: {missing}")
+        
+    data = {}
+    for name in columns:
+        if available[name]['kind'] == 'numeric':
+            data[name] = load_array(directory, name, mmap_mode)
+        else:
+            codes = load_array(directory, f"{name}.codes", None)
+            categories = load_array(directory, f"{name}.categories", None).astype(object)
+            values = categories[codes] if len(categories) else np.full(len(codes), np.nan, dtype=object)
+            values[codes < 0] = np.nan
+            data[name] = values
+            
+    # copy=False keeps numeric columns backed by the memory-mapped files
+    return pd.DataFrame(data, columns=columns, copy=False)
@@ -1,5 +1,7 @@
 import pandas as pd
 import config
+from .column_store import load_table
+from .user_item_matrix import UserItemMatrix
 
 def load_students_data():
     """Load students dataset"""
@@ -37,3 +39,31 @@ def load_all_data():
     internships = load_internships_data()
     feedback = load_feedback_data()
     return students, internships, feedback
+
+def load_processed_students(columns=None):
+    """
+    Load preprocessed students table
+    Args:
+        columns: Column names to load (None loads all)
+    """
+    return load_table(config.STUDENTS_TABLE, columns)
+
+def load_processed_internships(columns=None):
+    """
+    Load preprocessed internships table
+    Args:
+        columns: Column names to load (None loads all)
+    """
+    return load_table(config.INTERNSHIPS_TABLE, columns)
+
+def load_processed_feedback(columns=None):
+    """
+    Load preprocessed feedback table
+    Args:
+        columns: Column names to load (None loads all)
+    """
+    return load_table(config.FEEDBACK_TABLE, columns)
+
+def load_user_item_matrix():
+    """Load sparse user-item rating matrix"""
+    return UserItemMatrix.load(config.USER_ITEM_MATRIX_FILE)
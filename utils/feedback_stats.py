@@ -0,0 +1,216 @@
+"""
+Running feedback statistics
+Sum and count of the ratings of every (student, internship) pair, kept in step with the append-only
+feedback log. A checkpoint records how many bytes of the log it covers, so catching up only parses
+the lines appended since then: the cost grows with the new feedback, not with the size of the log
+"""
+
+import io
+import os
+import zlib
+import numpy as np
+import pandas as pd
+
+# Student and internship IDs are joined into one sortable key
+KEY_SEPARATOR = '\x1f'
+
+# Bytes of the log before the checkpoint offset that are hashed, to notice a rewritten log
+ANCHOR_BYTES = 4096
+
+# Log bytes parsed per chunk
+CHUNK_BYTES = 16 << 20
+
+def pair_keys(student_ids, internship_ids):
+    """
+    Keys of (student, internship) pairs
+    Args:
+        student_ids, internship_ids: Sequences of IDs
+    Returns:
+        Array of string keys
+    """
+    student_ids = pd.Series(student_ids, dtype=object).astype(str)
+    internship_ids = pd.Series(internship_ids, dtype=object).astype(str)
+    return (student_ids + KEY_SEPARATOR + internship_ids.to_numpy()).to_numpy(dtype=str)
+
+def _anchor(f, offset):
+    """CRC of the log bytes right before offset"""
+    start = max(0, offset - ANCHOR_BYTES)
+    f.seek(start)
+    return zlib.crc32(f.read(offset - start))
+
+class FeedbackPairStats:
+    def __init__(self, log_path, checkpoint_path=None, checkpoint_pairs=10000):
+        """
+        Initialize pair statistics (nothing is read until catch_up)
+        Args:
+            log_path: Append-only feedback CSV with student_id, internship_id and rating columns
+            checkpoint_path: .npz file the statistics are saved to (None keeps them in memory only)
+            checkpoint_pairs: Save once this many pairs changed since the last checkpoint
+        """
+        self.log_path = log_path
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_pairs = checkpoint_pairs
+        
+        # Checkpointed statistics: sorted keys with their rating sums and counts
+        self._keys = np.array([], dtype=str)
+        self._sums = np.array([], dtype=np.float64)
+        self._counts = np.array([], dtype=np.int64)
+        
+        # key -> [sum, count] read from the log since the last merge
+        self._delta = {}
+        
+        # Log bytes covered so far (None until the checkpoint is loaded)
+        self._offset = None
+        
+    def _load(self):
+        """Load the checkpoint, or start from the beginning of the log if it does not match the log"""
+        self._offset = 0
+        
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+            
+        with np.load(self.checkpoint_path) as data:
+            offset = int(data['offset'])
+            anchor = int(data['anchor'])
+            
+            if os.path.getsize(self.log_path) >= offset:
+                with open(self.log_path, 'rb') as f:
+                    if _anchor(f, offset) == anchor:
+                        self._keys, self._sums, self._counts = data['keys'], data['sums'], data['counts']
+                        self._offset = offset
+                        return
+                        
+        print("⚠️ Feedback log changed since the pair statistics were saved, rebuilding them")
+        
+    def rebuild(self):
+        """
+        Recompute the statistics from the whole log (and save them if a checkpoint path is set)
+        Returns:
+            Number of feedback rows read
+        """
+        self._keys = np.array([], dtype=str)
+        self._sums = np.array([], dtype=np.float64)
+        self._counts = np.array([], dtype=np.int64)
+        self._delta = {}
+        self._offset = 0
+        
+        return self.catch_up()
+        
+    def catch_up(self):
+        """
+        Add the ratings of the log lines appended since the last call
+        Returns:
+            Number of feedback rows read
+        """
+        if self._offset is None:
+            self._load()
+            
+        full_scan = self._offset == 0
+        n_rows = 0
+        
+        with open(self.log_path, 'rb') as f:
+            names = pd.read_csv(io.BytesIO(f.readline()), nrows=0).columns.tolist()
+            start = max(self._offset, f.tell())
+            
+            while True:
+                f.seek(start)
+                block = f.read(CHUNK_BYTES)
+                
+                # Only complete lines; a line still being written is read next time
+                cut = block.rfind(b'\n') + 1
+                if cut == 0:
+                    break
+                    
+                try:
+                    rows = pd.read_csv(
+                        io.BytesIO(block[:cut]), header=None, names=names,
+                        usecols=['student_id', 'internship_id', 'rating']
+                    )
+                except pd.errors.EmptyDataError:
+                    rows = None
+                    
+                if rows is not None:
+                    self._add(rows)
+                    n_rows += len(rows)
+                start += cut
+                
+        self._offset = start
+        
+        if self.checkpoint_path and (full_scan or len(self._delta) >= self.checkpoint_pairs):
+            self.checkpoint()
+            
+        return n_rows
+        
+    def _add(self, rows):
+        """Add the ratings of one chunk of log rows"""
+        rows = rows.dropna(subset=['rating'])
+        if len(rows) == 0:
+            return
+            
+        keys, inverse = np.unique(pair_keys(rows['student_id'], rows['internship_id']), return_inverse=True)
+        sums = np.bincount(inverse, weights=rows['rating'].to_numpy(dtype=np.float64))
+        counts = np.bincount(inverse)
+        
+        # Large chunks (a first scan of the log) are merged into the sorted arrays straight away
+        if len(keys) > self.checkpoint_pairs:
+            self._merge(keys, sums, counts)
+            return
+            
+        for key, total, count in zip(keys.tolist(), sums.tolist(), counts.tolist()):
+            entry = self._delta.get(key)
+            if entry is None:
+                self._delta[key] = [total, count]
+            else:
+                entry[0] += total
+                entry[1] += count
+                
+    def _merge(self, keys, sums, counts):
+        """Merge statistics into the sorted arrays"""
+        merged, inverse = np.unique(np.concatenate([self._keys, keys]), return_inverse=True)
+        self._sums = np.bincount(inverse, weights=np.concatenate([self._sums, sums]), minlength=len(merged))
+        self._counts = np.bincount(inverse, weights=np.concatenate([self._counts, counts]), minlength=len(merged)).astype(np.int64)
+        self._keys = merged
+        
+    def means(self, student_ids, internship_ids):
+        """
+        Mean rating of each pair over all its feedback, as a full rebuild of the matrix computes it
+        Args:
+            student_ids, internship_ids: Sequences of IDs
+        Returns:
+            Array of mean ratings (NaN for pairs without a rating in the log)
+        """
+        keys = pair_keys(student_ids, internship_ids)
+        sums = np.zeros(len(keys))
+        counts = np.zeros(len(keys), dtype=np.int64)
+        
+        if len(self._keys):
+            positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+            found = self._keys[positions] == keys
+            sums[found] = self._sums[positions[found]]
+            counts[found] = self._counts[positions[found]]
+            
+        for i, key in enumerate(keys.tolist()):
+            entry = self._delta.get(key)
+            if entry is not None:
+                sums[i] += entry[0]
+                counts[i] += entry[1]
+                
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        
+    def checkpoint(self):
+        """Merge pending pairs and save the statistics atomically"""
+        if self._delta:
+            keys = np.array(list(self._delta), dtype=str)
+            values = np.array(list(self._delta.values()), dtype=np.float64)
+            self._merge(keys, values[:, 0], values[:, 1].astype(np.int64))
+            self._delta = {}
+            
+        with open(self.log_path, 'rb') as f:
+            anchor = _anchor(f, self._offset)
+            
+        tmp_path = f"{self.checkpoint_path}.tmp.npz"
+        np.savez(
+            tmp_path, keys=self._keys, sums=self._sums, counts=self._counts,
+            offset=np.int64(self._offset), anchor=np.int64(anchor)
+        )
+        os.replace(tmp_path, self.checkpoint_path)
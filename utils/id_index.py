@@ -0,0 +1,67 @@
+"""
+Id interning
+Maps string ids (student_id, internship_id) to dense integer codes once, so per-request lookups are array indexes
+"""
+
+import numpy as np
+
+class IdIndex:
+    def __init__(self, ids=()):
+        """
+        Intern ids in order: the i-th id gets code i
+        Args:
+            ids: Iterable of unique string ids
+        """
+        self.ids = np.asarray(ids).astype(str, copy=False)
+        
+        # Id -> code map, built on first lookup
+        self._codes = None
+        
+    @property
+    def codes(self):
+        if self._codes is None:
+            self._codes = {item_id: code for code, item_id in enumerate(self.ids.tolist())}
+        return self._codes
+        
+    def __len__(self):
+        return len(self.ids)
+        
+    def __contains__(self, item_id):
+        return item_id in self.codes
+        
+    def __getitem__(self, item_id):
+        return self.codes[item_id]
+        
+    def get(self, item_id, default=None):
+        """Code for one id, or default if unknown"""
+        return self.codes.get(item_id, default)
+        
+    def get_indexer(self, ids):
+        """
+        Codes for many ids at once
+        Args:
+            ids: Iterable of ids
+        Returns:
+            int64 numpy array of codes, -1 for unknown ids
+        """
+        codes = self.codes
+        return np.fromiter((codes.get(item_id, -1) for item_id in ids), dtype=np.int64, count=len(ids))
+        
+    def add(self, ids):
+        """
+        Intern unseen ids (appended after existing codes)
+        Args:
+            ids: Iterable of ids
+        Returns:
+            Number of new ids
+        """
+        codes = self.codes
+        new_ids = [item_id for item_id in dict.fromkeys(ids) if item_id not in codes]
+        
+        for item_id in new_ids:
+            codes[item_id] = len(codes)
+            
+        if new_ids:
+            self.ids = np.concatenate([self.ids, np.array(new_ids, dtype=str)])
+            
+        return len(new_ids)
@@ -0,0 +1,116 @@
+"""
+Inverted index over TF-IDF vectors
+Maps each term to a posting list of (document, weight) so a query only touches documents sharing a term with it
+"""
+
+import heapq
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from utils.similarity import top_n_positions
+
+class InvertedIndex:
+    def __init__(self, document_vectors):
+        """
+        Build posting lists from document vectors
+        Args:
+            document_vectors: Sparse matrix of shape (n_documents, n_terms), e.g. TF-IDF internship vectors
+        """
+        # Normalized like cosine_similarity does, so scores are identical to the brute-force path
+        postings = sparse.csc_matrix(normalize(document_vectors))
+        postings.sort_indices()
+        
+        # Term t's postings are documents[offsets[t]:offsets[t + 1]] with matching weights
+        self.offsets = postings.indptr
+        self.documents = postings.indices
+        self.weights = postings.data
+        self.n_documents = postings.shape[0]
+        
+    def score(self, query_vector):
+        """
+        Cosine similarity of one query against every document that shares a term with it
+        Args:
+            query_vector: Sparse matrix with one row (same vocabulary as the documents)
+        Returns:
+            (documents, scores): sorted document positions with a non-zero posting match and their scores
+        """
+        query = sparse.csr_matrix(normalize(query_vector))
+        query.sort_indices()
+        
+        terms = query.indices
+        if len(terms) == 0:
+            return np.empty(0, dtype=self.documents.dtype), np.empty(0)
+            
+        # Gather the postings of the query's terms only
+        starts = self.offsets[terms]
+        lengths = self.offsets[terms + 1] - starts
+        gather = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        
+        documents = self.documents[gather]
+        contributions = np.repeat(query.data, lengths) * self.weights[gather]
+        
+        # Accumulate term by term, in the same order as the sparse matrix product
+        matched, slots = np.unique(documents, return_inverse=True)
+        scores = np.zeros(len(matched))
+        np.add.at(scores, slots, contributions)
+        
+        return matched, scores
+        
+    def top_n(self, query_vector, top_n=5):
+        """
+        Top N documents for one query
+        Ties are broken by lower document position; documents without a matching term score 0
+        Args:
+            query_vector: Sparse matrix with one row
+            top_n: Number of documents to return
+        Returns:
+            (positions, scores) numpy arrays, best first
+        """
+        top_n = min(top_n, self.n_documents)
+        documents, scores = self.score(query_vector)
+        
+        # Heap selection over the matched documents only
+        best = heapq.nlargest(top_n, range(len(documents)), key=scores.__getitem__)
+        positions = documents[best].tolist()
+        top_scores = scores[best].tolist()
+        
+        # Pad with unmatched (zero score) documents in position order
+        if len(positions) < top_n:
+            matched = set(documents.tolist())
+            for position in range(self.n_documents):
+                if len(positions) == top_n:
+                    break
+                if position not in matched:
+                    positions.append(position)
+                    top_scores.append(0.0)
+                    
+        return np.array(positions, dtype=np.int64), np.array(top_scores)
+        
+    def score_batch(self, query_vectors):
+        """
+        Cosine similarity of many queries against the documents sharing a term with each of them
+        The sparse product walks the posting lists of each query's terms only, like score()
+        Args:
+            query_vectors: Sparse matrix with one query per row
+        Returns:
+            CSR matrix of shape (n_queries, n_documents) holding only the matched documents
+        """
+        queries = sparse.csr_matrix(normalize(query_vectors))
+        postings = sparse.csr_matrix((self.weights, self.documents, self.offsets), shape=(len(self.offsets) - 1, self.n_documents))
+        
+        return (queries @ postings).tocsr()
+        
+    def top_n_batch(self, query_vectors, top_n=5):
+        """
+        Top N documents for many queries, with the same ties and padding as top_n()
+        Args:
+            query_vectors: Sparse matrix with one query per row
+            top_n: Number of documents per query
+        Returns:
+            (positions, scores) arrays of shape (n_queries, top_n), best first
+        """
+        # Unmatched documents score 0, so they pad short rows in position order like top_n() does
+        scores = self.score_batch(query_vectors).toarray()
+        positions = top_n_positions(scores, min(top_n, self.n_documents))
+        
+        return positions, np.take_along_axis(scores, positions, axis=1)
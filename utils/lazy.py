@@ -0,0 +1,32 @@
+"""
+Lazy package exports (PEP 562)
+Package __init__ files map public names to submodules; a submodule is imported the first time
+one of its names is accessed, so importing a package never pulls in heavy dependencies by itself
+"""
+
+import importlib
+
+def lazy_exports(namespace, exports):
+    """
+    Build module-level __getattr__ and __dir__ for a package
+    Args:
+        namespace: globals() of the package __init__ module
+        exports: Dictionary mapping public name -> submodule name (relative to the package)
+    Returns:
+        (__getattr__, __dir__) functions to assign in the package namespace
+    """
+    package = namespace['__name__']
+    
+    def __getattr__(name):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+            
+        value = getattr(importlib.import_module(f".{submodule}", package), name)
+        namespace[name] = value  # Later lookups skip __getattr__
+        return value
+        
+    def __dir__():
+        return sorted(set(namespace) | set(exports))
+        
+    return __getattr__, __dir__
@@ -0,0 +1,216 @@
+"""
+Per-stage latency metrics for the recommendation path
+Stages are timed with `with timed('content.similarity'):` (or the @timed_call decorator) and
+aggregated into fixed-bucket histograms; while metrics are disabled, timed() hands back one shared
+no-op context manager, so instrumented code costs a function call and an attribute check
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+import config
+
+# Histogram bucket upper bounds in seconds (Prometheus-style, an implicit +Inf bucket follows)
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_NOOP = nullcontext()
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Fixed-bucket latency histogram
+        Args:
+            buckets: Sorted bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is the +Inf bucket
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+        
+    def observe(self, seconds):
+        """Record one duration"""
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[slot] += 1
+            self.count += 1
+            self.sum += seconds
+            
+    def quantile(self, q):
+        """
+        Approximate quantile: upper bound of the bucket holding the q-th observation
+        Args:
+            q: Quantile in [0, 1]
+        Returns:
+            Seconds (inf if it falls in the +Inf bucket, None without observations)
+        """
+        if self.count == 0:
+            return None
+            
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+class _StageTimer:
+    """Context manager adding its duration to a histogram"""
+    __slots__ = ('histogram', 'start')
+    
+    def __init__(self, histogram):
+        self.histogram = histogram
+        
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+class MetricsRegistry:
+    def __init__(self, enabled=False, buckets=DEFAULT_BUCKETS):
+        """
+        Named stage histograms
+        Args:
+            enabled: Record timings (when False, timer() returns a no-op context manager)
+            buckets: Bucket upper bounds in seconds for new histograms
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.histograms = {}
+        self._lock = threading.Lock()
+        
+    def enable(self):
+        self.enabled = True
+        
+    def disable(self):
+        self.enabled = False
+        
+    def reset(self):
+        """Drop all recorded timings"""
+        with self._lock:
+            self.histograms = {}
+            
+    def histogram(self, name):
+        """Histogram for a stage, created on first use"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram(self.buckets))
+        return histogram
+        
+    def timer(self, name):
+        """
+        Context manager timing one stage
+        Args:
+            name: Stage name, e.g. 'content.similarity'
+        """
+        if not self.enabled:
+            return _NOOP
+        return _StageTimer(self.histogram(name))
+        
+    def observe(self, name, seconds):
+        """Record a duration measured elsewhere"""
+        if self.enabled:
+            self.histogram(name).observe(seconds)
+            
+    def to_dict(self):
+        """
+        Summary of every stage
+        Returns:
+            Dictionary mapping stage name -> count, total/mean seconds, approximate p50/p95/p99
+            (bucket upper bounds) and per-bucket counts
+        """
+        summary = {}
+        for name, histogram in sorted(self.histograms.items()):
+            summary[name] = {
+                'count': histogram.count,
+                'sum_seconds': histogram.sum,
+                'mean_ms': histogram.sum / histogram.count * 1000 if histogram.count else None,
+                'p50_ms_le': _ms(histogram.quantile(0.50)),
+                'p95_ms_le': _ms(histogram.quantile(0.95)),
+                'p99_ms_le': _ms(histogram.quantile(0.99)),
+                'buckets': {_le(bound): count for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts)}
+            }
+        return summary
+        
+    def to_prometheus(self, metric='recommender_stage_seconds'):
+        """
+        Prometheus text exposition of all stage histograms
+        Args:
+            metric: Metric name
+        Returns:
+            String in the Prometheus text format (cumulative buckets, _sum and _count per stage)
+        """
+        lines = [
+            f"# HELP {metric} Latency of recommendation pipeline stages in seconds",
+            f"# TYPE {metric} histogram"
+        ]
+        
+        for name, histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{_le(bound)}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {histogram.sum!r}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {histogram.count}')
+            
+        return "\n".join(lines) + "\n"
+        
+    def export(self, directory, name='metrics'):
+        """
+        Write <name>.prom (Prometheus text) and <name>.json snapshots
+        Args:
+            directory: Target directory
+            name: File name stem
+        Returns:
+            (prometheus path, json path)
+        """
+        os.makedirs(directory, exist_ok=True)
+        prom_path = os.path.join(directory, f"{name}.prom")
+        json_path = os.path.join(directory, f"{name}.json")
+        
+        with open(prom_path, 'w') as f:
+            f.write(self.to_prometheus())
+        with open(json_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            
+        return prom_path, json_path
+
+def _le(bound):
+    """Prometheus 'le' label value"""
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+# Process-wide registry used by the instrumented models
+metrics = MetricsRegistry(enabled=config.METRICS_ENABLED)
+
+def timed(name):
+    """Time a block as stage `name` in the process-wide registry (no-op while disabled)"""
+    if not metrics.enabled:
+        return _NOOP
+    return _StageTimer(metrics.histogram(name))
+
+def timed_call(name):
+    """Decorator timing every call of a function as stage `name` (no-op while disabled)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return fn(*args, **kwargs)
+            with _StageTimer(metrics.histogram(name)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
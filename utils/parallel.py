@@ -0,0 +1,93 @@
+"""
+Process-pool helpers for parallel preprocessing and feature building
+Work is split into ordered partitions and results are consumed in partition order,
+so parallel runs produce exactly the same output as serial runs
+"""
+
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+def ordered_map(fn, tasks, workers=1, max_pending=None, initializer=None, initargs=()):
+    """
+    Map fn over tasks in a process pool, yielding results in task order
+    Args:
+        fn: Picklable module-level function taking one task
+        tasks: Iterable of picklable tasks
+        workers: Number of processes (1 runs everything in this process)
+        max_pending: Tasks in flight at once (default 2 per worker), which bounds memory
+        initializer: Optional module-level function run once per process before its first task
+                     (e.g. to load a model the tasks share)
+        initargs: Arguments for initializer
+    Yields:
+        fn(task) for each task, in order
+    """
+    if workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield fn(task)
+        return
+        
+    max_pending = max_pending or 2 * workers
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(fn, task))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+                
+        while pending:
+            yield pending.popleft().result()
+
+def csv_partitions(path, rows_per_partition):
+    """
+    Split a CSV file into byte ranges of about rows_per_partition rows, cut at line ends
+    Rows must not contain quoted line breaks (true for all raw files of this project)
+    Args:
+        path: CSV file with a header row
+        rows_per_partition: Target rows per partition (estimated from the first 1 MB)
+    Returns:
+        (column names, list of (start, end) byte offsets)
+    """
+    size = os.path.getsize(path)
+    
+    with open(path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        sample = f.read(1 << 20)
+        
+        bytes_per_row = len(sample) / max(1, sample.count(b'\n'))
+        target = max(1, int(bytes_per_row * rows_per_partition))
+        
+        partitions = []
+        start = data_start
+        while start < size:
+            f.seek(min(start + target, size))
+            f.readline()  # Move to the end of the current line
+            end = min(f.tell(), size)
+            partitions.append((start, end))
+            start = end
+            
+    names = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+    return names, partitions
+
+def read_csv_partition(path, start, end, names, usecols=None):
+    """
+    Read one byte range of a CSV file
+    Args:
+        path: CSV file
+        start, end: Byte offsets from csv_partitions
+        names: Column names from the header
+        usecols: Columns to parse (None parses all)
+    Returns:
+        DataFrame with the partition's rows
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+        
+    return pd.read_csv(io.BytesIO(data), header=None, names=names, usecols=usecols)
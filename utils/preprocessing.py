@@ -1,74 +1,70 @@
+from functools import partial
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import MinMaxScaler
+from .user_item_matrix import UserItemMatrix
+from .column_store import save_table, read_schema, TableWriter
+from .parallel import ordered_map, csv_partitions, read_csv_partition
+
+def _transform_students(df, cgpa_scaler):
+    """Vectorized student transforms with a fitted CGPA scaler (returns a new frame)"""
+    return df.assign(
+        # Handle missing past_internships (replace 'None' with empty string)
+        past_internships=df['past_internships'].replace('None', ''),
+        
+        # Normalize CGPA to 0-1 scale
+        cgpa_normalized=cgpa_scaler.transform(df[['cgpa']])[:, 0],
+        
+        # Create combined skill profile (skills + domain_interest)
+        skill_profile=df['skills'] + ' ' + df['domain_interest']
+    )
+
+def _transform_internships(df, rating_scaler):
+    """Vectorized internship transforms with a fitted rating scaler (returns a new frame)"""
+    return df.assign(
+        # Normalize rating to 0-1 scale
+        rating_normalized=rating_scaler.transform(df[['rating']])[:, 0],
+        
+        # Create combined internship profile (required_skills + domain + role)
+        internship_profile=df['required_skills'] + ' ' + df['domain'] + ' ' + df['role']
+    )
+
+def _transform_feedback(df):
+    """Vectorized feedback transforms (returns a new frame)"""
+    # Convert would_recommend to binary (1 for Yes, 0 for No/Maybe)
+    feedback_clean = df.assign(recommend_binary=(df['would_recommend'] == 'Yes').astype(np.int64))
+    
+    # Ensure ratings are within valid range
+    return feedback_clean[(feedback_clean['rating'] >= 1) & (feedback_clean['rating'] <= 5)]
 
 def preprocess_students(df):
     """Clean and preprocess student data"""
-    # Create a copy to avoid modifying original
-    students_clean = df.copy()
-    
-    # Handle missing past_internships (replace 'None' with empty string)
-    students_clean['past_internships'] = students_clean['past_internships'].replace('None', '')
-    
-    # Normalize CGPA to 0-1 scale
-    scaler = MinMaxScaler()
-    students_clean['cgpa_normalized'] = scaler.fit_transform(students_clean[['cgpa']])
+    from sklearn.preprocessing import MinMaxScaler  # Deferred: scikit-learn takes about a second to import
     
-    # Create combined skill profile (skills + domain_interest)
-    students_clean['skill_profile'] = (
-        students_clean['skills'] + ' ' + students_clean['domain_interest']
-    )
+    students_clean = _transform_students(df, MinMaxScaler().fit(df[['cgpa']]))
     
     print(f"✅ Preprocessed {len(students_clean)} student records")
     return students_clean
 
 def preprocess_internships(df):
     """Clean and preprocess internship data"""
-    # Create a copy
-    internships_clean = df.copy()
+    from sklearn.preprocessing import MinMaxScaler
     
-    # Normalize rating to 0-1 scale
-    scaler = MinMaxScaler()
-    internships_clean['rating_normalized'] = scaler.fit_transform(internships_clean[['rating']])
-    
-    # Create combined internship profile (required_skills + domain + role)
-    internships_clean['internship_profile'] = (
-        internships_clean['required_skills'] + ' ' + 
-        internships_clean['domain'] + ' ' + 
-        internships_clean['role']
-    )
+    internships_clean = _transform_internships(df, MinMaxScaler().fit(df[['rating']]))
     
     print(f"✅ Preprocessed {len(internships_clean)} internship records")
     return internships_clean
 
 def preprocess_feedback(df):
     """Clean and preprocess feedback data"""
-    # Create a copy
-    feedback_clean = df.copy()
-    
-    # Convert would_recommend to binary (1 for Yes, 0 for No/Maybe)
-    feedback_clean['recommend_binary'] = feedback_clean['would_recommend'].apply(
-        lambda x: 1 if x == 'Yes' else 0
-    )
-    
-    # Ensure ratings are within valid range
-    feedback_clean = feedback_clean[
-        (feedback_clean['rating'] >= 1) & (feedback_clean['rating'] <= 5)
-    ]
+    feedback_clean = _transform_feedback(df)
     
     print(f"✅ Preprocessed {len(feedback_clean)} feedback records")
     return feedback_clean
 
 def create_user_item_matrix(feedback_df):
-    """Create user-item rating matrix for collaborative filtering"""
-    # Pivot table: rows = students, columns = internships, values = ratings
-    user_item_matrix = feedback_df.pivot_table(
-        index='student_id',
-        columns='internship_id',
-        values='rating',
-        fill_value=0  # Fill missing ratings with 0
-    )
+    """Create sparse user-item rating matrix for collaborative filtering"""
+    # Rows = students, columns = internships, values = ratings (missing ratings are implicit zeros)
+    user_item_matrix = UserItemMatrix.from_feedback(feedback_df)
     
     print(f"✅ Created user-item matrix: {user_item_matrix.shape[0]} users x {user_item_matrix.shape[1]} items")
     return user_item_matrix
@@ -77,9 +73,114 @@ def save_processed_data(students_df, internships_df, feedback_df, user_item_matr
     """Save preprocessed data to processed folder"""
     import config
     
-    students_df.to_csv(f"{config.PROCESSED_DATA_DIR}/students_processed.csv", index=False)
-    internships_df.to_csv(f"{config.PROCESSED_DATA_DIR}/internships_processed.csv", index=False)
-    feedback_df.to_csv(f"{config.PROCESSED_DATA_DIR}/feedback_processed.csv", index=False)
-    user_item_matrix.to_csv(f"{config.PROCESSED_DATA_DIR}/user_item_matrix.csv")
+    save_table(students_df, config.STUDENTS_TABLE)
+    save_table(internships_df, config.INTERNSHIPS_TABLE)
+    save_table(feedback_df, config.FEEDBACK_TABLE)
+    user_item_matrix.save(config.USER_ITEM_MATRIX_FILE)
+    
+    print("✅ All processed data saved successfully!")
+
+def _partition_min_max(task):
+    """Worker: min and max of one column in one CSV partition"""
+    path, start, end, names, column = task
+    return read_csv_partition(path, start, end, names, usecols=[column])[[column]].agg(['min', 'max'])
+
+def _transform_partition(task):
+    """Worker: read and transform one CSV partition"""
+    path, start, end, names, transform = task
+    return transform(read_csv_partition(path, start, end, names))
+
+def fit_min_max_scaler(path, column, chunk_size, workers=1):
+    """
+    First pass of the streaming pipeline: fit a MinMaxScaler on one CSV column chunk by chunk
+    Args:
+        path: Raw CSV file
+        column: Column to scale
+        chunk_size: Rows per chunk
+        workers: Processes reading partitions in parallel (1 = serial)
+    Returns:
+        Fitted MinMaxScaler (same min/max as fitting on the whole column)
+    """
+    from sklearn.preprocessing import MinMaxScaler
+    
+    scaler = MinMaxScaler()
+    
+    if workers > 1:
+        # Per-partition min/max, combined in the parent
+        names, partitions = csv_partitions(path, chunk_size)
+        tasks = [(path, start, end, names, column) for start, end in partitions]
+        for extremes in ordered_map(_partition_min_max, tasks, workers):
+            scaler.partial_fit(extremes)
+    else:
+        for chunk in pd.read_csv(path, usecols=[column], chunksize=chunk_size):
+            scaler.partial_fit(chunk[[column]])
+            
+    return scaler
+
+def _stream_table(path, directory, transform, chunk_size, workers=1):
+    """
+    Read a raw CSV in chunks, transform each chunk and append it to a table
+    With workers > 1 the file is split into byte-range partitions that are parsed and
+    transformed in a process pool; chunks are still written in file order
+    Yields:
+        Each transformed chunk, after it has been written
+    """
+    if workers > 1:
+        names, partitions = csv_partitions(path, chunk_size)
+        tasks = [(path, start, end, names, transform) for start, end in partitions]
+        chunks = ordered_map(_transform_partition, tasks, workers)
+    else:
+        chunks = (transform(chunk) for chunk in pd.read_csv(path, chunksize=chunk_size))
+        
+    writer = TableWriter(directory)
+    for chunk in chunks:
+        writer.append(chunk)
+        yield chunk
+    writer.close()
+
+def preprocess_streaming(chunk_size=100000, workers=1):
+    """
+    Preprocess all raw CSVs into the processed tables without loading any file fully
+    Global statistics (CGPA and rating min/max) come from a first pass over the needed column;
+    the second pass transforms each chunk and streams it to disk, so peak memory depends on
+    chunk_size and the number of distinct ids/rating pairs rather than on the number of rows.
+    Output matches the in-memory pipeline, whatever the number of workers
+    Args:
+        chunk_size: Rows per chunk
+        workers: Processes parsing and transforming chunks in parallel (1 = serial)
+    Returns:
+        Dictionary with processed row counts per table
+    """
+    import config
+    
+    counts = {}
+    
+    cgpa_scaler = fit_min_max_scaler(config.STUDENTS_FILE, 'cgpa', chunk_size, workers)
+    counts['students'] = sum(
+        len(chunk) for chunk in _stream_table(
+            config.STUDENTS_FILE, config.STUDENTS_TABLE,
+            partial(_transform_students, cgpa_scaler=cgpa_scaler), chunk_size, workers
+        )
+    )
+    print(f"✅ Preprocessed {counts['students']} student records")
+    
+    rating_scaler = fit_min_max_scaler(config.INTERNSHIPS_FILE, 'rating', chunk_size, workers)
+    counts['internships'] = sum(
+        len(chunk) for chunk in _stream_table(
+            config.INTERNSHIPS_FILE, config.INTERNSHIPS_TABLE,
+            partial(_transform_internships, rating_scaler=rating_scaler), chunk_size, workers
+        )
+    )
+    print(f"✅ Preprocessed {counts['internships']} internship records")
     
+    # The user-item matrix is built from the same feedback chunks as they are written
+    feedback_chunks = _stream_table(config.FEEDBACK_FILE, config.FEEDBACK_TABLE, _transform_feedback, chunk_size, workers)
+    user_item_matrix = UserItemMatrix.from_feedback_chunks(feedback_chunks)
+    counts['feedback'] = read_schema(config.FEEDBACK_TABLE)['n_rows']
+    print(f"✅ Preprocessed {counts['feedback']} feedback records")
+    print(f"✅ Created user-item matrix: {user_item_matrix.shape[0]} users x {user_item_matrix.shape[1]} items")
+    
+    user_item_matrix.save(config.USER_ITEM_MATRIX_FILE)
     print("✅ All processed data saved successfully!")
+    
+    return counts
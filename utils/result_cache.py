@@ -0,0 +1,120 @@
+"""
+Recommendation result cache
+Bounded LRU cache with optional time-to-live, keyed by (student_id, ...) tuples
+Safe to share between threads (e.g. Streamlit sessions using one recommender)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+class ResultCache:
+    def __init__(self, max_size=1024, ttl_seconds=None):
+        """
+        Initialize result cache
+        Args:
+            max_size: Maximum number of cached results (least recently used are evicted first)
+            ttl_seconds: Seconds a result stays valid (None = no expiry)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        
+        # key -> (expires_at, value), ordered from least to most recently used
+        self._entries = OrderedDict()
+        
+        # student_id -> keys cached for that student, for per-student invalidation
+        self._keys_by_student = {}
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        
+    def __len__(self):
+        return len(self._entries)
+        
+    def get(self, key, default=None):
+        """
+        Look up a cached result
+        Args:
+            key: Tuple whose first element is the student ID
+            default: Returned on a miss
+        Returns:
+            Cached value, or default if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return default
+                
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+            
+    def put(self, key, value):
+        """
+        Store a result
+        Args:
+            key: Tuple whose first element is the student ID
+            value: Result to cache
+        """
+        if self.max_size <= 0:
+            return
+            
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            self._keys_by_student.setdefault(key[0], set()).add(key)
+            
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                
+    def _remove(self, key):
+        """Drop one entry and its student bookkeeping (caller holds the lock)"""
+        del self._entries[key]
+        
+        keys = self._keys_by_student.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_student[key[0]]
+                
+    def invalidate(self, student_id):
+        """
+        Drop every cached result for one student
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = self._keys_by_student.pop(student_id, ())
+            
+            for key in keys:
+                del self._entries[key]
+                
+            return len(keys)
+            
+    def clear(self):
+        """Drop all cached results (hit/miss counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_student.clear()
+            
+    def stats(self):
+        """
+        Cache statistics
+        Returns:
+            Dictionary with size, hits, misses and hit_rate
+        """
+        lookups = self.hits + self.misses
+        
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
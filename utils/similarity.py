@@ -3,7 +3,6 @@ Utility functions for similarity calculations
 """
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
 def calculate_cosine_similarity(vector1, vector2):
     """
@@ -14,6 +13,8 @@ def calculate_cosine_similarity(vector1, vector2):
     Returns:
         Similarity score between 0 and 1
     """
+    from sklearn.metrics.pairwise import cosine_similarity  # Deferred: heavy import, rarely used
+    
     return cosine_similarity(
         np.array(vector1).reshape(1, -1),
         np.array(vector2).reshape(1, -1)
@@ -40,7 +41,7 @@ def get_top_n_similar_items(similarity_matrix, item_index, top_n=5):
     top_similar = []
     for idx in similar_indices[:top_n]:
         top_similar.append((idx, similarities[idx]))
-    
+        
     return top_similar
 
 def calculate_weighted_score(scores, weights):
@@ -54,10 +55,10 @@ def calculate_weighted_score(scores, weights):
     """
     if len(scores) != len(weights):
         raise ValueError("Scores and weights must have same length")
-    
+        
     if abs(sum(weights) - 1.0) > 0.01:
         raise ValueError("Weights must sum to 1.0")
-    
+        
     return sum(s * w for s, w in zip(scores, weights))
 
 def normalize_scores(scores, min_val=0, max_val=1):
@@ -76,8 +77,32 @@ def normalize_scores(scores, min_val=0, max_val=1):
     
     if max_score == min_score:
         return np.full_like(scores, (min_val + max_val) / 2)
-    
+        
     normalized = (scores - min_score) / (max_score - min_score)
     normalized = normalized * (max_val - min_val) + min_val
     
     return normalized
+
+def top_n_positions(scores, n):
+    """
+    Row-wise top N column positions, best first, using partial selection
+    Ties are broken by lower column position
+    Args:
+        scores: 2D array of scores
+        n: Number of positions to select per row
+    Returns:
+        2D array of column positions of shape (n_rows, n)
+    """
+    if n < scores.shape[1]:
+        # Everything above the n-th best score, plus the lowest-position ties at it
+        threshold = -np.partition(-scores, n - 1, axis=1)[:, n - 1:n]
+        above = scores > threshold
+        ties = scores == threshold
+        n_ties = n - above.sum(axis=1, keepdims=True)
+        keep = above | (ties & (np.cumsum(ties, axis=1) <= n_ties))
+        selected = np.nonzero(keep)[1].reshape(scores.shape[0], n)
+    else:
+        selected = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        
+    order = np.argsort(-np.take_along_axis(scores, selected, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(selected, order, axis=1)
@@ -0,0 +1,90 @@
+"""
+Model snapshot helpers
+Arrays are stored as individual .npy files so they can be memory-mapped on load
+"""
+
+import json
+import os
+import shutil
+import numpy as np
+from scipy import sparse
+
+SNAPSHOT_FORMAT_VERSION = 2
+MANIFEST_FILE = 'manifest.json'
+
+def save_array(directory, name, array):
+    """Save one array as <directory>/<name>.npy"""
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+
+def load_array(directory, name, mmap_mode='r'):
+    """
+    Load one array saved with save_array
+    Args:
+        directory: Snapshot directory
+        name: Array name
+        mmap_mode: numpy memory-map mode ('r' shares pages between processes, None reads into memory)
+    """
+    return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+
+def save_csr(directory, name, matrix):
+    """Save a sparse matrix as separate CSR component arrays"""
+    matrix = sparse.csr_matrix(matrix)
+    save_array(directory, f"{name}_data", matrix.data)
+    save_array(directory, f"{name}_indices", matrix.indices)
+    save_array(directory, f"{name}_indptr", matrix.indptr)
+    save_array(directory, f"{name}_shape", np.array(matrix.shape, dtype=np.int64))
+
+def load_csr(directory, name, mmap_mode='r'):
+    """Load a sparse matrix saved with save_csr (component arrays stay memory-mapped)"""
+    return sparse.csr_matrix(
+        (
+            load_array(directory, f"{name}_data", mmap_mode),
+            load_array(directory, f"{name}_indices", mmap_mode),
+            load_array(directory, f"{name}_indptr", mmap_mode)
+        ),
+        shape=tuple(load_array(directory, f"{name}_shape", None))
+    )
+
+def write_json(directory, name, payload):
+    """Write a small JSON metadata file"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), 'w') as f:
+        json.dump(payload, f, indent=2)
+
+def read_json(directory, name):
+    """Read a JSON metadata file, or None if it does not exist"""
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def file_fingerprint(paths):
+    """
+    Cheap fingerprint of source files used to detect stale snapshots
+    Args:
+        paths: List of file paths
+    Returns:
+        Dictionary mapping file name -> [size, mtime_ns] (None for missing files)
+    """
+    fingerprint = {}
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            fingerprint[os.path.basename(path)] = [stat.st_size, stat.st_mtime_ns]
+        else:
+            fingerprint[os.path.basename(path)] = None
+    return fingerprint
+
+def swap_directory(tmp_dir, target_dir):
+    """
+    Replace target_dir with a fully written tmp_dir
+    Readers never see a partially written directory; processes that still map old files keep them alive
+    """
+    old_dir = f"{target_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(target_dir):
+        os.rename(target_dir, old_dir)
+    os.rename(tmp_dir, target_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
@@ -0,0 +1,147 @@
+"""
+Precomputed top-N recommendation table
+Fixed-width arrays with one row per student (the student's row position in the students table
+at build time): internship positions and scores, memory-mapped so lookups need no scoring
+"""
+
+import os
+import shutil
+from datetime import datetime
+import numpy as np
+from .snapshot import MANIFEST_FILE, save_array, load_array, write_json, read_json, swap_directory
+
+TOPN_FORMAT_VERSION = 1
+
+class TopNTableWriter:
+    def __init__(self, directory, student_ids, internship_ids, top_n):
+        """
+        Start writing a table into <directory>.tmp (swapped in by close())
+        Args:
+            directory: Target table directory
+            student_ids: Student IDs, one table row each
+            internship_ids: Internship IDs in catalog order (positions refer to this order)
+            top_n: Recommendations stored per student
+        """
+        self.directory = directory
+        self.tmp_dir = f"{directory}.tmp"
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        
+        save_array(self.tmp_dir, 'student_ids', np.asarray(student_ids, dtype=str))
+        save_array(self.tmp_dir, 'internship_ids', np.asarray(internship_ids, dtype=str))
+        
+        # Filled chunk by chunk on disk, so memory stays bounded by one chunk
+        shape = (len(student_ids), top_n)
+        self.positions = np.lib.format.open_memmap(
+            os.path.join(self.tmp_dir, 'positions.npy'), mode='w+', dtype=np.int32, shape=shape
+        )
+        self.scores = np.lib.format.open_memmap(
+            os.path.join(self.tmp_dir, 'scores.npy'), mode='w+', dtype=np.float64, shape=shape
+        )
+        
+    def write(self, start, positions, scores):
+        """
+        Store the results of a contiguous block of students
+        Args:
+            start: Row of the first student in the block
+            positions: Internship positions, shape (n_block, top_n)
+            scores: Scores, same shape
+        """
+        self.positions[start:start + len(positions)] = positions
+        self.scores[start:start + len(scores)] = scores
+        
+    def close(self, metadata=None):
+        """
+        Flush the arrays, write the manifest and swap the table into place
+        Args:
+            metadata: Extra manifest entries (e.g. the model fingerprint)
+        """
+        n_students, top_n = self.positions.shape
+        self.positions.flush()
+        self.scores.flush()
+        del self.positions, self.scores
+        
+        # Manifest is written last
+        write_json(self.tmp_dir, MANIFEST_FILE, {
+            'format_version': TOPN_FORMAT_VERSION,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'n_students': n_students,
+            'top_n': top_n,
+            **(metadata or {})
+        })
+        
+        swap_directory(self.tmp_dir, self.directory)
+
+class TopNTable:
+    def __init__(self, directory, mmap_mode='r'):
+        """
+        Open a table written by TopNTableWriter
+        Args:
+            directory: Table directory
+            mmap_mode: numpy memory-map mode (None reads the arrays into memory)
+        """
+        self.manifest = read_json(directory, MANIFEST_FILE)
+        if self.manifest is None or self.manifest.get('format_version') != TOPN_FORMAT_VERSION:
+            raise FileNotFoundError(f"No top-N table in {directory}")
+            
+        self.student_ids = load_array(directory, 'student_ids', mmap_mode)
+        self.internship_ids = load_array(directory, 'internship_ids', mmap_mode)
+        self.positions = load_array(directory, 'positions', mmap_mode)
+        self.scores = load_array(directory, 'scores', mmap_mode)
+        self.top_n = self.positions.shape[1]
+        
+        self.hits = 0
+        self.misses = 0
+        
+    @classmethod
+    def open(cls, directory, mmap_mode='r'):
+        """Open a table, or return None when the directory holds no (complete) table"""
+        try:
+            return cls(directory, mmap_mode)
+        except FileNotFoundError:
+            return None
+            
+    def __len__(self):
+        return len(self.positions)
+        
+    def matches_catalog(self, internship_ids):
+        """Check the stored positions refer to this internship catalog (same ids in the same order)"""
+        return np.array_equal(self.internship_ids, np.asarray(internship_ids, dtype=str))
+        
+    def lookup(self, rows, student_ids, top_n):
+        """
+        Precomputed results for students whose row is in the table
+        Students added after the build (rows past the table, or a different id at the row) miss
+        Args:
+            rows: Current student row positions (-1 for unknown students)
+            student_ids: Student IDs (aligned with rows), checked against the stored IDs
+            top_n: Recommendations per student (at most self.top_n)
+        Returns:
+            (found mask, positions, scores) with positions and scores for the found students only
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        found = (rows >= 0) & (rows < len(self))
+        found[found] = self.student_ids[rows[found]] == np.asarray(student_ids, dtype=str)[found]
+        
+        n_found = int(found.sum())
+        self.hits += n_found
+        self.misses += len(rows) - n_found
+        
+        table_rows = rows[found]
+        return found, self.positions[table_rows, :top_n], self.scores[table_rows, :top_n]
+        
+    def stats(self):
+        """
+        Lookup statistics
+        Returns:
+            Dictionary with rows, top_n, created, hits, misses and hit_rate
+        """
+        lookups = self.hits + self.misses
+        
+        return {
+            'rows': len(self),
+            'top_n': self.top_n,
+            'created': self.manifest.get('created'),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,268 @@
+"""
+Sparse user-item rating matrix
+Stores student x internship ratings in CSR form together with the id <-> position maps
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from .id_index import IdIndex
+
+def replace_rows(matrix, rows, new_rows):
+    """
+    Copy of a CSR matrix with some rows replaced
+    Only the CSR arrays are spliced, one slice copy per run of kept or replaced rows: no sparse
+    arithmetic or COO round trip over the whole matrix
+    Args:
+        matrix: scipy.sparse CSR matrix
+        rows: Sorted, unique positions of the rows to replace
+        new_rows: CSR matrix with one row per position in rows (same number of columns)
+    Returns:
+        New CSR matrix of the same shape
+    """
+    new_rows = sparse.csr_matrix(new_rows)
+    rows = np.asarray(rows, dtype=np.int64)
+    
+    lengths = np.diff(matrix.indptr).astype(np.int64)
+    lengths[rows] = np.diff(new_rows.indptr)
+    indptr = np.zeros(matrix.shape[0] + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    
+    # Runs of consecutive replaced rows: [run_starts[i], run_stops[i])
+    breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+    run_starts = rows[np.concatenate([[0], breaks])] if len(rows) else rows
+    run_stops = rows[np.concatenate([breaks - 1, [len(rows) - 1]])] + 1 if len(rows) else rows
+    
+    indices, data = [], []
+    kept_from, new_from = 0, 0
+    for run_start, run_stop in zip(run_starts.tolist(), run_stops.tolist()):
+        lo, hi = matrix.indptr[kept_from], matrix.indptr[run_start]
+        indices.append(matrix.indices[lo:hi])
+        data.append(matrix.data[lo:hi])
+        
+        new_to = new_from + run_stop - run_start
+        lo, hi = new_rows.indptr[new_from], new_rows.indptr[new_to]
+        indices.append(new_rows.indices[lo:hi])
+        data.append(new_rows.data[lo:hi])
+        kept_from, new_from = run_stop, new_to
+        
+    lo = matrix.indptr[kept_from]
+    indices.append(matrix.indices[lo:])
+    data.append(matrix.data[lo:])
+    
+    return sparse.csr_matrix((np.concatenate(data), np.concatenate(indices), indptr), shape=matrix.shape)
+
+def grow_rows(matrix, n_rows):
+    """CSR matrix with empty rows appended up to n_rows (the existing arrays are shared, not copied)"""
+    if matrix.shape[0] >= n_rows:
+        return matrix
+        
+    indptr = np.concatenate([
+        matrix.indptr,
+        np.full(n_rows - matrix.shape[0], matrix.indptr[-1], dtype=matrix.indptr.dtype)
+    ])
+    return sparse.csr_matrix((matrix.data, matrix.indices, indptr), shape=(n_rows, matrix.shape[1]))
+
+class UserItemMatrix:
+    def __init__(self, matrix, user_ids, item_ids):
+        """
+        Wrap a sparse rating matrix
+        Args:
+            matrix: scipy.sparse matrix with students as rows, internships as columns
+            user_ids: Student IDs in row order
+            item_ids: Internship IDs in column order
+        """
+        self.matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+        
+        # Id -> row/column position maps
+        self.user_index = user_ids if isinstance(user_ids, IdIndex) else IdIndex(user_ids)
+        self.item_index = item_ids if isinstance(item_ids, IdIndex) else IdIndex(item_ids)
+        
+    @property
+    def user_ids(self):
+        return self.user_index.ids
+        
+    @property
+    def item_ids(self):
+        return self.item_index.ids
+        
+    @property
+    def shape(self):
+        return self.matrix.shape
+        
+    @property
+    def nnz(self):
+        return self.matrix.nnz
+        
+    def update(self, student_ids, internship_ids, ratings):
+        """
+        Set ratings for (student, internship) pairs in place, adding unseen students/internships
+        Later duplicates of the same pair win
+        Args:
+            student_ids: Student IDs
+            internship_ids: Internship IDs (aligned with student_ids)
+            ratings: New rating values (aligned with student_ids)
+        Returns:
+            Sorted array of affected row positions
+        """
+        # Append positions for unseen ids
+        self.user_index.add(student_ids)
+        self.item_index.add(internship_ids)
+        
+        # Last value per pair wins
+        pairs = {}
+        user_positions = self.user_index.get_indexer(student_ids)
+        item_positions = self.item_index.get_indexer(internship_ids)
+        for row, col, rating in zip(user_positions.tolist(), item_positions.tolist(), ratings):
+            pairs[(row, col)] = float(rating)
+            
+        rows = np.array([pair[0] for pair in pairs], dtype=np.int64)
+        cols = np.array([pair[1] for pair in pairs], dtype=np.int64)
+        values = np.array(list(pairs.values()))
+        
+        # Grow the matrix shape without touching existing entries
+        matrix = grow_rows(self.matrix, len(self.user_ids))
+        matrix = sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(len(self.user_ids), len(self.item_ids)))
+        
+        # Rewrite only the affected rows: their old entries patched with the new values
+        affected, local_rows = np.unique(rows, return_inverse=True)
+        patched = matrix[affected].tolil()
+        patched[local_rows, cols] = values
+        patched = patched.tocsr()
+        patched.eliminate_zeros()
+        
+        self.matrix = replace_rows(matrix, affected, patched)
+        
+        return affected
+        
+    @classmethod
+    def from_feedback(cls, feedback_df):
+        """
+        Build the matrix straight from feedback rows
+        Duplicate (student, internship) pairs are averaged, like pivot_table does
+        Args:
+            feedback_df: DataFrame with student_id, internship_id and rating columns
+        """
+        feedback_df = feedback_df.dropna(subset=['rating'])
+        
+        user_codes, user_ids = pd.factorize(feedback_df['student_id'], sort=True)
+        item_codes, item_ids = pd.factorize(feedback_df['internship_id'], sort=True)
+        ratings = feedback_df['rating'].to_numpy(dtype=np.float64)
+        
+        # Average duplicate pairs: sum and count per flattened (row, col) key
+        keys = user_codes.astype(np.int64) * len(item_ids) + item_codes
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, weights=ratings)
+        counts = np.bincount(inverse)
+        
+        matrix = sparse.csr_matrix(
+            (sums / counts, (unique_keys // len(item_ids), unique_keys % len(item_ids))),
+            shape=(len(user_ids), len(item_ids))
+        )
+        
+        return cls(matrix, user_ids, item_ids)
+        
+    @classmethod
+    def from_feedback_chunks(cls, chunks):
+        """
+        Build the matrix from feedback chunks without holding all feedback rows in memory
+        Gives the same matrix as from_feedback on the concatenated chunks; memory grows with the
+        number of distinct (student, internship) pairs, not with the number of feedback rows
+        Args:
+            chunks: Iterable of DataFrames with student_id, internship_id and rating columns
+        """
+        user_index, item_index = IdIndex(), IdIndex()
+        sums = sparse.csr_matrix((0, 0))
+        counts = sparse.csr_matrix((0, 0))
+        
+        # Rows of chunks not yet merged into the running per-pair sums and counts
+        pending_rows, pending_cols, pending_ratings = [], [], []
+        n_pending = 0
+        
+        def merge(sums, counts):
+            shape = (len(user_index), len(item_index))
+            rows, cols = np.concatenate(pending_rows), np.concatenate(pending_cols)
+            
+            # Duplicate pairs are summed on conversion to CSR
+            sums.resize(shape)
+            counts.resize(shape)
+            sums = sums + sparse.csr_matrix((np.concatenate(pending_ratings), (rows, cols)), shape=shape)
+            counts = counts + sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+            
+            pending_rows.clear(), pending_cols.clear(), pending_ratings.clear()
+            return sums, counts
+            
+        for chunk in chunks:
+            chunk = chunk.dropna(subset=['rating'])
+            
+            # Intern only the chunk's distinct ids, then map row codes to matrix positions
+            user_codes, users = pd.factorize(chunk['student_id'])
+            item_codes, items = pd.factorize(chunk['internship_id'])
+            users, items = users.tolist(), items.tolist()
+            user_index.add(users)
+            item_index.add(items)
+            
+            pending_rows.append(user_index.get_indexer(users)[user_codes])
+            pending_cols.append(item_index.get_indexer(items)[item_codes])
+            pending_ratings.append(chunk['rating'].to_numpy(dtype=np.float64))
+            n_pending += len(chunk)
+            
+            # Merge once pending rows outgrow the merged pairs, so each pair is re-added O(log n) times
+            if n_pending >= max(sums.nnz, 1):
+                sums, counts = merge(sums, counts)
+                n_pending = 0
+                
+        if pending_rows:
+            sums, counts = merge(sums, counts)
+            
+        sums.sum_duplicates()
+        counts.sum_duplicates()
+        matrix = sums.copy()
+        matrix.data = sums.data / counts.data
+        
+        # Sorted id order, like from_feedback
+        user_order = np.argsort(user_index.ids, kind='stable')
+        item_order = np.argsort(item_index.ids, kind='stable')
+        matrix = matrix[user_order][:, item_order]
+        matrix.sort_indices()
+        
+        # Narrowest string dtype, as from_feedback produces
+        user_ids = np.array(user_index.ids[user_order].tolist(), dtype=str)
+        item_ids = np.array(item_index.ids[item_order].tolist(), dtype=str)
+        
+        return cls(matrix, user_ids, item_ids)
+        
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build the matrix from a dense DataFrame (students as index, internships as columns)"""
+        return cls(sparse.csr_matrix(df.to_numpy(dtype=np.float64)), df.index, df.columns)
+        
+    def to_dataframe(self):
+        """Densify into a DataFrame (only for small matrices)"""
+        return pd.DataFrame(
+            self.matrix.toarray(),
+            index=pd.Index(self.user_ids, name='student_id'),
+            columns=pd.Index(self.item_ids, name='internship_id')
+        )
+        
+    def save(self, path):
+        """Save CSR arrays and id maps to a single .npz file"""
+        np.savez(
+            path,
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            shape=np.array(self.matrix.shape),
+            user_ids=self.user_ids,
+            item_ids=self.item_ids
+        )
+        
+    @classmethod
+    def load(cls, path):
+        """Load a matrix saved with save()"""
+        with np.load(path) as npz:
+            matrix = sparse.csr_matrix(
+                (npz['data'], npz['indices'], npz['indptr']),
+                shape=tuple(npz['shape'])
+            )
+            return cls(matrix, npz['user_ids'], npz['item_ids'])
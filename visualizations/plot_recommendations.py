@@ -9,6 +9,7 @@ import sys
 sys.path.append('.')
 
 from components.recommender import HybridRecommender
+from utils.data_loader import load_processed_internships
 import config
 
 def plot_recommendation_scores(student_id='S001'):
@@ -75,11 +76,7 @@ def plot_model_comparison():
     
     # Get recommendations with detailed scores
     student_id = 'S001'
-    students_df = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/students_processed.csv")
-    student = students_df[students_df['student_id'] == student_id]
-    student_profile = student['skill_profile'].values[0]
-    
-    internships_df = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/internships_processed.csv")
+    student_profile = recommender.get_student(student_id)['skill_profile']
     
     # Get content scores
     content_recs = recommender.content_model.get_recommendations(student_profile, top_n=10)
@@ -88,10 +85,10 @@ def plot_model_comparison():
     content_scores = content_recs['content_score'].values
     
     # Get collaborative scores
-    collaborative_scores = []
-    for internship_id in content_recs['internship_id']:
-        collab_score = recommender.collaborative_model.predict(student_id, internship_id) / 5.0
-        collaborative_scores.append(collab_score)
+    collaborative_scores = recommender.collaborative_model.predict_many(
+        student_id,
+        content_recs['internship_id'].to_numpy()
+    ) / 5.0
     
     # Create grouped bar chart
     x = np.arange(len(companies))
@@ -120,7 +117,7 @@ def plot_skill_domain_heatmap():
     """
     Create heatmap of skills vs domains
     """
-    internships_df = pd.read_csv(f"{config.PROCESSED_DATA_DIR}/internships_processed.csv")
+    internships_df = load_processed_internships(['domain', 'required_skills'])
     
     # Extract top domains and skills
     domains = internships_df['domain'].value_counts().head(8).index